@@ -0,0 +1,59 @@
+"""
+Benchmark of the rendering of a batch of hist/hist2D/contourp figures by a serial loop over the
+pyplot functions and savefig, against batch.BatchRenderer in this process and with a pool of
+worker processes (timed for a first batch, which starts the workers, and for a second one).
+
+Usage: python benchmarks/bench_batch.py [number of figures, default: 48] [n_jobs, default: -1]
+"""
+
+import sys
+from os.path import abspath, dirname, join
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+sys.path.insert(0,join(dirname(dirname(abspath(__file__))),'src'))
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import splotch
+from splotch.batch import BatchRenderer
+
+def make_specs(nfig,data,outdir):
+	funcs=['hist','hist2D','contourp']
+	specs=[]
+	for i in range(nfig):
+		x,y=data[i%len(data)]
+		func=funcs[i%len(funcs)]
+		specs.append({'func':func,'args':(x,) if func=='hist' else (x,y),'path':join(outdir,f"{i}.png")})
+	return(specs)
+
+def serial_loop(specs):
+	for spec in specs:
+		plt.figure()
+		getattr(splotch,spec['func'])(*spec['args'])
+		plt.savefig(spec['path'])
+		plt.close()
+
+if __name__=='__main__':
+	nfig=int(sys.argv[1]) if len(sys.argv) > 1 else 48
+	n_jobs=int(sys.argv[2]) if len(sys.argv) > 2 else -1
+	rng=np.random.default_rng(0)
+	data=[(x,x+rng.normal(size=x.size)) for x in [rng.normal(size=1000000) for _ in range(4)]]
+	with TemporaryDirectory() as outdir:
+		specs=make_specs(nfig,data,outdir)
+		t=perf_counter()
+		serial_loop(specs)
+		print(f"{'pyplot loop':>32} {perf_counter()-t:>8.2f}s")
+		t=perf_counter()
+		errors=BatchRenderer(n_jobs=None).render(specs)
+		print(f"{'BatchRenderer(n_jobs=None)':>32} {perf_counter()-t:>8.2f}s")
+		with BatchRenderer(n_jobs=n_jobs) as renderer:
+			for batch in ['first','second']:
+				t=perf_counter()
+				errors+=renderer.render(specs)
+				print(f"{f'BatchRenderer(n_jobs={renderer.n_jobs}), {batch}':>32} {perf_counter()-t:>8.2f}s")
+	failed=[e for e in errors if e is not None]
+	if failed:
+		print(f"{len(failed)} figures failed, e.g.:\n{failed[0]}")
@@ -0,0 +1,73 @@
+"""
+Benchmark of the uniform-bin fast path of base_func.bin_index() against the general edge search,
+and of the per-bin counts of plots_1d.hist() against numpy.histogram(). Before timing, the results
+of base_func.binned_stats() on values with NaNs are checked against scipy.stats.binned_statistic()
+on the same data without the NaN values, which binned_stats() ignores.
+
+Usage: python benchmarks/bench_binning.py
+"""
+
+import sys
+from os.path import abspath, dirname, join
+from timeit import repeat
+
+sys.path.insert(0,join(dirname(dirname(abspath(__file__))),'src'))
+
+import numpy as np
+from splotch.base_func import bin_index, binned_stats
+
+def general_index(data,edges):
+	nbins=len(edges)-1
+	index=np.searchsorted(edges,data,side='right')-1
+	index[data==edges[-1]]=nbins-1
+	return(np.where(index<nbins,index,-1))
+
+def uniform_counts(data,edges,weights=None):
+	nbins=len(edges)-1
+	index=bin_index(data,edges)+1 # Shifted so that points outside the bins are counted in bin 0
+	counts=np.bincount(index,minlength=nbins+1)[1:]
+	if weights is not None:
+		return(counts,np.bincount(index,weights=weights,minlength=nbins+1)[1:])
+	return(counts,counts)
+
+def numpy_counts(data,edges,weights=None):
+	counts=np.histogram(data,bins=edges)[0]
+	if weights is not None:
+		return(counts,np.histogram(data,bins=edges,weights=weights)[0])
+	return(counts,counts)
+
+def check_nan_stats(rng,N=100000,nbins=30):
+	from functools import partial
+	from scipy.stats import binned_statistic
+	
+	data=rng.normal(size=N)
+	values=rng.normal(size=N)
+	values[rng.uniform(size=N)<0.2]=np.nan
+	values[data>2]=np.nan # Bins with only NaN values
+	edges=np.linspace(-4,4,nbins+1)
+	keep=~np.isnan(values)
+	stats=['mean','std','median','count','sum','min','max',16,np.median]
+	results=binned_stats(bin_index(data,edges),nbins,[(values,stat) for stat in stats])
+	for stat,result in zip(stats,results):
+		expected=binned_statistic(data[keep],values[keep],statistic=partial(np.percentile,q=stat) if isinstance(stat,int) else stat,bins=edges)[0]
+		if not np.allclose(result,expected,equal_nan=True):
+			raise AssertionError(f"binned_stats() differs from scipy.stats.binned_statistic() with NaN values for statistic {stat}.")
+	print(f"binned_stats() with NaN values matches scipy.stats.binned_statistic() for {len(stats)} statistics")
+
+def best(func,*args):
+	return(min(repeat(lambda: func(*args),number=1,repeat=5)))
+
+if __name__=='__main__':
+	rng=np.random.default_rng(0)
+	check_nan_stats(rng)
+	print(f"{'N':>10} {'bins':>6} {'search':>9} {'uniform':>9} {'speedup':>8} | {'np.hist (w)':>11} {'uniform (w)':>11} {'speedup':>8}")
+	for N in [10**4,10**5,10**6,10**7]:
+		data=rng.normal(size=N)
+		weights=rng.uniform(size=N)
+		for nbins in [30,1000]:
+			edges=np.linspace(-4,4,nbins+1)
+			t_s=best(general_index,data,edges)
+			t_u=best(bin_index,data,edges)
+			t_h=best(numpy_counts,data,edges,weights)
+			t_c=best(uniform_counts,data,edges,weights)
+			print(f"{N:>10} {nbins:>6} {t_s*1e3:>7.2f}ms {t_u*1e3:>7.2f}ms {t_s/t_u:>7.1f}x | {t_h*1e3:>9.2f}ms {t_c*1e3:>9.2f}ms {t_h/t_c:>7.1f}x")
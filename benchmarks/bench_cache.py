@@ -0,0 +1,66 @@
+"""
+Benchmark of the on-disk cache of computed products (cache.cached()), timing compute.hist2D() and
+compute.contourp() without the cache, with an empty cache and when loaded from the cache. Before
+timing, the cached results are checked against uncached ones for masked arrays with different
+masks over the same data, and for an input modified in place between calls.
+
+Usage: python benchmarks/bench_cache.py [number of points, default: 1000000]
+"""
+
+import sys
+from os.path import abspath, dirname, join
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+sys.path.insert(0,join(dirname(dirname(abspath(__file__))),'src'))
+
+import numpy as np
+from splotch import compute
+from splotch.cache import clear_cache
+from splotch.defaults import Params
+
+def uncached(func,*args,**kwargs):
+	cache_dir,Params.cache_dir=Params.cache_dir,None
+	try:
+		return(func(*args,**kwargs))
+	finally:
+		Params.cache_dir=cache_dir
+
+def check_cache(rng,N=10000):
+	x=rng.normal(size=N)
+	y=rng.normal(size=N)
+	inputs=[('masked x>1',lambda: np.ma.masked_array(x,mask=x>1)),('masked x>0',lambda: np.ma.masked_array(x,mask=x>0)),
+			('unmasked',lambda: x)]
+	for name,data in inputs:
+		result=compute.hist2D(data(),y,dens=False)[2]
+		expected=uncached(compute.hist2D,data(),y,dens=False)[2]
+		if not np.array_equal(result,expected):
+			raise AssertionError(f"Cached 2D histogram of {name} data differs from the uncached one.")
+	z=y.copy()
+	compute.hist2D(x,z,dens=False)
+	z[:N//2]+=1 # Modified in place, so the cached result of the same array must not be reused
+	if not np.array_equal(compute.hist2D(x,z,dens=False)[2],uncached(compute.hist2D,x,z,dens=False)[2]):
+		raise AssertionError("Cached 2D histogram of an array modified in place differs from the uncached one.")
+	print("Cached results match the uncached ones for masked arrays and arrays modified in place")
+
+def timed(func,*args):
+	t=perf_counter()
+	func(*args)
+	return(perf_counter()-t)
+
+if __name__=='__main__':
+	N=int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+	rng=np.random.default_rng(0)
+	x=rng.normal(size=N)
+	y=x+rng.normal(size=N)
+	with TemporaryDirectory() as cache_dir:
+		Params.cache_dir=cache_dir
+		check_cache(rng)
+		clear_cache()
+		print(f"{'':>10} {'no cache':>9} {'stored':>9} {'loaded':>9}")
+		for name,func in [('hist2D',compute.hist2D),('contourp',compute.contourp)]:
+			t_u=timed(uncached,func,x,y)
+			t_s=timed(func,x,y)
+			t_l=timed(func,x,y)
+			print(f"{name:>10} {t_u*1e3:>7.1f}ms {t_s*1e3:>7.1f}ms {t_l*1e3:>7.1f}ms")
+		Params.cache_dir=None
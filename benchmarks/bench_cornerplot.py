@@ -0,0 +1,45 @@
+"""
+Benchmark of axis_func.cornerplot() with the products of the panels (histograms, contour levels
+and scatter densities) computed in this process (n_jobs=None) and in pools of processes, for the
+default binning, logarithmic axes, explicit bin edges, kernel density contours and scatter plots
+coloured by density. The speedup is bounded by the number of CPUs available, which is printed.
+
+Usage: python benchmarks/bench_cornerplot.py [number of samples, default: 1000000] [number of parameters, default: 5]
+"""
+
+import sys
+from os import sched_getaffinity
+from os.path import abspath, dirname, join
+from time import perf_counter
+
+sys.path.insert(0,join(dirname(dirname(abspath(__file__))),'src'))
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+from splotch.axis_func import cornerplot
+
+def timed(data,n_jobs,kw):
+	t=perf_counter()
+	cornerplot(data,n_jobs=n_jobs,**kw)
+	t=perf_counter()-t
+	plt.close('all')
+	return(t)
+
+if __name__=='__main__':
+	N=int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+	npar=int(sys.argv[2]) if len(sys.argv) > 2 else 5
+	rng=np.random.default_rng(0)
+	data=np.exp(0.5*rng.multivariate_normal(np.zeros(npar),np.eye(npar)+0.5,size=N))
+	cases={'contour':{},
+		   'contour, log axes':{'contour_kw':{'xlog':True,'ylog':True}},
+		   'contour, bin edges':{'contour_kw':{'bin_type':'edges','bins':np.linspace(0,5,100)}},
+		   'contour, KDE':{'contour_kw':{'density':'kde'}},
+		   'scatter, density':{'pair_type':'scatter','scatter_kw':{'density':True,'s':1}}}
+	jobs=[None,2,4,-1]
+	print(f"{N} samples, {npar} parameters, {len(sched_getaffinity(0))} CPUs available")
+	print(f"{'':>20}"+''.join([f"{f'n_jobs={n}':>12}" for n in jobs]))
+	for name,kw in cases.items():
+		times=[timed(data,n,kw) for n in jobs]
+		print(f"{name:>20}"+''.join([f"{t:>11.2f}s" for t in times]))
@@ -0,0 +1,38 @@
+"""
+Benchmark of the time taken by `import splotch`, which fails (with exit status 1) if it is over
+the given budget, or if it imports any of the heavy dependencies, which must only be imported
+when the functions that need them are first used. The time taken by the first use of some
+functions, which imports their dependencies, is also shown.
+
+Usage: python benchmarks/bench_import.py [budget in ms, default: 20]
+"""
+
+import sys
+from os.path import abspath, dirname, join
+from subprocess import run
+
+SRC=join(dirname(dirname(abspath(__file__))),'src')
+HEAVY=['numpy','matplotlib','scipy','sympy','pandas','astropy']
+
+def best_time(code,repeat=7):
+	"""Best wall time (in ms) of running code in a new interpreter, less that of an empty one."""
+	script=f"import sys,time; sys.path.insert(0,{SRC!r}); t=time.perf_counter(); {code}; print((time.perf_counter()-t)*1e3)"
+	return(min([float(run([sys.executable,'-c',script],capture_output=True,text=True,check=True).stdout) for _ in range(repeat)]))
+
+def loaded_heavy():
+	script=f"import sys; sys.path.insert(0,{SRC!r}); import splotch; print(' '.join(m for m in {HEAVY!r} if m in sys.modules))"
+	return(run([sys.executable,'-c',script],capture_output=True,text=True,check=True).stdout.split())
+
+if __name__=='__main__':
+	budget=float(sys.argv[1]) if len(sys.argv) > 1 else 20.0
+	t_import=best_time("import splotch")
+	heavy=loaded_heavy()
+	print(f"{'import splotch':>34} {t_import:>9.2f}ms (budget: {budget:.0f}ms)")
+	for code in ["import splotch; splotch.Params","import splotch; splotch.hist","import splotch; splotch.plots_2d",
+				 "import splotch.base_func","import splotch, numpy; splotch.HistStream1D(10,lims=(0,1))"]:
+		print(f"{code.split('; ',1)[-1]:>34} {best_time(code,repeat=3):>9.2f}ms")
+	if heavy:
+		print(f"FAIL: import splotch imports {', '.join(heavy)}")
+	if t_import > budget:
+		print(f"FAIL: import splotch takes {t_import:.2f}ms, over the budget of {budget:.0f}ms")
+	sys.exit(1 if heavy or t_import > budget else 0)
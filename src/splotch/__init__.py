@@ -1,5 +1,29 @@
-from .plots_1d import *
-from .plots_2d import *
-from .axis_func import *
-from .defaults import *
-from .styles import *
+from importlib import import_module
+
+# The public names of each submodule, which is only imported when one of its names is first used
+# (PEP 562), so that importing splotch does not import numpy, matplotlib or any other dependency
+_submodules={'plots_1d':['axline','brokenplot','curve','hist','plot'],
+			 'plots_2d':['contour','contourp','errorband','errorbar','errorbox','hexbin','hist2D','img','scatter',
+						 'sector','statband','statbar'],
+			 'axis_func':['CornerStream','adjust_text','colorbar','cornerplot','subplots'],
+			 'batch':['BatchRenderer'],
+			 'cache':['clear_cache'],
+			 'compute':[], # Its functions share the names of the plotting functions, so are only accessed through splotch.compute
+			 'streaming':['HistStream1D','HistStream2D','QuantileSketch','chunk_reader','reservoir_sample','stream_limits'],
+			 'defaults':['Params'],
+			 'styles':['reset_style','use_style']}
+_origin={name:module for module,names in _submodules.items() for name in names}
+
+__all__=list(_origin)
+
+def __getattr__(name):
+	if name in _origin:
+		value=getattr(import_module(f".{_origin[name]}",__name__),name)
+		globals()[name]=value # Later uses of the name do not go through __getattr__
+		return(value)
+	if name in _submodules or name == 'base_func': # Submodules are also imported on first use
+		return(import_module(f".{name}",__name__))
+	raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+def __dir__():
+	return(sorted(set(globals())|set(__all__)))
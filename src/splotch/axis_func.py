@@ -38,7 +38,7 @@ def adjust_text(which=['x','y'],ax=None,text_kw={},**kwargs):
 	from matplotlib.text import Text
 	from matplotlib.pyplot import gca
 	from numpy import array, shape, max as np_max, argmax, append#, flatten
-	from .base_func import axes_handler,dict_splicer,plot_finalizer
+	from .base_func import dict_splicer,plot_finalizer
 	
 	try:
 		_=(it for it in ax)
@@ -199,7 +199,7 @@ def colorbar(mappable=None,ax=None,label='',orientation='vertical',loc=1,transfo
 		The colorbar object.
 	"""
 	
-	from .base_func import axes_handler, dict_splicer
+	from .base_func import dict_splicer
 	from matplotlib.pyplot import gca
 	from mpl_toolkits.axes_grid1.inset_locator import inset_axes, zoomed_inset_axes
 	from mpl_toolkits.axes_grid1.colorbar import colorbar
@@ -210,15 +210,12 @@ def colorbar(mappable=None,ax=None,label='',orientation='vertical',loc=1,transfo
 	if ax is not None:
 		try: # check if iterable
 			_=(i for i in ax)
-			old_axes=axes_handler(ax[0])
 			axes=ax
 		except (TypeError):
-			old_axes=axes_handler(ax)
 			axes=[ax]
 			
 	else:
 		axes=[gca()]
-		old_axes=axes[0]
 	
 	if type(loc) != int:
 		raise NotImplementedError("loc must be specified as integer. Providing loc as a tuple-like as colorbar anchor position is not yet implemented.")
@@ -333,7 +330,7 @@ def colorbar(mappable=None,ax=None,label='',orientation='vertical',loc=1,transfo
 
 def cornerplot(data,columns=None,pair_type='contour',nsamples=None,sample_type='rand',labels=None,histlabel=None,
 				fig=None,figsize=None,wspace=0.0,hspace=0.0,squeeze=False,
-				hist_kw={},contour_kw={},scatter_kw={},hist2D_kw={},axes_kw={},_debug_=False,**kwargs):
+				hist_kw={},contour_kw={},scatter_kw={},hist2D_kw={},axes_kw={},n_jobs=None,weights=None,_debug_=False,**kwargs):
 	""" Creates a corner plot figure and subplots
 	
 	This function accepts columns of data representing multiple parameters in which each combination
@@ -345,7 +342,12 @@ def cornerplot(data,columns=None,pair_type='contour',nsamples=None,sample_type='
 	data : array-like
 		The input data frame with each parameter represented by an individual column, the zeroth
 		axis should be the list of samples and the next axis should be the number of dimensions.
-		Accepted data types are: pandas.DataFrame, pandas.Series, numpy.ndarray, astropy.table.Table.
+		Accepted data types are: pandas.DataFrame, pandas.Series, numpy.ndarray (including structured
+		arrays), dict of arrays and astropy.table.Table. The columns are used without copying the data
+		(except to convert them to floats), and pandas is only needed to give a DataFrame or Series.
+		Data that does not fit in memory can be given as the path to a .npy file, a numpy.memmap or
+		an iterator of 2D chunks, from which nsamples samples are drawn with sample_type='rand' in a
+		single pass (see streaming.reservoir_sample()).
 	columns : array-like
 		The column labels (or indices) that specify which columns within 'data' to use. if none
 		specified, every column in 'data' with a numeric datatype will be used. To group columns
@@ -368,6 +370,7 @@ def cornerplot(data,columns=None,pair_type='contour',nsamples=None,sample_type='
 			- 'end' : Takes the last `nsamples` samples (Useful for MCMC posteriors where the end is often better).
 			- 'rand' : Randomly selects a set of samples. (Only use if confident all posterior chains are stationary).
 			- 'thin' : Evenly select every m samples until a total of `nsamples` are kept.
+			- 'strat' : Randomly selects one sample from each of `nsamples` equal blocks of consecutive samples.
 		Default: 'end'
 	labels : array-like (str), optional
 		A list of axis labels to be assigned to each parameter. Must be of the same length or longer
@@ -397,16 +400,30 @@ def cornerplot(data,columns=None,pair_type='contour',nsamples=None,sample_type='
 		multiple groups, kw arguments in lists are assumed to correspond to each group.
 	hist_kw : dict, optional
 		Dictionary of keyword arguments to be parsed into the 1D histograms plots on the diagonals.
+	n_jobs : int, optional
+		The number of processes used to compute the products drawn in the panels (the histograms,
+		the contour levels and the scatter densities), which are computed before drawing any of the
+		plots from the columns in shared memory. If -1, one process per CPU is used. If None
+		(default), they are computed in this process.
+	weights : array-like, optional
+		The (non-negative) weight of each sample, e.g. importance weights, with which the samples
+		are drawn with probability proportional to their weight, so at least nsamples of them must be
+		positive. Only used with sample_type='rand'.
+		For data read in chunks, the weights can be given in any form accepted by the weights of
+		streaming.reservoir_sample(), with chunks matching those of the data.
 	**kwargs : Subplot instance properties
 		kwargs are used to specify properties of `subplots` instances
 		A list of valid `axis` kwargs can be found here:
 		[https://matplotlib.org/api/axes_api.html#matplotlib.axes.Axes](https://matplotlib.org/api/axes_api.html#matplotlib.axes.Axes "Matplotlib.axes.Axes")	
 	"""
-	from splotch.base_func import is_numeric, dict_splicer
+	from splotch.base_func import bin_axis, bin_index, is_numeric, dict_splicer, shared_map
+	from splotch.defaults import Params
 	from splotch.plots_2d import contourp, scatter, hist2D
-	from numpy import shape, reshape, full, ndarray, array, arange
-	from numpy.random import choice
-	from pandas import DataFrame, Series, RangeIndex
+	from splotch.streaming import reservoir_sample
+	from numpy import shape, reshape, full, ndarray, memmap, array, arange, asanyarray, asarray, count_nonzero, min_scalar_type, nan, nanmax, nanmin, sort
+	from numpy.ma import MaskedArray
+	from numpy.random import default_rng, randint
+	from collections.abc import Iterator
 	
 	from matplotlib.pyplot import figure
 	from matplotlib.figure import Figure
@@ -414,13 +431,8 @@ def cornerplot(data,columns=None,pair_type='contour',nsamples=None,sample_type='
 	from matplotlib.gridspec import GridSpec
 	
 	import warnings
-	
-	# Try to import astropy
-	try:
-		from astropy.table import Table
-		hasAstropy=True
-	except ImportError:
-		hasAstropy=False
+	from inspect import signature
+	from sys import modules
 	
 	# Catch deprecated parameters
 	if ('pair_kw' in kwargs.keys()):
@@ -433,8 +445,82 @@ def cornerplot(data,columns=None,pair_type='contour',nsamples=None,sample_type='
 	nGroups=shape(columns)[0] if len(shape(columns)) > 1 else 1	
 	if (_debug_ == True): print(f"Groups: {nGroups}")
 			
-	# Get number of parameters and dimensions
-	dims=shape(data)
+	# Draw the samples of data read in chunks in a single pass, so that only the sample is kept in memory
+	if (isinstance(data, (str, Iterator)) or (isinstance(data, memmap) and nsamples is not None and sample_type.lower() == 'rand')):
+		if (sample_type.lower() != 'rand'):
+			raise ValueError("Data read in chunks (from a .npy file or an iterator) can only be sampled with sample_type='rand'.")
+		if (nsamples is None):
+			raise ValueError("'nsamples' must be given for data read in chunks (from a .npy file or an iterator).")
+		data=reservoir_sample(data,nsamples,weights=weights)[0]
+		if (weights is not None and len(data) < nsamples):
+			warnings.warn(f"Only {len(data)} samples have a positive weight, fewer than 'nsamples' ({nsamples}).")
+		nsamples=None; weights=None # All the drawn samples are used
+	
+	# Validate input data, keeping a view of each column instead of converting the data to a DataFrame
+	pandas=modules.get('pandas') # pandas objects can only be given if pandas has already been imported
+	astropy_table=modules.get('astropy.table')
+	def unmasked(col): # Masked values (of astropy MaskedColumns or numpy masked arrays) are ignored as NaNs
+		if (isinstance(col, MaskedArray) and col.dtype.kind in 'biuf'):
+			return(asarray(col.astype(float).filled(nan)))
+		return(col)
+	if (pandas is not None and isinstance(data, pandas.Series)):
+		data=data.to_frame()
+	if (pandas is not None and isinstance(data, pandas.DataFrame)):
+		names=list(data.columns)
+		named=not isinstance(data.columns, pandas.RangeIndex)
+		column_of=lambda c: data[c].to_numpy()
+	elif (astropy_table is not None and isinstance(data, astropy_table.Table)):
+		names=list(data.colnames)
+		named=True
+		column_of=lambda c: data[c]
+	elif isinstance(data, dict): # Dictionary of columns
+		names=list(data.keys())
+		named=True
+		column_of=lambda c: asanyarray(data[c])
+	elif (isinstance(data, ndarray) and data.dtype.names is not None): # Structured array
+		names=list(data.dtype.names)
+		named=True
+		column_of=lambda c: data[c]
+	else:
+		try:
+			data=asarray(data)
+		except (ValueError):
+			data=None
+		if (data is None or data.ndim not in [1,2] or data.dtype.kind == 'O'):
+			raise ValueError(f"'data' must be pandas DataFrame/Series, np.ndarray, dict of arrays or astropy.Table object, not: {type(data)}")
+		if (data.ndim == 1):
+			data=data.reshape(-1,1)
+		names=list(range(data.shape[1]))
+		named=False
+		column_of=lambda c: data[:,c]
+	materialised={}
+	def column(c): # Each column is only converted to an array once, and masked columns are kept as they are until sampled
+		if c not in materialised:
+			materialised[c]=column_of(c)
+		return(materialised[c])
+	
+	if (columns == None): # no specific columns given
+		cols=[c for c in names if is_numeric(column(c))] # only include columns that are strictly numeric
+		columns=cols
+	else:
+		cols=[]; nonNumeric=[]
+		for kk, c in enumerate(array(columns).flatten()):
+			if (is_numeric(column(c))):
+				cols.append(c)
+			else:
+				nonNumeric.append(str(c))
+				del labels[kk]
+		
+		if (len(nonNumeric) > 0): # Warn if any columns were not numeric
+			warnings.warn("Data type of column(s) '{0}' not numeric, ignoring column(s).".format(','.join(nonNumeric))) 
+	
+	# check that at least one numeric column was found
+	if (len(cols) == 0): raise ValueError("No numeric columns found in data.")
+	
+	cols=reshape(cols, shape(columns)).T
+	
+	# Get number of samples and parameters
+	dims=(len(column(cols.flat[0])),len(names))
 	
 	# Validate plot parameters
 	if (isinstance(pair_type,(list,ndarray,tuple))):
@@ -458,79 +544,126 @@ def cornerplot(data,columns=None,pair_type='contour',nsamples=None,sample_type='
 			raise ValueError(f"Number of samples ({nsamples}) is greater than the total number of samples in data ({dims[0]})")
 		elif (nsamples <= 0):
 			raise ValueError(f"Number of samples ({nsamples}) must be positive and non-zero.")
+	# The random samples are drawn from a Generator, whose seed is drawn from the global state so that
+	# numpy.random.seed() still applies. Unlike numpy.random.choice(), Generator.choice() draws a small
+	# sample without permuting all the samples
+	rng=default_rng(randint(2**31)) if sample_type.lower() in ['rand','strat'] else None
 	if (sample_type.lower() == 'end'):
 		samps=arange(dims[0]-nsamples,dims[0])
+		rows=slice(dims[0]-nsamples,dims[0])
 	elif (sample_type.lower() == 'rand'):
-		samps=choice(arange(0,dims[0]),size=nsamples,replace=False)
+		p=None
+		if (weights is not None):
+			weights=asarray(weights,dtype=float).ravel()
+			if (len(weights) != dims[0]):
+				raise ValueError(f"Length of 'weights' ({len(weights)}) does not match the number of samples in data ({dims[0]}).")
+			if not (weights >= 0).all(): # Also catches NaN weights
+				raise ValueError("Weights must be non-negative.")
+			if (count_nonzero(weights) < nsamples):
+				raise ValueError(f"Number of samples ({nsamples}) is greater than the number of samples with a positive weight ({count_nonzero(weights)}).")
+			p=weights/weights.sum()
+		samps=sort(rng.choice(dims[0],size=nsamples,replace=False,p=p,shuffle=False)) # Sorted for a more local memory access
+		rows=samps
+	elif (sample_type.lower() == 'strat'):
+		bounds=arange(nsamples+1)*dims[0]//nsamples # Stratified over the order of the samples, without an N-sized array
+		samps=bounds[:-1]+(rng.random(nsamples)*(bounds[1:]-bounds[:-1])).astype(int)
+		rows=samps
 	elif (sample_type.lower() == 'thin'):
 		step=(dims[0]-1)//(nsamples-1) if nsamples > 1 else dims[0] # Get the largest possible step size given the sample size
 		offset=(dims[0] - step*(nsamples-1) - 1) // 2 # Offset of the initial point so that the points are centered
 		samps=array([offset + kk*step for kk in range(nsamples)])
+		rows=slice(offset,offset+step*(nsamples-1)+1,step)
 	else:
 		raise ValueError(f"Sample type '{sample_type}' not recognised.")
+	if (weights is not None and sample_type.lower() != 'rand'):
+		raise ValueError("'weights' can only be used with sample_type='rand'.")
 	
 	if (_debug_ == True): print(f"Number of samples: {len(samps)}")
 	
-	# Validate input data
-	if isinstance(data, DataFrame) or (hasAstropy and isinstance(data, Table)):
-		if (hasAstropy and isinstance(data, Table)): # Convert astropy.Table to pandas DataFrame if required
-			data=data.to_pandas()
-		if (columns == None): # no specific columns given
-			cols=[c for c in data.columns if is_numeric(data[c])] # only include columns that are strictly numeric
-			columns=cols
+	# Subsample each column only once into a float array. Regular row selections ('end' and 'thin')
+	# are slices, so the arrays are views of the data whenever the columns are already float arrays
+	samples={c:asarray(unmasked(column(c)[rows]),dtype=float) for c in set(cols.flat)}
+	
+	# Plan the binning of each column once: its limits are found only once, and its bin indices
+	# only once per number of bins, so that each pair histogram is a single 2D bincount of the
+	# indices of its two columns, and the diagonal histograms reuse the indices of the pairs
+	limits={}
+	binned={}
+	def column_index(c,nbins):
+		if c not in limits:
+			limits[c]=array([nanmin(samples[c]),nanmax(samples[c])])
+		if (c,nbins) not in binned:
+			_,edges,_=bin_axis(limits[c],'number',nbins) # The same edges as binning the full column
+			binned[(c,nbins)]=(edges,bin_index(samples[c],edges))
+		return(binned[(c,nbins)])
+	
+	def shared_bins(kw): # Number of bins if the pair plot can use the shared binning, None otherwise
+		if kw.get('bin_type') not in [None,'number'] or kw.get('xlog') or kw.get('ylog') or kw.get('density','hist')!='hist' \
+				or kw.get('c') is not None or kw.get('cstat') is not None:
+			return(None)
+		bins=kw.get('bins')
+		if bins is None:
+			return(max([10,int(nsamples**0.4)])) # The default of contourp and hist2D
+		return(bins if type(bins) is int else None)
+	
+	def arguments(func,kw,names): # The values that func takes for the given arguments from kw
+		params=signature(func).parameters
+		return(tuple([kw.get(k,params[k].default) for k in names]))
+	
+	arrays={}
+	def panel_task(kind,cx,cy,kw): # The product computed by _panel_product(), or None if the panel is drawn from the columns
+		if (kind == 'diag'):
+			nbins=kw.get('bins',rcParams['hist.bins'])
+			if type(nbins) is not int or 'range' in kw.keys() or 'weights' in kw.keys():
+				return(None)
+			index=column_index(cx,nbins)[1]
+			arrays[('index',cx,nbins)]=index.astype(min_scalar_type(-nbins)) # The smallest signed type holding -1 and all the indices
+			return((kind,cx,None,nbins,None))
+		if (kind == 'scatter'):
+			if not kw.get('density',False):
+				return(None)
+			args=('grid' if kw['density'] is True else kw['density'],)+arguments(scatter,kw,['dens_bins','dens_smooth'])
+		elif (kind == 'contour'):
+			percent=kw.get('percent')
+			percent=array([Params.contp_percent if percent is None else percent]).flatten()[::-1] # In the order drawn by contourp()
+			args=(percent,)+arguments(contourp,kw,['bin_type','bins','density','bw_method','xlog','ylog'])
 		else:
-			cols=[]; nonNumeric=[]
-			for kk, c in enumerate(array(columns).flatten()):
-				if (is_numeric(data[c])):
-					cols.append(c)
-				else:
-					nonNumeric.append(c)
-					del labels[kk]
-			
-			if (len(nonNumeric) > 0): # Warn if any columns were not numeric
-				warnings.warn("Data type of column(s) '{0}' not numeric, ignoring column(s).".format(','.join(nonNumeric))) 
-			
-		cols=reshape(cols, shape(columns)).T
-		
-		# check that at least one numeric column was found
-		if (len(cols) == 0): raise ValueError("No numeric columns found in data.")
-		
-	elif isinstance(data, Series):
-		data=DataFrame(data)
-		cols=list(data.columns)
-	elif isinstance(data, ndarray):
-		data=DataFrame(data) # recast numpy array into pandas DataFrame
-		
-		if (columns == None): # no specific columns given
-			cols=[c for c in data.columns if is_numeric(data[c])] # only include columns that are strictly numeric
+			if (kw.get('c') is not None):
+				return(None)
+			args=arguments(hist2D,kw,['bin_type','bins','dens','scale','cstat','nmin','xlog','ylog'])
+		nbins=None if kind == 'scatter' else shared_bins(kw)
+		if (nbins is None):
+			arrays[('column',cx)]=samples[cx]
+			arrays[('column',cy)]=samples[cy]
+			return((kind,cx,cy,None,args))
+		for c in [cx,cy]:
+			arrays[('index',c,nbins)]=column_index(c,nbins)[1].astype(min_scalar_type(-nbins))
+		return((kind,cx,cy,(nbins,column_index(cx,nbins)[0],column_index(cy,nbins)[0]),args))
+	
+	def diag_hist(ax,c,kw,counts):
+		if (counts is None):
+			ax.hist(samples[c],**kw)
+		else: # Drawn from the bin counts, as the weights of one point per bin
+			edges=column_index(c,kw.get('bins',rcParams['hist.bins']))[0]
+			ax.hist(edges[:-1],bins=edges,weights=counts,**{k:v for k,v in kw.items() if k!='bins'})
+	
+	def pair_plot(kind,cx,cy,ax,kw,product):
+		if (kind == 'scatter'):
+			if (product is None):
+				scatter(samples[cx],samples[cy],ax=ax,**kw)
+			else: # Coloured by the densities computed for the panel
+				scatter(samples[cx],samples[cy],ax=ax,c=product,**{k:v for k,v in kw.items() if k not in ['c','density','dens_bins','dens_smooth']})
 		else:
-			cols=[]; nonNumeric=[]
-			for kk, c in enumerate(array(columns).flatten()):
-				if (is_numeric(data[c])):
-					cols.append(c)
-				else:
-					nonNumeric.append(c)
-					del labels[kk]
-			
-			if (len(nonNumeric) > 0): # Warn if any columns were not numeric
-				warnings.warn("Data type of column(s) '{0}' not numeric, ignoring column(s).".format(','.join(nonNumeric))) 
-		
-		cols=reshape(array(data[cols].columns), shape(cols)).T
-	else:
-		try: # Attempt to cast input data of unknown type into pandas DataFrame
-			data=DataFrame(data)
-		except (ValueError):
-			raise ValueError(f"'data' must be pandas DataFrame/Series, np.ndarray or astropy.Table object, not: {type(data)}")
-	
+			{'contour':contourp,'hist2D':hist2D}[kind](samples[cx],samples[cy],ax=ax,computed=product,**kw)
 	
 	# Get the number of parameters to create axes for
-	npar=cols.size//nGroups if len(dims) > 1 else 1 # second axis defines the dimensions of parameters
+	npar=cols.size//nGroups
 	if (_debug_ == True): print(f"\nDimensions: {dims}")
 	if (_debug_ == True): print(f"\nAxes: {npar}")
 	
 	# Assign labels if none given
 	if (labels == None): # auto-generate labels from columns if available
-		if not isinstance(data.columns, RangeIndex):
+		if named:
 			labels=cols if nGroups<=1 else [c[0] for c in cols]
 	else:
 		if (len(labels) < npar):
@@ -581,35 +714,34 @@ def cornerplot(data,columns=None,pair_type='contour',nsamples=None,sample_type='
 		hist2D_kw=dict_splicer(hist2D_kw,nGroups,[1]*nGroups)
 	
 	
+	# Compute the numerical product of each panel (bin counts, contour levels and scatter densities)
+	# before drawing any of them, in a pool of processes if n_jobs is given, which read the columns
+	# and bin indices from shared memory
+	panels=[]
+	for ii in range(npar-1, -1, -1):
+		for jj in range(ii if len(pair_type) == 1 else npar-1, -1, -1):
+			kind='diag' if ii == jj else pair_type[0 if ii > jj else 1]
+			kind_kw={'diag':hist_kw,'scatter':scatter_kw,'contour':contour_kw,'hist2D':hist2D_kw}[kind]
+			for kk in range(nGroups):
+				if (nGroups > 1):
+					panels.append((ii,jj,kind,cols[jj][kk],cols[ii][kk],kind_kw[kk]))
+				else:
+					panels.append((ii,jj,kind,cols[jj],cols[ii],kind_kw))
+	tasks=[panel_task(kind,cx,cy,kw) for ii,jj,kind,cx,cy,kw in panels]
+	results=iter(shared_map(_panel_product,[task for task in tasks if task is not None],arrays,n_jobs=n_jobs))
+	products=[None if task is None else next(results) for task in tasks]
+	
 	if (_debug_): print("\nSubplots:")
 	for ii in range(npar-1, -1, -1):#(0, npar, 1):
 		for jj in range(ii if len(pair_type) == 1 else npar-1, -1, -1):#(0, ii+1, 1):
-			pair_num=0 if ii > jj else 1
-			
 			if (_debug_ == True): print(f" {ii},{jj} ",end='')
 			
-			if (ii==jj):
-				if (nGroups > 1):
-					for kk in range(nGroups):
-						axes[ii,jj].hist(data.iloc[samps][cols[jj][kk]],**hist_kw[kk])
+			for (_,_,kind,cx,cy,kw),product in [(p,q) for p,q in zip(panels,products) if p[:2] == (ii,jj)]:
+				if (kind == 'diag'):
+					diag_hist(axes[ii,jj],cx,kw,product)
 				else:
-					axes[ii,jj].hist(data.iloc[samps][cols[jj]],**hist_kw)
-			else:
-				if (pair_type[pair_num] == 'scatter'):
-					if (nGroups > 1):
-						for kk in range(nGroups):
-							scatter(data.iloc[samps][cols[jj][kk]],data.iloc[samps][cols[ii][kk]],ax=axes[ii,jj],**scatter_kw[kk])
-					else:
-						scatter(data.iloc[samps][cols[jj]],data.iloc[samps][cols[ii]],ax=axes[ii,jj],**scatter_kw)
-				elif (pair_type[pair_num] == 'contour'):
-					if (nGroups > 1):
-						for kk in range(nGroups):
-							contourp(data.iloc[samps][cols[jj][kk]],data.iloc[samps][cols[ii][kk]],ax=axes[ii,jj],**contour_kw[kk])
-					else:
-						contourp(data.iloc[samps][cols[jj]],data.iloc[samps][cols[ii]],ax=axes[ii,jj],**contour_kw)
-				elif (pair_type[pair_num] == 'hist2D'):
-					hist2D(data.iloc[samps][cols[jj]],data.iloc[samps][cols[ii]],ax=axes[ii,jj],**hist2D_kw)
-					
+					pair_plot(kind,cx,cy,axes[ii,jj],kw,product)
+			
 			if (labels is not None):
 				if (ii == npar-1):
 					axes[ii,jj].set_xlabel(labels[jj])
@@ -656,6 +788,235 @@ def cornerplot(data,columns=None,pair_type='contour',nsamples=None,sample_type='
 	else:
 		return(fig, axes)
 
+def _panel_product(task,arrays):
+	"""Computes the product drawn in a panel of cornerplot() from the columns and bin indices in arrays."""
+	from numpy import bincount, intp
+	from splotch.base_func import point_density
+	from splotch.compute import contourp, hist2D
+	from splotch.streaming import HistStream2D
+	
+	kind,cx,cy,binning,args=task
+	if (kind == 'diag'):
+		index=arrays[('index',cx,binning)]
+		return(bincount(index[index>=0],minlength=binning))
+	if (kind == 'scatter'):
+		return(point_density(arrays[('column',cx)],arrays[('column',cy)],*args))
+	if (binning is None):
+		x,y=arrays[('column',cx)],arrays[('column',cy)]
+	else: # The pair histogram is a single 2D bincount of the shared bin indices of its columns
+		nbins,x_edges,y_edges=binning
+		x,y=HistStream2D([x_edges,y_edges],bin_type='edges'),None
+		x.add_indices(arrays[('index',cx,nbins)].astype(intp),arrays[('index',cy,nbins)])
+	if (kind == 'contour'):
+		return(contourp(x,y,*args))
+	return(hist2D(x,y,None,*args))
+
+class CornerStream:
+	"""Corner plot of streamed samples
+	
+	Keeps a histogram accumulator for each parameter and each pair of parameters of a corner plot,
+	so that new samples (e.g. from running MCMC chains) can be added to the figure at a cost that
+	depends only on the number of new samples. The 1D histograms of the diagonals and the 2D
+	histograms of pair_type='hist2D' are updated in place, while the contours of
+	pair_type='contour' are redrawn from the accumulated histograms.
+	
+	Parameters
+	----------
+	lims : list, optional
+		The (min, max) limits of each parameter, out of which the samples are not counted. If not
+		given, they are taken from the first samples added, and a warning gives the fraction of any
+		later samples that fall outside them.
+	bins : int or list, optional
+		The number of bins of each parameter, used for both the 1D and 2D histograms. Default: 20.
+	pair_type : {'contour','hist2D'}, optional
+		The plotting type for the off-diagonal plots. Default: 'contour'.
+	labels : array-like (str), optional
+		A list of axis labels to be assigned to each parameter.
+	fig : pyplot.Figure, optional
+		The figure in which the axes are created, defaults to a new figure.
+	figsize : 2-tuple of floats, optional
+		The dimensions of the new figure (width, height) in inches.
+	wspace / hspace : float, optional
+		The horzontal/vertical spacing between figure subplots, expressed as a fraction of the
+		subplot width/height.
+	hist_kw : dict, optional
+		Dictionary of keyword arguments to be parsed to matplotlib's Axes.stairs for the 1D
+		histograms. As for Axes.hist, 'density' normalises the histograms and histtype='step'
+		draws them unfilled.
+	contour_kw, hist2D_kw : dict, optional
+		Dictionary of keyword arguments to be parsed to contourp() or hist2D() for the pair plots.
+	axes_kw : dict, optional
+		Dictionary of keyword arguments to be parsed to the creation of each subplot.
+	
+	Attributes
+	----------
+	fig : pyplot.Figure
+		The figure of the corner plot.
+	axes : ndarray
+		The (npar, npar) array of axes, with None above the diagonal.
+	hists : list of HistStream1D
+		The histogram accumulator of each parameter.
+	pairs : dict of HistStream2D
+		The histogram accumulator of each pair (jj, ii) of parameters, drawn in axes[ii,jj].
+	"""
+	
+	def __init__(self,lims=None,bins=20,pair_type='contour',labels=None,fig=None,figsize=None,wspace=0.0,hspace=0.0,
+				hist_kw={},contour_kw={},hist2D_kw={},axes_kw={}):
+		
+		if pair_type not in ['contour','hist2D']:
+			raise ValueError(f"pair_type must be 'contour' or 'hist2D' for streamed samples, not '{pair_type}'.")
+		self.bins=bins
+		self.pair_type=pair_type
+		self.labels=labels
+		self.hist_kw=hist_kw
+		self.pair_kw=contour_kw if pair_type=='contour' else hist2D_kw
+		self.axes_kw=axes_kw
+		self.wspace,self.hspace=wspace,hspace
+		self.fig=fig
+		self.figsize=figsize
+		self.axes=None
+		self.hists=None
+		self.pairs=None
+		self._artists={}
+		self._given_lims=lims is not None
+		if lims is not None:
+			self._setup(lims)
+	
+	def __len__(self):
+		return(0 if self.hists is None else self.hists[0].n)
+	
+	def _setup(self,lims):
+		from splotch.streaming import HistStream1D, HistStream2D
+		
+		npar=len(lims)
+		bins=self.bins if type(self.bins) in [list,tuple] else [self.bins]*npar
+		if len(bins)!=npar:
+			raise ValueError(f"The number of bins ({len(bins)}) does not match the number of parameters ({npar}).")
+		self.hists=[HistStream1D(bins[ii],bin_type='number',lims=lims[ii]) for ii in range(npar)]
+		self.pairs={(jj,ii):HistStream2D([self.hists[jj].edges,self.hists[ii].edges],bin_type='edges')
+					for ii in range(npar) for jj in range(ii)}
+	
+	def add(self,samples):
+		"""Adds a chunk of samples to the histograms.
+		
+		Parameters
+		----------
+		samples : array-like
+			The new samples, with one row per sample and one column per parameter.
+		
+		Returns
+		-------
+		None
+		"""
+		from numpy import asarray, isnan, nanmax, nanmin, zeros
+		from splotch.base_func import bin_index
+		
+		samples=asarray(samples,dtype=float)
+		if samples.ndim!=2:
+			raise ValueError("samples must be a 2D array with one row per sample and one column per parameter.")
+		if self.hists is None:
+			self._setup([(nanmin(col),nanmax(col)) for col in samples.T])
+		if samples.shape[1]!=len(self.hists):
+			raise ValueError(f"Number of parameters in samples ({samples.shape[1]}) does not match the corner plot ({len(self.hists)}).")
+		index=[bin_index(col,hist.edges) for col,hist in zip(samples.T,self.hists)] # Each column is binned only once
+		if not self._given_lims:
+			outside=zeros(len(samples),dtype=bool)
+			for col,ind in zip(samples.T,index):
+				outside|=(ind<0)&~isnan(col)
+			if outside.any():
+				import warnings
+				warnings.warn(f"{outside.mean():.2%} of the samples added have values outside the limits taken from the first "
+							  "samples, which are not counted. Give lims to cover the full range of the samples.")
+		for hist,ind in zip(self.hists,index):
+			hist.add_indices(ind)
+		for (jj,ii),pair in self.pairs.items():
+			pair.add_indices(index[jj],index[ii])
+	
+	def _make_axes(self):
+		from numpy import full
+		from matplotlib.pyplot import figure
+		from matplotlib.gridspec import GridSpec
+		
+		npar=len(self.hists)
+		if self.fig is None:
+			self.fig=figure(figsize=self.figsize)
+		self.axes=full(shape=(npar,npar),fill_value=None)
+		gs=GridSpec(ncols=npar,nrows=npar,wspace=self.wspace,hspace=self.hspace)
+		for ii in range(npar-1,-1,-1):
+			for jj in range(ii,-1,-1):
+				axes_kw=self.axes_kw.copy()
+				axes_kw['sharex']=None if ii==npar-1 else self.axes[npar-1,jj]
+				if ii==jj: # Do not share y-axes of 1D histograms
+					axes_kw['sharey']=None
+				elif ii==npar-1:
+					axes_kw['sharey']=None if jj==npar-2 else self.axes[ii,npar-2]
+				else:
+					axes_kw['sharey']=self.axes[ii,ii-1] if jj<ii-1 else None
+				self.axes[ii,jj]=self.fig.add_subplot(gs[ii,jj],**axes_kw)
+				if ii<npar-1:
+					self.axes[ii,jj].xaxis.set_tick_params(which='both',labelbottom=False)
+				elif self.labels is not None:
+					self.axes[ii,jj].set_xlabel(self.labels[jj])
+				if jj>0 or ii==jj:
+					self.axes[ii,jj].yaxis.set_tick_params(which='both',labelleft=False)
+				elif self.labels is not None:
+					self.axes[ii,jj].set_ylabel(self.labels[ii])
+	
+	def draw(self):
+		"""Draws the accumulated histograms, updating the plots that have already been drawn.
+		
+		Returns
+		-------
+		fig : pyplot.Figure
+			The figure of the corner plot.
+		axes : ndarray
+			The (npar, npar) array of axes, with None above the diagonal.
+		"""
+		from numpy import nan
+		from numpy.ma import masked_invalid
+		from matplotlib.collections import QuadMesh
+		from splotch.plots_2d import contourp, hist2D
+		
+		if self.hists is None:
+			raise ValueError("No samples have been added to the corner plot.")
+		if self.axes is None:
+			self._make_axes()
+		
+		hist_kw=self.hist_kw.copy()
+		dens=hist_kw.pop('density',False)
+		fill=hist_kw.pop('histtype','bar')!='step'
+		for ii,hist in enumerate(self.hists):
+			values=hist.histogram(dens=dens and hist.n>0)[2]
+			if ii in self._artists: # The step patch of the histogram is updated in place
+				self._artists[ii].set_data(values)
+			else:
+				self._artists[ii]=self.axes[ii,ii].stairs(values,hist.plot_edges,fill=fill,**hist_kw)
+			self.axes[ii,ii].relim()
+			self.axes[ii,ii].autoscale_view(scalex=False)
+		
+		for (jj,ii),pair in self.pairs.items():
+			ax=self.axes[ii,jj]
+			if self.pair_type=='hist2D' and (jj,ii) in self._artists: # The mesh is updated in place
+				mesh=self._artists[(jj,ii)][0]
+				_,_,Z,counts=pair.histogram(dens=self.pair_kw.get('dens',True),norm=self.pair_kw.get('scale'))
+				Z[counts<self.pair_kw.get('nmin',0)]=nan
+				mesh.set_array(masked_invalid(Z.T))
+				mesh.norm.vmin,mesh.norm.vmax=self.pair_kw.get('clim',[None,None])
+				mesh.autoscale_None()
+				continue
+			for artist in self._artists.get((jj,ii),[]): # The contours are redrawn from the histogram
+				artist.remove()
+			before=set(ax.get_children())
+			if self.pair_type=='hist2D':
+				hist2D(pair,ax=ax,**self.pair_kw)
+			else:
+				contourp(pair,ax=ax,**self.pair_kw)
+			new=[artist for artist in ax.get_children() if artist not in before]
+			self._artists[(jj,ii)]=[artist for artist in new if isinstance(artist,QuadMesh)] if self.pair_type=='hist2D' else new
+		
+		self.fig.canvas.draw_idle()
+		return(self.fig,self.axes)
+
 def subplots(naxes=None,nrows=None,ncols=None,va='top',ha='left',wspace=None,hspace=None,
 			 widths=None,heights=None,sharex='none',sharey='none',squeeze=True,
 			 figsize=None,axes_kw={},**kwargs):
@@ -754,7 +1115,7 @@ def subplots(naxes=None,nrows=None,ncols=None,va='top',ha='left',wspace=None,hsp
 	import warnings
 	from matplotlib import rcParams
 	from matplotlib.gridspec import GridSpec
-	from matplotlib.pyplot import figure, subplot
+	from matplotlib.pyplot import figure
 	from numpy import ceil, array, reshape, empty
 	
 	gridRef=[[0,0], [1,1], [1,2], [1,3], [2,2], [2,3], [2,3], [2,4], [2,4], [3,3], [2,5], [3,4], [3,4], 
@@ -822,11 +1183,11 @@ def subplots(naxes=None,nrows=None,ncols=None,va='top',ha='left',wspace=None,hsp
 		axes_kw[ii]["sharey"]=sharewith[sharey]
 			
 		if (row == (0 if va=='bottom' else (nrows-1)*2) and ha=='centre'):
-			axes[ii]=subplot(gs[row:row+2,col+delta:col+delta+2],**axes_kw[ii])
+			axes[ii]=fig.add_subplot(gs[row:row+2,col+delta:col+delta+2],**axes_kw[ii])
 		elif (col == (0 if ha=='right' else (ncols-1)*2) and va=='centre'):
-			axes[ii]=subplot(gs[row+delta:row+delta+2,col:col+2],**axes_kw[ii])
+			axes[ii]=fig.add_subplot(gs[row+delta:row+delta+2,col:col+2],**axes_kw[ii])
 		else:
-			axes[ii]=subplot(gs[row:row+2,col:col+2],**axes_kw[ii])
+			axes[ii]=fig.add_subplot(gs[row:row+2,col:col+2],**axes_kw[ii])
 	
 	# turn off redundant tick labeling
 	if sharex in ["col", "all"]:
@@ -1,6 +1,7 @@
 ########################################################################
 ######### Base functions for axis_funcs, plots_1d and plots_2d #########
 ########################################################################
+from functools import lru_cache
 
 ####################################
 # Boolean, unsigned integer, signed integer, float, complex.
@@ -8,13 +9,14 @@
 _NUMERIC_KINDS = set('buifc')
 
 ####################################
-# Generate new axes, return previous
+# Axes handling
 ####################################
 def axes_handler(new_axis):
 	"""New axis handler
 	
-	Base-level function used by most other plotting functions to set the current Axes instance to
-	ax and returns the old Axes instance to be later reverted.
+	Deprecated, as the plotting functions now draw on the given Axes directly instead of changing
+	the current Axes instance. Sets the current Axes instance to new_axis and returns the old Axes
+	instance to be later reverted.
 	
 	Parameters
 	----------
@@ -27,19 +29,42 @@ def axes_handler(new_axis):
 		The previous Axes instance.
 	"""
 	from matplotlib.pyplot import gca,sca
+	from warnings import warn
 	
+	warn("'axes_handler' is deprecated and will be removed in future versions, pass the Axes to the plotting functions instead",
+			DeprecationWarning,stacklevel=2)
 	curr_axis=gca()
 	sca(new_axis)
 	return(curr_axis)
 
+def set_current_image(ax,mappable):
+	"""Make mappable the current image of ax
+	
+	Base-level function used by the plotting functions that add their colour-mapped artist to ax
+	directly, so that pyplot.colorbar() and pyplot.clim() apply to it, as they would after the
+	equivalent pyplot function.
+	
+	Parameters
+	----------
+	ax : Axes object
+		The Axes instance that contains mappable.
+	mappable : ScalarMappable
+		The artist to be set as the current image.
+	"""
+	# matplotlib has no public method for this that leaves the current Axes instance unchanged
+	# (pyplot.sci() only applies to the current Axes), so the private method used by pyplot is
+	# called here, and only here
+	ax._sci(mappable)
+
 ####################################
 # Base function for 2D histograms
 ####################################
 def basehist2D(x,y,c,bin_type,bin_num,norm,dens,cstat,xlog,ylog):
 	"""2D histogram base calculation
 	
-	Base-level function used by plots_2d.hist2D() and plots_2d.sigma_cont() to calculate the
-	underlying histogram.
+	Base-level function used by plots_2d.hist2D() and plots_2d.contourp() to calculate the
+	underlying histogram. The data is binned only once, and both the value of each bin and the
+	number of data points that fall in it are returned.
 	
 	Parameters
 	----------
@@ -60,10 +85,10 @@ def basehist2D(x,y,c,bin_type,bin_num,norm,dens,cstat,xlog,ylog):
 		Normalization of the counts.
 	dens : bool
 		If false the histogram returns raw counts.
-	cstat : str or function
+	cstat : str, int, float or function
 		Must be one of the valid str arguments for the statistics variable in scipy.stats.binned_statistic_2d
-		('mean’, 'median’, 'count’, 'sum’, 'min’ or 'max’) or a function that takes a 1D array and
-		outputs an integer or float.
+		('mean’, 'median’, 'count’, 'sum’, 'min’ or 'max’), a number for the percentile to calculate
+		in each bin, or a function that takes a 1D array and outputs an integer or float.
 	xlog : bool
 		If True the scale of the x-axis is logarithmic.
 	ylog : bool
@@ -77,21 +102,95 @@ def basehist2D(x,y,c,bin_type,bin_num,norm,dens,cstat,xlog,ylog):
 		The bin edges on the y-axis.
 	Z : ndarray
 		The value of each bin.
+	counts : ndarray
+		The number of data points in each bin.
 	"""
 	
-	from numpy import histogram2d, size
-	from scipy.stats import binned_statistic_2d
+	from numpy import bincount, diff, outer, size, where
 	
 	x_temp,x_bins_hist,x_bins_plot=bin_axis(x,bin_type[0],bin_num[0],log=xlog)
 	y_temp,y_bins_hist,y_bins_plot=bin_axis(y,bin_type[1],bin_num[1],log=ylog)
-	if cstat:
-		Z=binned_statistic_2d(x_temp,y_temp,c,statistic=cstat,bins=[x_bins_hist,y_bins_hist])[0]
+	nx=len(x_bins_hist)-1
+	ny=len(y_bins_hist)-1
+	x_ind=bin_index(x_temp,x_bins_hist)
+	y_ind=bin_index(y_temp,y_bins_hist)
+	valid=(x_ind>=0)&(y_ind>=0)
+	index=where(valid,x_ind*ny+y_ind,-1)
+	counts=bincount(index[valid],minlength=nx*ny).reshape(nx,ny)
+	if cstat is not None:
+		Z=binned_stats(index,nx*ny,[(c,cstat)])[0].reshape(nx,ny)
 	else:
-		Z=histogram2d(x_temp,y_temp,bins=[x_bins_hist,y_bins_hist],
-					  density=False if (size(x_temp)==0 or size(y_temp)==0) else dens)[0]
-		if dens and norm:
-			Z*=1.0*len(x)/norm
-	return(x_bins_plot,y_bins_plot,Z)
+		Z=counts.astype('float')
+		if dens and size(x_temp)>0 and size(y_temp)>0:
+			Z/=Z.sum()*outer(diff(x_bins_hist),diff(y_bins_hist))
+			if norm:
+				Z*=1.0*len(x)/norm
+	return(x_bins_plot,y_bins_plot,Z,counts)
+
+def bin_index(data,edges):
+	"""Bin index of each data point
+	
+	Base-level function used by the histogram-related functions to assign each data point to a
+	bin. As with numpy.histogram(), all bins are half-open except the last one, which includes its
+	right edge. If the edges are uniform (as built by bin_axis() for bin_type='number' and
+	'width'), the indices are computed arithmetically instead of searching the edges.
+	
+	Parameters
+	----------
+	data : ndarray
+		Data to be binned.
+	edges : ndarray
+		The bin edges, in increasing order.
+	
+	Returns
+	-------
+	index : ndarray
+		The index of the bin each data point belongs to, with -1 for data points that fall outside
+		the bins (including NaNs).
+	"""
+	from numpy import append, asarray, clip, errstate, inf, intp, searchsorted, take, where
+	
+	data=asarray(data)
+	nbins=len(edges)-1
+	if uniform_bins(edges) and data.dtype.kind in 'biuf':
+		low,high=edges[0],edges[-1]
+		index=asarray(data,dtype=float)-low
+		index*=nbins/(high-low)
+		clip(index,-1,nbins,out=index)
+		with errstate(invalid='ignore'): # NaNs are cast to an arbitrary index, and excluded below
+			index=index.astype(intp)
+		clip(index,0,nbins-1,out=index)
+		# Rounding can place points next to an edge in the neighbouring bin, which is corrected here
+		index+=data>=take(append(edges[1:-1],inf),index)
+		index-=data<take(edges,index) # Points below the first edge end with index -1
+		index[~(data<=high)]=-1
+		return(index)
+	index=searchsorted(edges,data,side='right')-1
+	index[data==edges[-1]]=nbins-1 # The last bin is closed
+	return(where(index<nbins,index,-1))
+
+def uniform_bins(edges):
+	"""Uniform bin check
+	
+	Base-level function used by bin_index() to find whether the bins have a uniform width, in
+	which case the bin of each data point can be computed arithmetically.
+	
+	Parameters
+	----------
+	edges : ndarray
+		The bin edges, in increasing order.
+	
+	Returns
+	-------
+	uniform : bool
+		True if all bins have the same width (within floating-point precision).
+	"""
+	from numpy import diff, isfinite
+	
+	if len(edges)<3 or not isfinite(edges[-1]-edges[0]) or edges[-1]<=edges[0]:
+		return(False)
+	width=(edges[-1]-edges[0])/(len(edges)-1)
+	return(bool(abs(diff(edges)-width).max()<=1e-6*width))
 
 def bin_axis(data,btype,bins,log=False,plot_centre=False):
 	"""Bin construction for histograms
@@ -159,16 +258,10 @@ def bin_axis(data,btype,bins,log=False,plot_centre=False):
 		if nanmin(d)==nanmax(d):
 			h=linspace(nanmin(d)-0.5,nanmax(d)+0.5,num=b+1)
 		else:
-			from math import ceil,floor
-			from numpy import array,concatenate,cumsum,ones,sort
+			from numpy import concatenate,sort
 			d=sort(d)
-			L=len(d)
-			w_l=floor(L/b)
-			w_h=ceil(L/b)
-			n_l=b*ceil(L/b)-L
-			n_h=b-n_l
-			n=concatenate([ones(ceil(n_l/2))*w_l,ones(n_h)*w_h,ones(floor(n_l/2))*w_l]).astype('int32')
-			h=array([nanmin(d)]+[(d[i-1]+d[i])/2 for i in cumsum(n)[:-1]]+[nanmax(d)])
+			split=equal_split(len(d),b)
+			h=concatenate([[nanmin(d)],(d[split-1]+d[split])/2,[nanmax(d)]])
 		return(h)
 	
 	if log:
@@ -187,6 +280,418 @@ def bin_axis(data,btype,bins,log=False,plot_centre=False):
 		plot_bins=10**plot_bins
 	return(data,hist_bins,plot_bins)
 
+def equal_split(L,b):
+	"""Split points for bins with equal number of elements
+	
+	Base-level function used by bin_axis() to find where the sorted data must be split to create
+	bins with equal number of elements (or as close as possible) when bin_type='equal'. The bins
+	which need to have one element less than the rest are evenly distributed at both ends.
+	
+	Parameters
+	----------
+	L : int
+		Number of data points.
+	b : int
+		Number of bins.
+	
+	Returns
+	-------
+	split : ndarray
+		The number of sorted data points below each of the internal bin edges.
+	"""
+	from numpy import concatenate,cumsum,full
+	
+	w_l=L//b
+	w_h=-(-L//b)
+	n_l=b*w_h-L
+	n_h=b-n_l
+	n=concatenate([full(n_l-n_l//2,w_l),full(n_h,w_h),full(n_l//2,w_l)]).astype('int64')
+	return(cumsum(n)[:-1])
+
+####################################
+# Statistics of binned data
+####################################
+def binned_stats(index,nbins,stats):
+	"""Binned statistics from a single binning
+	
+	Base-level function used by plots_1d.hist(), plots_2d.hist2D(), plots_2d.statband() and
+	plots_2d.statbar() to compute several statistics of the binned data, with the data binned only
+	once. The data points are sorted by bin once, and all the statistics are computed from that
+	ordering. Percentiles (including the median) are computed for all bins at once from the data
+	sorted by bin and value, instead of calling numpy.percentile() on each bin. Repeated requests
+	of the same statistic for the same values are only computed once. NaN values are ignored by all
+	the statistics, as if the data points with NaN values were outside the bins.
+	
+	Parameters
+	----------
+	index : ndarray
+		The index of the bin each data point belongs to, as given by bin_index(), with -1 for data
+		points outside the bins.
+	nbins : int
+		The number of bins.
+	stats : list of tuples
+		Each element is a (values, statistic) pair, where values is an array with the value of each
+		data point, and statistic is one of 'mean', 'std', 'median', 'count', 'sum', 'min' or
+		'max', a number for the percentile to calculate in each bin, or a function that takes a 1D
+		array and outputs an integer or float, as in scipy.stats.binned_statistic().
+	
+	Returns
+	-------
+	results : list of ndarrays
+		The value of each statistic in each bin, in the same order as stats.
+	"""
+	from numbers import Number
+	from numpy import asarray, argsort, bincount, cumsum, errstate, floor, full, isnan, maximum, min_scalar_type, minimum, nan, split, sqrt
+	
+	index=asarray(index).ravel()
+	valid=index>=0
+	prepared={}
+	value_sorted={}
+	computed={}
+	
+	def binning(index): # The counts of each bin, shared by all the values without NaNs
+		counts=bincount(index,minlength=nbins)
+		filled=counts>0
+		return({'index':index,'counts':counts,'filled':filled,'starts':(cumsum(counts)-counts)[filled],'order':None})
+	
+	shared=binning(index[valid])
+	
+	def grouped(values,bins): # The values sorted by bin, and the first element of each filled bin
+		if bins['order'] is None:
+			bins['order']=argsort(bins['index'],kind='stable')
+		return(values[bins['order']],bins['starts'])
+	
+	def bin_sum(values,bins):
+		return(bincount(bins['index'],weights=values,minlength=nbins))
+	
+	def bin_mean(values,bins):
+		with errstate(invalid='ignore',divide='ignore'):
+			return(bin_sum(values,bins)/bins['counts'])
+	
+	def bin_std(values,bins):
+		dev=values-bin_mean(values,bins)[bins['index']]
+		with errstate(invalid='ignore',divide='ignore'):
+			return(sqrt(bincount(bins['index'],weights=dev*dev,minlength=nbins)/bins['counts']))
+	
+	def bin_count(values,bins):
+		return(bins['counts'].astype(float))
+	
+	def bin_reduce(ufunc):
+		def reduce(values,bins):
+			result=full(nbins,nan)
+			if bins['filled'].any():
+				result[bins['filled']]=ufunc.reduceat(*grouped(values,bins))
+			return(result)
+		return(reduce)
+	
+	def bin_percentile(q):
+		if not 0<=q<=100:
+			raise ValueError("Percentiles must be in the range [0, 100].")
+		def percentile(values,bins):
+			key=id(values)
+			if key not in value_sorted: # Sorted by value and then (stably) by bin, so that each bin is a sorted run
+				by_value=argsort(values)
+				# The smallest integer type for the bin index allows numpy to use a radix sort
+				by_bin=argsort(bins['index'][by_value].astype(min_scalar_type(nbins)),kind='stable')
+				value_sorted[key]=values[by_value[by_bin]]
+			sorted_values=value_sorted[key]
+			n=bins['counts'][bins['filled']]
+			pos=q/100*(n-1) # Linear interpolation between the closest ranks, as numpy.percentile()
+			low=floor(pos).astype(n.dtype)
+			high=minimum(low+1,n-1)
+			frac=pos-low
+			v_low=sorted_values[bins['starts']+low]
+			v_high=sorted_values[bins['starts']+high]
+			result=full(nbins,nan)
+			with errstate(invalid='ignore'):
+				result[bins['filled']]=v_low+(v_high-v_low)*frac
+			return(result)
+		return(percentile)
+	
+	def bin_apply(func):
+		def apply(values,bins):
+			from warnings import catch_warnings, simplefilter
+			
+			try: # The value for empty bins, as in scipy.stats.binned_statistic()
+				with catch_warnings(), errstate(all='ignore'):
+					simplefilter('ignore')
+					empty=func(values[:0])
+			except Exception:
+				empty=nan
+			result=full(nbins,empty,dtype=float)
+			sorted_values,starts=grouped(values,bins)
+			for i,group in zip(bins['filled'].nonzero()[0],split(sorted_values,starts[1:])):
+				result[i]=func(group)
+			return(result)
+		return(apply)
+	
+	stat_funcs={'mean':bin_mean,'std':bin_std,'sum':bin_sum,'count':bin_count,
+				'min':bin_reduce(minimum),'max':bin_reduce(maximum),'median':bin_percentile(50)}
+	results=[]
+	for values,stat in stats:
+		key=(id(values),stat if isinstance(stat,(str,Number)) else id(stat))
+		if key in computed: # Copied, so that the results can be modified independently
+			results.append(computed[key].copy())
+			continue
+		if isinstance(stat,Number):
+			func=bin_percentile(stat)
+		elif callable(stat):
+			func=bin_apply(stat)
+		elif stat in stat_funcs:
+			func=stat_funcs[stat]
+		else:
+			raise ValueError(f"Statistic '{stat}' not recognised.")
+		if id(values) not in prepared:
+			prepared_values=asarray(values,dtype=float).ravel()[valid]
+			nans=isnan(prepared_values)
+			if nans.any(): # NaNs are dropped before binning, so they are ignored by all the statistics
+				prepared[id(values)]=(prepared_values[~nans],binning(shared['index'][~nans]))
+			else:
+				prepared[id(values)]=(prepared_values,shared)
+		computed[key]=func(*prepared[id(values)])
+		results.append(computed[key])
+	return(results)
+
+####################################
+# Pool of processes over shared arrays
+####################################
+def shared_map(func,tasks,arrays,n_jobs=None):
+	"""Tasks computed from shared arrays
+	
+	Base-level function used by axis_func.cornerplot() to compute the products of its panels in a
+	pool of processes. The arrays are copied once to shared memory, from which all the processes
+	read them, so that they are not pickled with each task.
+	
+	Parameters
+	----------
+	func : function
+		Module-level function called as func(task, arrays) for each task, where arrays is a dict
+		with the same keys as the given arrays.
+	tasks : list
+		The tasks, which must be picklable.
+	arrays : dict of ndarray
+		The arrays read by the tasks.
+	n_jobs : int, optional
+		The number of processes used. If None or 1, the tasks are run in this process, and if -1,
+		one process per CPU is used.
+	
+	Returns
+	-------
+	results : list
+		The result of each task, in the same order as tasks.
+	"""
+	from numpy import ndarray
+	
+	if n_jobs is None or n_jobs==1 or len(tasks)<2:
+		return([func(task,arrays) for task in tasks])
+	
+	from concurrent.futures import ProcessPoolExecutor
+	from multiprocessing import shared_memory
+	from os import cpu_count
+	
+	if n_jobs<0:
+		n_jobs=cpu_count()
+	blocks=[]
+	try:
+		specs=[]
+		for key,array in arrays.items():
+			block=shared_memory.SharedMemory(create=True,size=max([1,array.nbytes]))
+			blocks.append(block)
+			ndarray(array.shape,dtype=array.dtype,buffer=block.buf)[...]=array
+			specs.append((key,block.name,array.shape,array.dtype.str))
+		with ProcessPoolExecutor(max_workers=min([n_jobs,len(tasks)]),initializer=_attach_arrays,initargs=(specs,)) as pool:
+			results=list(pool.map(_shared_task,[(func,task) for task in tasks]))
+	finally:
+		for block in blocks:
+			block.close()
+			block.unlink()
+	return(results)
+
+_shared_arrays=None
+
+def _attach_arrays(specs):
+	"""Initialiser of the processes of shared_map(), which attaches them to the shared arrays."""
+	from multiprocessing import shared_memory
+	from numpy import ndarray
+	global _shared_arrays
+	
+	_shared_arrays={}
+	for key,name,shape,dtype in specs:
+		try: # The blocks are removed by shared_map(), not when the process exits
+			block=shared_memory.SharedMemory(name=name,track=False)
+		except TypeError: # Python < 3.13, where the block is registered under the same name as in shared_map()
+			block=shared_memory.SharedMemory(name=name)
+		array=ndarray(shape,dtype=dtype,buffer=block.buf)
+		array.flags.writeable=False
+		_shared_arrays[key]=(block,array) # The block is kept open while the array is in use
+
+def _shared_task(task):
+	func,task=task
+	return(func(task,{key:array for key,(_,array) in _shared_arrays.items()}))
+
+####################################
+# Point densities for scatter
+####################################
+def point_density(x,y,dens_type='grid',bins=None,smooth=None):
+	"""Density estimate at the position of each data point
+	
+	Base-level function used by plots_2d.scatter() to colour-code points by their local density.
+	The 'grid' estimate bins the points into a 2D histogram with basehist2D(), smooths it with a
+	Gaussian kernel and linearly interpolates the result back to each point, which scales as
+	O(N + bins²). The 'kde' estimate evaluates scipy.stats.gaussian_kde at every point, which
+	scales as O(N²).
+	
+	Parameters
+	----------
+	x : ndarray
+		Position of data points in the x axis.
+	y : ndarray
+		Position of data points in the y axis.
+	dens_type : {'grid','kde'}, optional
+		The type of density estimate. Default: 'grid'.
+	bins : int or array-like, optional
+		Number of bins of the grid for each axis, only used when dens_type='grid'. Default: 200.
+	smooth : float or array-like, optional
+		Standard deviation of the Gaussian kernel, given in units of bins when dens_type='grid'
+		or as the bw_method factor of scipy.stats.gaussian_kde when dens_type='kde'. If not
+		given, Scott's rule is used.
+	
+	Returns
+	-------
+	dens : ndarray
+		The density at the position of each data point.
+	"""
+	from numpy import array,asarray,float64,nanstd,size,vstack
+	
+	x=asarray(x,dtype=float64)
+	y=asarray(y,dtype=float64)
+	if dens_type=='kde':
+		from scipy.stats import gaussian_kde
+		xy=vstack([x,y])
+		return(gaussian_kde(xy,bw_method=smooth)(xy))
+	if dens_type!='grid':
+		raise ValueError(f"Density type '{dens_type}' not recognised. Must be one of {{'grid'|'kde'}}.")
+	if size(x)==0:
+		return(array([]))
+	
+	from scipy.ndimage import gaussian_filter,map_coordinates
+	
+	if bins is None:
+		bins=200
+	if type(bins) not in [list,tuple]:
+		bins=[bins]*2
+	X,Y,Z,_=basehist2D(x,y,None,['number']*2,bins,None,True,None,False,False)
+	dX=X[1]-X[0]
+	dY=Y[1]-Y[0]
+	if smooth is None: # Scott's rule, converted to units of bins
+		factor=size(x)**(-1.0/6)
+		smooth=[factor*nanstd(x)/dX,factor*nanstd(y)/dY]
+	Z=gaussian_filter(Z,sigma=smooth,mode='constant')
+	
+	# Fractional bin-centre coordinates of each point on the grid
+	coords=array([(x-X[0])/dX-0.5,(y-Y[0])/dY-0.5])
+	return(map_coordinates(Z,coords,order=1,mode='nearest'))
+
+####################################
+# Binned kernel density estimate
+####################################
+def binned_kde(x,y,gridsize=None,bw_method=None,xlog=False,ylog=False):
+	"""Kernel density estimate on a grid
+	
+	Base-level function used by plots_2d.contourp() to estimate the density of the data points
+	on a regular grid. The points are linearly binned onto the grid (each point is shared among
+	the four closest grid points), which is then convolved with a Gaussian kernel with an FFT.
+	This scales as O(N + G log G) for G grid points, instead of the O(N·G) of evaluating
+	scipy.stats.gaussian_kde on the grid, with the same bandwidth (including the covariance of
+	the data).
+	
+	Parameters
+	----------
+	x : array-like
+		Position of data points in the x axis.
+	y : array-like
+		Position of data points in the y axis.
+	gridsize : int or list, optional
+		Number of grid points for each axis, at least 2. Default: 128.
+	bw_method : {'scott','silverman'} or float, optional
+		The bandwidth factor, as for scipy.stats.gaussian_kde: the kernel covariance is the data
+		covariance multiplied by the square of the factor. Default: 'scott'.
+	xlog : bool, optional
+		If True, the density is estimated for the logarithm of the x values.
+	ylog : bool, optional
+		If True, the density is estimated for the logarithm of the y values.
+	
+	Returns
+	-------
+	X : ndarray
+		The position of the grid points on the x-axis.
+	Y : ndarray
+		The position of the grid points on the y-axis.
+	Z : ndarray
+		The density at each grid point.
+	"""
+	from numpy import arange, asarray, bincount, ceil, cov, diag, exp, floor, isfinite, linspace, log10, meshgrid, pi, sqrt, vstack
+	from numpy.linalg import det, inv
+	from scipy.signal import fftconvolve
+	
+	if gridsize is None:
+		gridsize=128
+	if type(gridsize) not in [list,tuple]:
+		gridsize=[gridsize]*2
+	gridsize=[int(g) for g in gridsize]
+	if min(gridsize) < 2:
+		raise ValueError(f"The KDE grid must have at least 2 points on each axis, not {gridsize}.")
+	x=asarray(x,dtype=float).ravel()
+	y=asarray(y,dtype=float).ravel()
+	if xlog:
+		x=log10(x)
+	if ylog:
+		y=log10(y)
+	keep=isfinite(x)&isfinite(y)
+	x=x[keep]
+	y=y[keep]
+	n=len(x)
+	if n < 2:
+		raise ValueError(f"A KDE needs at least 2 data points with finite values, not {n}.")
+	if x.min() == x.max() or y.min() == y.max():
+		raise ValueError("A KDE cannot be computed for data with a constant value on an axis.")
+	if bw_method is None or bw_method in ['scott','silverman']:
+		factor=n**(-1.0/6) # Scott's and Silverman's rules are the same in 2D
+	else:
+		factor=float(bw_method)
+	k_cov=cov(vstack([x,y]))*factor**2
+	if not det(k_cov) > 0: # e.g. for all the points on a line, as scipy.stats.gaussian_kde also fails
+		raise ValueError("A KDE cannot be computed for data whose covariance matrix is singular (e.g. lying on a line).")
+	k_sig=sqrt(diag(k_cov))
+	
+	# The grid extends 3 kernel standard deviations beyond the data, so that the contours close
+	grids=[linspace(d.min()-3*s,d.max()+3*s,g) for d,s,g in zip([x,y],k_sig,gridsize)]
+	steps=[g[1]-g[0] for g in grids]
+	frac=[]
+	for d,g,step,size in zip([x,y],grids,steps,gridsize):
+		f=(d-g[0])/step
+		i=floor(f).clip(0,size-2).astype('intp')
+		frac.append((i,f-i))
+	(ix,wx),(iy,wy)=frac
+	nx,ny=gridsize
+	counts=0
+	for dx,dy,w in [(0,0,(1-wx)*(1-wy)),(1,0,wx*(1-wy)),(0,1,(1-wx)*wy),(1,1,wx*wy)]:
+		counts=counts+bincount((ix+dx)*ny+iy+dy,weights=w,minlength=nx*ny)
+	counts=counts.reshape(nx,ny)
+	
+	# Gaussian kernel on the grid spacing, truncated at 4 standard deviations
+	half=[int(min(ceil(4*s/step),g-1)) for s,step,g in zip(k_sig,steps,gridsize)]
+	KX,KY=meshgrid(arange(-half[0],half[0]+1)*steps[0],arange(-half[1],half[1]+1)*steps[1],indexing='ij')
+	k_inv=inv(k_cov)
+	kernel=exp(-0.5*(k_inv[0,0]*KX**2+2*k_inv[0,1]*KX*KY+k_inv[1,1]*KY**2))/(2*pi*sqrt(det(k_cov)))
+	Z=fftconvolve(counts,kernel,mode='same').clip(min=0)/n
+	X,Y=grids
+	if xlog:
+		X=10**X
+	if ylog:
+		Y=10**Y
+	return(X,Y,Z)
+
 ####################################
 # Distribute kwargs dicts
 ####################################
@@ -232,13 +737,139 @@ def dict_splicer(plot_dict,Ld,Lx):
 	return(dict_list)
 
 ####################################
-# Density/scaled counts for hexbin
+# Base function for hexagonal 2D histograms
 ####################################
-#def hexarea(value,norm):
-#	return(value/norm)
-#
-#def hexscaled(value,scale):
-#	return(1.0*value/scale)
+def basehexbin(x,y,c,gridsize,extent,dens,norm,cstat,mincnt,xlog,ylog):
+	"""Hexagonal 2D histogram base calculation
+	
+	Base-level function used by plots_2d.hexbin() to calculate the values of the hexagonal bins.
+	The grid is the same as the one used by matplotlib.pyplot.hexbin(): two interleaved
+	rectangular lattices of hexagon centres, with each data point assigned to the closest centre.
+	The assignment is done with vectorized arithmetic, and the counts, densities and binned
+	statistics are computed in a single pass with bincount() and binned_stats().
+	
+	Parameters
+	----------
+	x : array-like
+		Position of data points in the x axis.
+	y : array-like
+		Position of data points in the y axis.
+	c : array-like or None
+		If given, defines the value used for the binned statistics.
+	gridsize : list
+		The number of hexagons in the x and y directions.
+	extent : array-like or None
+		The limits of the bins, as (left, right, bottom, top). If None, the limits of the data are used.
+	dens : bool
+		If false the histogram returns raw counts. Ignored if c is given.
+	norm : float
+		Normalization of the densities. If not given, the number of data points is used.
+	cstat : str, int, float, function or None
+		The statistic computed from c in each hexagon, as accepted by binned_stats(). Defaults to
+		'mean' if c is given.
+	mincnt : int or None
+		The minimum number of points required in a hexagon in order to be returned. As in
+		matplotlib.pyplot.hexbin(), a hexagon must have more than mincnt points if c is given or
+		dens is True, while empty hexagons are returned if mincnt is None and the raw counts are
+		requested.
+	xlog : bool
+		If True, the hexagons are built from the logarithm of the x values.
+	ylog : bool
+		If True, the hexagons are built from the logarithm of the y values.
+	
+	Returns
+	-------
+	offsets : ndarray
+		The centres of the returned hexagons, in binning (i.e., logarithmic if xlog/ylog) space.
+	values : ndarray
+		The value of each returned hexagon.
+	hexagon : ndarray
+		The vertices of a hexagon centred at the origin, in binning space.
+	extent : tuple
+		The limits of the hexagon grid, as (left, right, bottom, top), in binning space.
+	"""
+	from numpy import arange, asarray, bincount, floor, isfinite, log10, repeat, rint, tile, where, zeros
+	
+	nx,ny=gridsize
+	x=asarray(x,dtype=float).ravel()
+	y=asarray(y,dtype=float).ravel()
+	L=len(x)
+	keep=isfinite(x)&isfinite(y)
+	if c is not None:
+		c=asarray(c,dtype=float).ravel()
+		keep&=isfinite(c)
+		c=c[keep]
+	x=x[keep]
+	y=y[keep]
+	if xlog:
+		if (x<=0).any():
+			raise ValueError("x contains non-positive values, so can not be log-scaled")
+		x=log10(x)
+	if ylog:
+		if (y<=0).any():
+			raise ValueError("y contains non-positive values, so can not be log-scaled")
+		y=log10(y)
+	if extent is not None:
+		xmin,xmax,ymin,ymax=extent
+	else:
+		xmin,xmax=(x.min(),x.max()) if len(x) else (0,1)
+		ymin,ymax=(y.min(),y.max()) if len(y) else (0,1)
+		xmin,xmax=_nonsingular(xmin,xmax,expander=0.1)
+		ymin,ymax=_nonsingular(ymin,ymax,expander=0.1)
+	padding=1.e-9*(xmax-xmin) # The hexagons exactly cover the x range, so padding avoids roundoff errors
+	xmin-=padding
+	xmax+=padding
+	sx=(xmax-xmin)/nx
+	sy=(ymax-ymin)/ny
+	
+	# Each point goes to the closest centre of either the (nx+1)*(ny+1) lattice at integer
+	# positions or the nx*ny lattice shifted by half a hexagon, with -1 for points outside the grid
+	ix=(x-xmin)/sx
+	iy=(y-ymin)/sy
+	ix1=rint(ix)
+	iy1=rint(iy)
+	ix2=floor(ix)
+	iy2=floor(iy)
+	lattice1=(ix-ix1)**2+3.0*(iy-iy1)**2<(ix-ix2-0.5)**2+3.0*(iy-iy2-0.5)**2
+	n1=(nx+1)*(ny+1)
+	in1=(ix1>=0)&(ix1<nx+1)&(iy1>=0)&(iy1<ny+1)
+	in2=(ix2>=0)&(ix2<nx)&(iy2>=0)&(iy2<ny)
+	index=where(lattice1,where(in1,ix1*(ny+1)+iy1,-1),where(in2,n1+ix2*ny+iy2,-1)).astype('intp')
+	nhex=n1+nx*ny
+	counts=bincount(index[index>=0],minlength=nhex)
+	
+	if c is not None:
+		values=binned_stats(index,nhex,[(c,'mean' if cstat is None else cstat)])[0]
+		good=counts>(mincnt or 0)
+	elif dens:
+		hex_area=sx*sy/2
+		values=counts/hex_area/(norm if norm else L)
+		good=counts>(mincnt or 0)
+	else:
+		values=counts.astype('float')
+		good=counts>=mincnt if mincnt is not None else counts>=0
+	
+	offsets=zeros((nhex,2))
+	offsets[:n1,0]=repeat(arange(nx+1),ny+1)
+	offsets[:n1,1]=tile(arange(ny+1),nx+1)
+	offsets[n1:,0]=repeat(arange(nx)+0.5,ny)
+	offsets[n1:,1]=tile(arange(ny),nx)+0.5
+	offsets*=[sx,sy]
+	offsets+=[xmin,ymin]
+	hexagon=[sx,sy/3]*asarray([[.5,-.5],[.5,.5],[0.,1.],[-.5,.5],[-.5,-.5],[0.,-1.]])
+	return(offsets[good],values[good],hexagon,(xmin,xmax,ymin,ymax))
+
+def _nonsingular(vmin,vmax,expander):
+	"""Expands the range (vmin, vmax) if it is too small, as matplotlib.transforms.nonsingular."""
+	from numpy import finfo
+	
+	vmin,vmax=float(vmin),float(vmax)
+	maxabs=max([abs(vmin),abs(vmax)])
+	if maxabs<1e21*finfo(float).tiny or (vmin==0 and vmax==0):
+		return(-expander,expander)
+	if vmax-vmin<=maxabs*1e-15:
+		return(vmin-expander*abs(vmin),vmax+expander*abs(vmax))
+	return(vmin,vmax)
 
 ####################################
 # General check for numeric values
@@ -288,18 +919,80 @@ def percent_finder(data,p):
 	min_value : float
 		Level for the contour.
 	"""
-	from numpy import cumsum,ravel,sort
-	from numpy import min as np_min
-	from numpy import sum as np_sum
+	return(percent_levels(data,[p])[0])
+
+def percent_levels(data,p,select=None):
+	"""Level finder for several percentage contours
 	
-	data_sorted=sort(ravel(data))[::-1]
-	data_fraction=cumsum(data_sorted)
-	data_fraction/=np_sum(data_sorted)
-	try:
-		min_value=np_min(data_sorted[data_fraction<p])
-	except ValueError:
-		min_value=np_min(data_sorted)
-	return(min_value)
+	Base-level function used by plots_2d.contourp() to define the levels which contain each of the
+	requested percentages of the data points, as given by percent_finder(). The data is sorted only
+	once, and all levels are found with a single search of the cumulative fraction. For large
+	grids, the levels can be found by selection instead: the values are counted into a fine grid,
+	and only the values in the grid cells that hold each level are sorted.
+	
+	Parameters
+	----------
+	data : ndarray
+		Describes the n-dimensional position of each data point.
+	p : array-like
+		Fractions of the data points to be encircled by each contour.
+	select : bool, optional
+		If True, the levels are found by selection instead of a full sort. If not given, selection
+		is used for data with more than 2**22 elements.
+	
+	Returns
+	-------
+	levels : ndarray
+		Level for each contour.
+	"""
+	from numpy import asarray, bincount, cumsum, intp, maximum, minimum, ravel, searchsorted, sort, where, zeros
+	
+	data=ravel(data)
+	p=asarray(p,dtype=float).ravel()
+	if select is None:
+		select=data.size>2**22
+	if not select:
+		data_sorted=sort(data)[::-1]
+		data_fraction=cumsum(data_sorted)
+		data_fraction/=data_fraction[-1]
+		# The elements with a fraction below p are the first ones, so the level is the last of them
+		n_below=searchsorted(data_fraction,p,side='left')
+		return(where(n_below>0,data_sorted[n_below-1],data_sorted[-1]))
+	
+	low,high=data.min(),data.max()
+	if low==high:
+		return(p*0+low)
+	nfine=min(data.size//16,2**20)
+	ind=data-low
+	ind*=nfine/(high-low)
+	ind=minimum(ind.astype(intp),nfine-1)
+	# Cells in decreasing order of value, with the mass of the cells above each one
+	counts=bincount(ind,minlength=nfine)[::-1]
+	mass=bincount(ind,weights=data,minlength=nfine)[::-1]
+	mass_above=cumsum(mass)-mass
+	targets=p*mass.sum()
+	cells=minimum(searchsorted(mass_above+mass,targets,side='left'),nfine-1)
+	filled=counts.nonzero()[0]
+	above=filled[maximum(searchsorted(filled,cells)-1,0)] # Closest non-empty cell above each one
+	needed=zeros(nfine,dtype=bool)
+	needed[cells]=True
+	needed[above]=True
+	# Sorted in decreasing order, the candidates of each needed cell are contiguous
+	cand=sort(data[needed[::-1][ind]])[::-1]
+	cand_counts=counts*needed
+	cand_start=cumsum(cand_counts)-cand_counts
+	levels=p*0
+	for i in range(len(p)):
+		cell=cells[i]
+		cell_cand=cand[cand_start[cell]:cand_start[cell]+counts[cell]]
+		n_below=searchsorted(mass_above[cell]+cumsum(cell_cand),targets[i],side='left')
+		if n_below>0: # The level is within the cell
+			levels[i]=cell_cand[n_below-1]
+		elif mass_above[cell]>0: # The level is the smallest value of the closest non-empty cell above
+			levels[i]=cand[cand_start[above[i]]+counts[above[i]]-1]
+		else:
+			levels[i]=low
+	return(levels)
 	
 ####################################
 # Simpler version for curve params
@@ -340,14 +1033,182 @@ def simpler_dict_splicer(plot_dict,Ld,Lx):
 		dict_list.append(temp_dict)
 	return(dict_list)
 
+####################################
+# Compiled expressions for curve
+####################################
+@lru_cache(maxsize=128)
+def sympify_expr(expr):
+	"""Cached sympy.sympify() of the string expressions given to plots_1d.curve()."""
+	from sympy import sympify
+	
+	return(sympify(expr))
+
+@lru_cache(maxsize=128)
+def lambdify_expr(expr,var,params):
+	"""Compiled numpy function of a sympy expression
+	
+	Base-level function used by plots_1d.curve() to compile an expression only once, taking as
+	arguments the independent variable and the symbols to be substituted, so that all the
+	substitution sets can be evaluated in a single broadcast call. The compiled functions are
+	cached, so that repeated calls with the same expression do not use sympy again.
+	
+	Parameters
+	----------
+	expr : sympy.Expr
+		The expression to be compiled.
+	var : str
+		The name of the independent variable.
+	params : tuple of str
+		The names of the symbols to be substituted, in the order they are given to the function.
+	
+	Returns
+	-------
+	func : function
+		The numpy function of (var, *params).
+	"""
+	from sympy import Symbol
+	from sympy.utilities.lambdify import lambdify
+	
+	symbs={str(sym):sym for sym in expr.free_symbols} # Keeps the assumptions of the symbols in expr
+	return(lambdify([symbs.get(name,Symbol(name)) for name in (var,)+params],expr,'numpy'))
+
+####################################
+# Adaptive sampling of curves
+####################################
+def refine_curve(func,x,y,tol=1e-3,max_num=10000,xlog=False,ylog=False):
+	"""Adaptive sampling of curves
+	
+	Base-level function used by plots_1d.curve() to refine the sampling of a set of curves where
+	they are not well described by straight segments. In each pass, the midpoint of every interval
+	still to be refined is evaluated, and the two halves of the interval are refined further if
+	the midpoint deviates from the segment joining the ends of the interval by more than tol (in
+	units of the width/height of the plotted region), or if the curve is finite at only one end.
+	
+	Parameters
+	----------
+	func : function
+		Evaluates the curves on an array of values of the independent variable, returning an
+		array of shape (L, len(x)) for the L curves.
+	x : ndarray
+		The initial (increasing) values of the independent variable.
+	y : ndarray
+		The values of the curves at x, of shape (L, len(x)).
+	tol : float, optional
+		The maximum deviation of the curves from the segments between samples, as a fraction of
+		the plotted region. Default: 1e-3.
+	max_num : int, optional
+		The maximum number of samples. Default: 10000.
+	xlog : bool, optional
+		If True, the deviations are measured with a logarithmic x-axis.
+	ylog : bool, optional
+		If True, the deviations are measured with a logarithmic y-axis.
+	
+	Returns
+	-------
+	x : ndarray
+		The refined values of the independent variable.
+	y : ndarray
+		The values of the curves at x, of shape (L, len(x)).
+	"""
+	from numpy import abs, any, errstate, hypot, insert, isfinite, log10, nanmax, nanmin, ones, zeros
+	
+	def scale(values,log):
+		with errstate(all='ignore'):
+			return(log10(values) if log else values)
+	
+	sx=scale(x,xlog)
+	sy=scale(y,ylog)
+	x_range=sx[-1]-sx[0]
+	with errstate(all='ignore'):
+		y_range=nanmax(sy[isfinite(sy)])-nanmin(sy[isfinite(sy)]) if isfinite(sy).any() else 0.0
+	if y_range==0 or x_range==0:
+		return(x,y)
+	refine=ones(len(x)-1,dtype=bool)
+	while len(x)<max_num:
+		cand=(refine & (sx[1:]-sx[:-1] > 1e-6*x_range)).nonzero()[0][:max_num-len(x)]
+		if len(cand)==0:
+			break
+		s_mid=(sx[cand]+sx[cand+1])/2
+		x_mid=10**s_mid if xlog else s_mid
+		y_mid=func(x_mid)
+		sy_mid=scale(y_mid,ylog)
+		# Distance of the midpoints to the segments, with both axes scaled to the plotted region
+		dx=(sx[cand+1]-sx[cand])/x_range
+		dy=(sy[:,cand+1]-sy[:,cand])/y_range
+		with errstate(all='ignore'):
+			dist=abs(dx*(sy_mid-sy[:,cand])/y_range-dy*(s_mid-sx[cand])/x_range)/hypot(dx,dy)
+			bad=any(dist>tol,axis=0) | any(isfinite(sy[:,cand])!=isfinite(sy[:,cand+1]),axis=0)
+		refine=zeros(len(x)-1,dtype=bool)
+		refine[cand]=bad
+		refine=insert(refine,cand+1,bad) # Both halves of an interval are refined
+		x=insert(x,cand+1,x_mid)
+		y=insert(y,cand+1,y_mid,axis=1)
+		sx=insert(sx,cand+1,s_mid)
+		sy=insert(sy,cand+1,sy_mid,axis=1)
+	return(x,y)
+
+####################################
+# Line density of an ensemble of curves
+####################################
+def curve_density(y,bins=100,lims=None,ylog=False):
+	"""Line density of an ensemble of curves
+	
+	Base-level function used by plots_1d.curve() to rasterise a large ensemble of curves, evaluated
+	on the same values of the independent variable, into a single 2D histogram. In each interval
+	between consecutive values, each curve contributes equally to all the bins spanned by its
+	segment, so that steep segments leave no gaps.
+	
+	Parameters
+	----------
+	y : ndarray
+		The values of the L curves, of shape (L, num).
+	bins : int, optional
+		The number of bins along the y-axis. Default: 100.
+	lims : tuple-like, optional
+		The (min, max) limits of the bins along the y-axis. If not given, the range of the finite
+		values of the curves is used.
+	ylog : bool, optional
+		If True, the bins are constructed in logarithmic space.
+	
+	Returns
+	-------
+	y_edges : ndarray
+		The bin edges along the y-axis, in data space.
+	Z : ndarray
+		The fraction of the curves in each bin, of shape (num-1, bins).
+	"""
+	from numpy import arange, array, bincount, broadcast_to, clip, cumsum, errstate, floor, fmax, fmin, isfinite, log10
+	
+	L,num=y.shape
+	with errstate(all='ignore'):
+		sy=log10(y) if ylog else y
+	finite=isfinite(sy)
+	if lims is None:
+		if not finite.any():
+			raise ValueError("The curves have no finite values.")
+		lims=(sy[finite].min(),sy[finite].max())
+		lims=(10**lims[0],10**lims[1]) if ylog else lims
+	_,edges,y_edges=bin_axis(array(lims,dtype=float),'number',bins,log=ylog)
+	low=fmin(sy[:,:-1],sy[:,1:])
+	high=fmax(sy[:,:-1],sy[:,1:])
+	valid=finite[:,:-1] & finite[:,1:] & (high>=edges[0]) & (low<=edges[-1])
+	scale=bins/(edges[-1]-edges[0])
+	low=clip(floor((low[valid]-edges[0])*scale),0,bins-1).astype(int)
+	high=clip(floor((high[valid]-edges[0])*scale),0,bins-1).astype(int)
+	column=broadcast_to(arange(num-1)*(bins+1),(L,num-1))[valid]
+	weight=1.0/(high-low+1)
+	# Each segment adds its weight from its lowest to its highest bin, as a cumulative sum of differences
+	diff=bincount(column+low,weights=weight,minlength=(num-1)*(bins+1))-bincount(column+high+1,weights=weight,minlength=(num-1)*(bins+1))
+	return(y_edges,cumsum(diff.reshape(num-1,bins+1),axis=1)[:,:-1]/L)
+
 ####################################
 # Set labels, limits and more
 ####################################
-def plot_finalizer(xlog,ylog,xlim,ylim,title,xlabel,ylabel,xinvert,yinvert,grid_control):
-	"""New axis handler
+def plot_finalizer(xlog,ylog,xlim,ylim,title,xlabel,ylabel,xinvert,yinvert,grid_control,ax=None):
+	"""Plot finalizer
 	
-	This function is a base-level function used by most other plotting functions to set the current
-	Axes instance to ax and returns the old Axes instance to be later reverted.
+	This function is a base-level function used by most other plotting functions to set the scales,
+	limits, labels, orientation and grid of the Axes instance of the plot.
 	
 	Parameters
 	----------
@@ -373,49 +1234,52 @@ def plot_finalizer(xlog,ylog,xlim,ylim,title,xlabel,ylabel,xinvert,yinvert,grid_
 		If True, ensures the y-axis is inverted. If False, ensures the y-axis is not inverted.
 	grid_control : None or bool
 		If True, ensures the grid is turned on. If False, ensures the grid is turned off.
+	ax : Axes object, optional
+		The Axes instance to be finalised, defaults to the current axes. Only the given Axes instance
+		is modified, without using the pyplot state.
 	
 	Returns
 	-------
 	None
 	"""
-	from .defaults import Params
 	from matplotlib import rcParams
-	from matplotlib.pyplot import gca,grid,xscale,yscale
-	from matplotlib.pyplot import title as plt_title, xlabel as plt_xlabel, xlim as plt_xlim, ylabel as plt_ylabel, ylim as plt_ylim
 	
+	if ax is None:
+		from matplotlib.pyplot import gca
+		ax=gca()
 	if xlog:
-		xscale('log')
+		ax.set_xscale('log')
 	if ylog:
-		yscale('log')
+		ax.set_yscale('log')
 	if xlim is not None:
-		plt_xlim(xlim)
+		ax.set_xlim(xlim)
 	else:
-		plt_xlim(auto=True)
+		ax.set_xlim(auto=True)
 	if ylim is not None:
-		plt_ylim(ylim)
+		ax.set_ylim(ylim)
 	else:
-		plt_ylim(auto=True)
+		ax.set_ylim(auto=True)
 	if title is not None:
-		plt_title(title)
+		ax.set_title(title)
 	if xlabel is not None:
-		plt_xlabel(xlabel)
+		ax.set_xlabel(xlabel)
 	if ylabel is not None:
-		plt_ylabel(ylabel)
+		ax.set_ylabel(ylabel)
 	if xinvert:
-		if not gca().xaxis_inverted():
-			gca().invert_xaxis()
+		if not ax.xaxis_inverted():
+			ax.invert_xaxis()
 	if yinvert:
-		if not gca().yaxis_inverted():
-			gca().invert_yaxis()
-	if grid_control is not None:
-		grid(b=grid_control,which=rcParams['axes.grid.which'],axis=rcParams['axes.grid.axis'])
+		if not ax.yaxis_inverted():
+			ax.invert_yaxis()
+	if grid_control is not None: # Given as the first argument, called b or visible depending on the matplotlib version
+		ax.grid(grid_control,which=rcParams['axes.grid.which'],axis=rcParams['axes.grid.axis'])
 	else:
-		grid(b=rcParams['axes.grid'],which=rcParams['axes.grid.which'],axis=rcParams['axes.grid.axis'])
+		ax.grid(rcParams['axes.grid'],which=rcParams['axes.grid.which'],axis=rcParams['axes.grid.axis'])
 
 ####################################
 # Modified fill_between for hist
 ####################################
-def step_filler(x,y,**kwargs):
+def step_filler(x,y,ax=None,**kwargs):
 	"""Wrapper for a specific fill_between plot.
 	
 	Parameters
@@ -424,6 +1288,8 @@ def step_filler(x,y,**kwargs):
 		The x-axis values.
 	y : array-like
 		The y-axis values.
+	ax : pyplot.Axes, optional
+		The axes on which to draw. Defaults to the current axes.
 	Other arguments : **kwargs
 		Optional kwargs supported by fill_between. Note that it will conflict if 'step' is given.
 	Returns
@@ -432,12 +1298,15 @@ def step_filler(x,y,**kwargs):
 	"""
 	
 	from numpy import empty
-	from matplotlib.pyplot import fill_between
+	from matplotlib.pyplot import gca
+	
+	if ax is None:
+		ax=gca()
 	
 	temp_y=empty(len(y)+1)
 	temp_y[1:]=y
 	temp_y[0]=y[0]
-	fill_between(x,temp_y,step='pre',**kwargs)
+	ax.fill_between(x,temp_y,step='pre',**kwargs)
 	
 	return(None)
 
@@ -0,0 +1,278 @@
+########################################################################
+############## Rendering of many figures in parallel ###################
+########################################################################
+
+####################################
+# Batch renderer
+####################################
+class BatchRenderer:
+	"""Renderer of batches of figures in a pool of processes
+	
+	Draws each figure of a batch with one of the splotch plotting functions on its own Agg figure
+	and saves it to a file, in a pool of worker processes that is kept alive between batches, so
+	that matplotlib and splotch are only imported once per worker. Large arrays are not pickled
+	to the workers: numpy.memmap arrays are passed as the path to their file, and any other array
+	of at least min_shared bytes is copied once to shared memory, from which all the figures that
+	use it read it.
+	
+	Parameters
+	----------
+	n_jobs : int, optional
+		The number of worker processes. If None or 1, the figures are rendered in this process,
+		and if -1, one process per CPU is used. Default: -1.
+	min_shared : int, optional
+		The size in bytes from which arrays are passed through shared memory. Default: 1048576.
+	save_kw : dict, optional
+		Dictionary of keyword arguments to be parsed to Figure.savefig for all figures, which are
+		updated with the save_kw of each figure specification.
+	
+	Examples
+	--------
+	>>> specs=[{'func':'hist','args':(x,),'path':'hist.png'},
+	...        {'func':'hist2D','args':(x,y),'kwargs':{'clabel':'N'},'path':'hist2D.png'},
+	...        {'func':'cornerplot','args':(data,),'fig_kw':{'figsize':(8,8)},'path':'corner.pdf'}]
+	>>> with BatchRenderer(n_jobs=8,save_kw={'dpi':150}) as renderer:
+	...     errors=renderer.render(specs)
+	"""
+	
+	def __init__(self,n_jobs=-1,min_shared=2**20,save_kw={}):
+		from os import cpu_count
+	
+		if n_jobs is not None and n_jobs<0:
+			n_jobs=cpu_count()
+		self.n_jobs=n_jobs
+		self.min_shared=min_shared
+		self.save_kw=save_kw
+		self._pool=None
+		self._batch=0
+	
+	def __enter__(self):
+		return(self)
+	
+	def __exit__(self,*exc):
+		self.close()
+	
+	def close(self):
+		"""Shuts down the worker processes."""
+		if self._pool is not None:
+			self._pool.shutdown()
+			self._pool=None
+	
+	def render(self,specs):
+		"""Renders and saves a batch of figures.
+	
+		Parameters
+		----------
+		specs : list of dict
+			The specification of each figure, with keys:
+			func : str or function
+				The name of the splotch plotting function (e.g. 'hist', 'hist2D', 'contourp' or
+				'cornerplot'), or any module-level function that draws on the Axes given as ax
+				or the Figure given as fig.
+			path : str
+				The path of the output file, as given to Figure.savefig.
+			args : tuple, optional
+				The positional arguments of func.
+			kwargs : dict, optional
+				The keyword arguments of func.
+			fig_kw : dict, optional
+				Dictionary of keyword arguments to be parsed to the creation of the Figure.
+			save_kw : dict, optional
+				Dictionary of keyword arguments to be parsed to Figure.savefig.
+	
+		Returns
+		-------
+		errors : list
+			For each figure, None if it was saved, or the traceback of the exception raised while
+			drawing or saving it. A failed figure does not stop the rest of the batch.
+		"""
+	
+		tasks=[]
+		for i,spec in enumerate(specs):
+			if 'func' not in spec or 'path' not in spec:
+				raise ValueError(f"Figure specification {i} must give both 'func' and 'path'.")
+			func=spec['func']
+			if isinstance(func,str):
+				from . import __all__ as names
+				if func not in names:
+					raise ValueError(f"'{func}' is not a splotch function.")
+			elif not callable(func):
+				raise TypeError(f"'func' must be the name of a splotch function or a function, not {type(func)}.")
+			tasks.append((i,func,spec.get('args',()),spec.get('kwargs',{}),spec['path'],spec.get('fig_kw',{}),
+						  {**self.save_kw,**spec.get('save_kw',{})}))
+	
+		if self.n_jobs is None or self.n_jobs==1:
+			return([_render_figure(task) for task in tasks])
+	
+		from concurrent.futures import ProcessPoolExecutor
+		from concurrent.futures.process import BrokenProcessPool
+	
+		if self._pool is None:
+			self._pool=ProcessPoolExecutor(max_workers=self.n_jobs,initializer=_warm_worker)
+		self._batch+=1
+		blocks={}
+		try:
+			futures=[self._pool.submit(_render_shared,(self._batch,_share(task,blocks,self.min_shared))) for task in tasks]
+			errors=[]
+			for future in futures:
+				try:
+					errors.append(future.result())
+				except BrokenProcessPool as err: # A worker died, e.g. from running out of memory
+					errors.append(f"The worker process rendering this figure terminated abruptly: {err}")
+					self._pool=None
+				except Exception as err: # Arguments that cannot be pickled
+					errors.append(f"{type(err).__name__}: {err}")
+		finally:
+			for block,_ in blocks.values():
+				block.close()
+				block.unlink()
+		return(errors)
+
+def render(specs,n_jobs=-1,min_shared=2**20,save_kw={}):
+	"""Batch figure rendering
+	
+	Renders and saves a batch of figures in a pool of processes, which is shut down afterwards.
+	Use a BatchRenderer directly to keep the worker processes for several batches.
+	
+	Parameters
+	----------
+	specs : list of dict
+		The specification of each figure, as described in BatchRenderer.render().
+	n_jobs : int, optional
+		The number of worker processes. If None or 1, the figures are rendered in this process,
+		and if -1, one process per CPU is used. Default: -1.
+	min_shared : int, optional
+		The size in bytes from which arrays are passed through shared memory. Default: 1048576.
+	save_kw : dict, optional
+		Dictionary of keyword arguments to be parsed to Figure.savefig for all figures.
+	
+	Returns
+	-------
+	errors : list
+		For each figure, None if it was saved, or the traceback of the exception raised while
+		drawing or saving it.
+	"""
+	
+	with BatchRenderer(n_jobs=n_jobs,min_shared=min_shared,save_kw=save_kw) as renderer:
+		return(renderer.render(specs))
+
+####################################
+# Arrays passed by reference
+####################################
+def _share(obj,blocks,min_shared):
+	"""Replaces the large arrays in obj by references to a file or to shared memory.
+	
+	Each array is copied to a new block of shared memory only once, which is kept in blocks by the
+	id of the array, so that the figures of a batch that use the same array all read one copy.
+	"""
+	from mmap import mmap
+	from multiprocessing import shared_memory
+	from numpy import memmap, ndarray
+	
+	if isinstance(obj,(list,tuple)):
+		return(type(obj)(_share(o,blocks,min_shared) for o in obj))
+	if isinstance(obj,dict):
+		return({k:_share(v,blocks,min_shared) for k,v in obj.items()})
+	if not isinstance(obj,ndarray) or obj.dtype.hasobject:
+		return(obj)
+	if isinstance(obj,memmap) and isinstance(obj.base,mmap) and obj.filename is not None: # Not a view of a memmap
+		order='F' if obj.flags.f_contiguous and not obj.flags.c_contiguous else 'C'
+		return(_ArrayRef('file',obj.filename,obj.shape,obj.dtype.str,(obj.offset,order)))
+	if obj.nbytes<min_shared:
+		return(obj)
+	if id(obj) not in blocks:
+		block=shared_memory.SharedMemory(create=True,size=max([1,obj.nbytes]))
+		ndarray(obj.shape,dtype=obj.dtype,buffer=block.buf)[...]=obj
+		blocks[id(obj)]=(block,obj) # The array is kept so that its id is not reused during the batch
+	return(_ArrayRef('shared',blocks[id(obj)][0].name,obj.shape,obj.dtype.str,None))
+
+class _ArrayRef:
+	"""Reference to an array in a file or in shared memory, which is opened by the workers."""
+	
+	def __init__(self,kind,name,shape,dtype,extra):
+		self.kind,self.name,self.shape,self.dtype,self.extra=kind,name,shape,dtype,extra
+
+_attached={}
+_attached_batch=None
+
+def _resolve(obj):
+	"""Replaces the references in obj by the arrays, attaching to each block once per batch."""
+	from numpy import memmap, ndarray
+	
+	if isinstance(obj,(list,tuple)):
+		return(type(obj)(_resolve(o) for o in obj))
+	if isinstance(obj,dict):
+		return({k:_resolve(v) for k,v in obj.items()})
+	if not isinstance(obj,_ArrayRef):
+		return(obj)
+	if obj.kind=='file':
+		offset,order=obj.extra
+		return(memmap(obj.name,dtype=obj.dtype,mode='r',offset=offset,shape=obj.shape,order=order))
+	if obj.name not in _attached:
+		from multiprocessing import shared_memory
+		try: # The block is removed by BatchRenderer.render(), not when the process exits
+			_attached[obj.name]=shared_memory.SharedMemory(name=obj.name,track=False)
+		except TypeError: # Python < 3.13, where the block is registered under the same name as in render()
+			_attached[obj.name]=shared_memory.SharedMemory(name=obj.name)
+	array=ndarray(obj.shape,dtype=obj.dtype,buffer=_attached[obj.name].buf)
+	array.flags.writeable=False # Shared by all the figures of the batch
+	return(array)
+
+def _release(batch):
+	"""Detaches the worker from the blocks of earlier batches."""
+	from gc import collect
+	global _attached_batch
+	
+	if batch!=_attached_batch:
+		collect() # Frees the arrays of the previous figures, which still point to the blocks
+		for name in list(_attached):
+			try:
+				_attached.pop(name).close()
+			except BufferError: # Still in use, so left to be unmapped on exit
+				pass
+		_attached_batch=batch
+
+####################################
+# Workers
+####################################
+def _warm_worker():
+	"""Initialiser of the worker processes, which imports everything needed to draw the figures."""
+	from importlib import import_module
+	
+	for module in ['matplotlib.backends.backend_agg','.axis_func','.plots_1d','.plots_2d']:
+		import_module(module,__package__)
+
+def _render_shared(task):
+	batch,task=task
+	_release(batch)
+	try:
+		task=_resolve(task)
+	except Exception:
+		from traceback import format_exc
+		return(format_exc())
+	return(_render_figure(task))
+
+def _render_figure(task):
+	"""Draws and saves one figure, returning None or the traceback of the error raised."""
+	from inspect import signature
+	from traceback import format_exc
+	from matplotlib.backends.backend_agg import FigureCanvasAgg
+	from matplotlib.figure import Figure
+	
+	_,func,args,kwargs,path,fig_kw,save_kw=task
+	try:
+		if isinstance(func,str):
+			from importlib import import_module
+			func=getattr(import_module(__package__),func)
+		fig=Figure(**fig_kw)
+		FigureCanvasAgg(fig) # Drawn without pyplot, so that no figure is kept open
+		params=signature(func).parameters
+		if 'ax' in params and 'ax' not in kwargs:
+			kwargs={**kwargs,'ax':fig.add_subplot()}
+		elif 'fig' in params and 'fig' not in kwargs:
+			kwargs={**kwargs,'fig':fig}
+		func(*args,**kwargs)
+		fig.savefig(path,**save_kw)
+	except Exception:
+		return(format_exc())
+	return(None)
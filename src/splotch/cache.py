@@ -0,0 +1,148 @@
+########################################################################
+############## On-disk cache of computed plot products #################
+########################################################################
+
+# Part of every hash, to be increased whenever the stored results of any computation change, so
+# that results written by an older version of splotch are not loaded
+_CACHE_VERSION=1
+
+####################################
+# Cached computation
+####################################
+def cached(name,key,compute):
+	"""Cached computation
+	
+	Returns the arrays computed by compute(), which are stored in a .npz file named after the hash
+	of the inputs of the computation in key, so that they are loaded instead of computed again when
+	a figure is redrawn from the same data with the same numerical parameters (e.g. when only the
+	labels or the colours change). The cache is only used if Params.cache_dir is set, and the least
+	recently used files are deleted when the directory grows over Params.cache_size bytes.
+	
+	Parameters
+	----------
+	name : str
+		The name of the computation, which is part of the hash and of the file name.
+	key : array-like, number, str, None, or list, tuple or dict of them
+		Everything on which the result depends, i.e. the input arrays (including the mask of
+		masked arrays) and the numerical parameters. Functions (e.g. statistics) are identified by their qualified name, so if any
+		part of key is an anonymous function or any other object, the result is not cached.
+	compute : function
+		Function without arguments that returns the result, as a tuple of arrays.
+	
+	Returns
+	-------
+	result : tuple of ndarray
+		The result of compute(), either computed or loaded from the cache.
+	"""
+	from .defaults import Params
+	
+	if Params.cache_dir is None:
+		return(compute())
+	
+	from hashlib import blake2b
+	from os import makedirs, replace, utime
+	from os.path import join
+	from tempfile import NamedTemporaryFile
+	from numpy import asarray, load, savez
+	
+	digest=blake2b(digest_size=20)
+	try:
+		_update_hash(digest,(_CACHE_VERSION,name,key))
+	except TypeError: # Inputs that cannot be hashed by their content
+		return(compute())
+	path=join(Params.cache_dir,f"{name}-{digest.hexdigest()}.npz")
+	try:
+		with load(path,allow_pickle=False) as stored:
+			result=tuple(stored[f"arr_{i}"] for i in range(len(stored.files)))
+		utime(path) # Marks the file as recently used
+		return(result)
+	except (OSError,ValueError,KeyError): # Not cached yet, or removed or partially written by another process
+		pass
+	
+	result=tuple(compute())
+	if any([asarray(r).dtype.hasobject for r in result]): # Results that cannot be stored without pickling
+		return(result)
+	temp=None
+	try:
+		makedirs(Params.cache_dir,exist_ok=True)
+		with NamedTemporaryFile(dir=Params.cache_dir,suffix='.tmp',delete=False) as temp:
+			savez(temp,*result)
+		replace(temp.name,path) # Written to a temporary file first, so that other processes never read a partial file
+	except OSError: # e.g. a full disk or a read-only directory, in which case the result is just not stored
+		if temp is not None:
+			_remove(temp.name)
+		return(result)
+	_evict(Params.cache_dir,Params.cache_size)
+	return(result)
+
+def clear_cache():
+	"""Deletes all the files in the cache directory given by Params.cache_dir."""
+	from .defaults import Params
+	
+	if Params.cache_dir is not None:
+		_evict(Params.cache_dir,0)
+
+####################################
+# Hashing of the computation inputs
+####################################
+def _update_hash(digest,obj):
+	"""Adds obj to the hash, tagged by type so that e.g. 1, 1.0, '1' and [1] hash differently."""
+	from numbers import Number
+	from numpy import asarray, ascontiguousarray, ndarray
+	from numpy.ma import MaskedArray, getmaskarray
+	
+	if obj is None or isinstance(obj,(bool,Number,str)):
+		digest.update(f"{type(obj).__name__}:{obj!r};".encode())
+	elif isinstance(obj,(list,tuple)):
+		digest.update(f"{type(obj).__name__}[{len(obj)}]".encode())
+		for item in obj:
+			_update_hash(digest,item)
+	elif isinstance(obj,dict):
+		digest.update(f"dict[{len(obj)}]".encode())
+		for k in sorted(obj,key=repr):
+			_update_hash(digest,k)
+			_update_hash(digest,obj[k])
+	elif isinstance(obj,MaskedArray): # The mask changes the result, so it is hashed with the data
+		digest.update(b"masked;")
+		_update_hash(digest,obj.data)
+		_update_hash(digest,getmaskarray(obj))
+	elif isinstance(obj,ndarray) or hasattr(obj,'__array__'):
+		obj=asarray(obj)
+		if obj.dtype.hasobject:
+			raise TypeError("Object arrays cannot be hashed by their content.")
+		digest.update(f"array{obj.shape}{obj.dtype.str};".encode())
+		digest.update(ascontiguousarray(obj).data)
+	elif callable(obj) and '<' not in getattr(obj,'__qualname__','<'): # Named functions, not lambdas or closures
+		digest.update(f"function:{obj.__module__}.{obj.__qualname__};".encode())
+	else:
+		raise TypeError(f"Objects of type {type(obj)} cannot be hashed by their content.")
+
+####################################
+# Size bound of the cache directory
+####################################
+def _evict(directory,size):
+	"""Deletes the least recently used files of the cache until it takes at most size bytes."""
+	from os import scandir
+	
+	files=[]
+	for entry in scandir(directory):
+		if entry.name.endswith('.npz'):
+			try:
+				stat=entry.stat()
+			except OSError: # Deleted by another process
+				continue
+			files.append((stat.st_mtime,stat.st_size,entry.path))
+	total=sum([f[1] for f in files])
+	for _,nbytes,path in sorted(files):
+		if total<=size:
+			break
+		_remove(path)
+		total-=nbytes
+
+def _remove(path):
+	from os import remove
+	
+	try:
+		remove(path)
+	except OSError:
+		pass
@@ -0,0 +1,386 @@
+########################################################################
+############ Numerical products of the plots, without drawing ##########
+########################################################################
+
+# These functions only use numpy (and scipy for the kernel density estimates), and never import
+# matplotlib, so that the binning and statistics of a figure can be computed on a different
+# machine than the one that draws it. The plotting functions of the same name draw their results.
+
+####################################
+# 1D histogram
+####################################
+def hist(data,bin_type=None,bins=None,dens=True,cumul=False,scale=None,weights=None,v=None,vstat=None,nmin=0,
+			xlog=False,ylog=False,plot_centre=False):
+	"""1D histogram values
+	
+	Computes the histogram (or binned statistic) of a single data set, as drawn by plots_1d.hist().
+	
+	Parameters
+	----------
+	data : array-like or HistStream1D
+		The data to bin. A HistStream1D gives the histogram accumulated from streamed data, in
+		which case bin_type, bins, weights and v are ignored.
+	bin_type : {'number','width','edges','equal'}, optional
+		Defines how is understood the value given in bins: 'number' for the desired number of bins,
+		'width' for the width of the bins, 'edges' for the edges of bins, and 'equal' for making
+		bins with equal number of elements (or as close as possible). If not given it is inferred
+		from the data type of bins: 'number' if int, 'width' if float and 'edges' if ndarray.
+	bins : int, float or array-like, optional
+		Gives the values for the bins, according to bin_type. Defaults to len(data)**0.4 bins.
+	dens : bool, optional
+		If false the histogram returns raw counts.
+	cumul : bool, optional
+		If true, produces a cumulative distribution instead of a histogram.
+	scale : float, optional
+		Scaling to be applied to the counts.
+	weights : array-like, optional
+		An array of weights with the same shape as data.
+	v : array-like, optional
+		If a valid argument is given in vstat, defines the value used for the binned statistics.
+	vstat : str, int, float or function, optional
+		The statistic computed from v in each bin, as accepted by base_func.binned_stats().
+	nmin : int, optional
+		The minimum number of points required in a bin, otherwise its value is NaN. Default: 0.
+	xlog : bool, optional
+		If True, the bins are constructed in logarithmic space.
+	ylog : bool, optional
+		If True, empty bins are given a value of NaN instead of 0.
+	plot_centre : bool, optional
+		If True, plot_edges contains the centres of the bins instead of their edges.
+	
+	Returns
+	-------
+	edges : ndarray
+		The bin edges, in binning (i.e., logarithmic if xlog) space.
+	plot_edges : ndarray
+		The bin edges (or centres, if plot_centre) in data space.
+	values : ndarray
+		The value of each bin.
+	counts : ndarray
+		The number of data points in each bin.
+	"""
+	from numpy import asarray, bincount, cumsum, diff, nan, nanmax, where
+	from .base_func import bin_axis, bin_index, binned_stats
+	from .streaming import HistStream1D
+	
+	if isinstance(data,HistStream1D): # Histogram accumulated from streamed data
+		if vstat is not None:
+			raise ValueError("Binned statistics (vstat) cannot be drawn from a HistStream1D.")
+		edges,plot_edges,values,counts=data.histogram(dens=dens,plot_centre=plot_centre)
+	else:
+		if bins is None:
+			bins=int((len(data))**0.4)
+		temp_data,edges,plot_edges=bin_axis(data,bin_type,bins,log=xlog,plot_centre=plot_centre)
+		index=bin_index(asarray(temp_data).ravel(),edges)+1 # Points outside the bins go to bin 0
+		counts=bincount(index,minlength=len(edges))[1:]
+		if vstat is not None:
+			values=binned_stats(index-1,len(edges)-1,[(v,vstat)])[0]
+		else:
+			values=counts if weights is None else bincount(index,weights=asarray(weights).ravel(),minlength=len(edges))[1:]
+			if dens:
+				values=values/diff(edges)/values.sum()
+	if cumul:
+		values=cumsum(values)
+		if dens:
+			values=values.astype('float')/nanmax(values)
+	if scale:
+		if dens:
+			values=values*(len(data)/scale)
+		else:
+			values=values.astype('float')/scale
+	if ylog:
+		values=where(values==0,nan,values)
+	values=where(counts>=nmin,values,nan)
+	return(edges,plot_edges,values,counts)
+
+####################################
+# 2D histogram and binned statistics
+####################################
+def hist2D(x,y=None,c=None,bin_type=None,bins=None,dens=True,scale=None,cstat=None,nmin=0,xlog=False,ylog=False):
+	"""2D histogram values
+	
+	Computes the 2D histogram (or binned statistic) drawn by plots_2d.hist2D(). The result is
+	stored in the cache of computed products if Params.cache_dir is set (see cache.cached).
+	
+	Parameters
+	----------
+	x : array-like or HistStream2D
+		Position of data points in the x axis. A HistStream2D gives the histogram accumulated from
+		streamed data, in which case y, bin_type, bins and c are not needed.
+	y : array-like
+		Position of data points in the y axis.
+	c : array-like, optional
+		If a valid argument is given in cstat, defines the value used for the binned statistics.
+	bin_type : {'number','width','edges','equal'} or list, optional
+		Defines how is understood the value given in bins, as for hist(), for both axes or for
+		each of them.
+	bins : int, float, array-like or list, optional
+		Gives the values for the bins, according to bin_type. Defaults to max(10, len(x)**0.4)
+		bins in each axis.
+	dens : bool, optional
+		If false the histogram returns raw counts.
+	scale : float, optional
+		Normalization of the densities. If not given, the number of data points is used.
+	cstat : str, int, float or function, optional
+		The statistic computed from c in each bin, as accepted by base_func.binned_stats().
+		Defaults to 'mean' if c is given.
+	nmin : int, optional
+		The minimum number of points required in a bin, otherwise its value is NaN. Default: 0.
+	xlog, ylog : bool, optional
+		If True, the bins of that axis are constructed in logarithmic space.
+	
+	Returns
+	-------
+	X, Y : ndarray
+		The bin edges of each axis, in data space.
+	Z : ndarray
+		The value of each bin, of shape (len(X)-1, len(Y)-1).
+	counts : ndarray
+		The number of data points in each bin.
+	"""
+	from numpy import nan, size
+	from .base_func import basehist2D
+	from .cache import cached
+	from .streaming import HistStream2D
+	
+	if isinstance(x,HistStream2D): # Histogram accumulated from streamed data
+		if cstat is not None:
+			raise ValueError("Binned statistics (cstat) cannot be drawn from a HistStream2D.")
+		X,Y,Z,counts=x.histogram(dens=dens,norm=scale)
+	else:
+		if type(bin_type) is not list:
+			bin_type=[bin_type]*2
+		if type(bins) not in [list,tuple]:
+			if bins is None:
+				bins=max([10,int(len(x)**0.4)]) # Defaults to min of 10 bins
+			bins=[bins]*2
+		if size([x,y])==0 and cstat is not None: # Zero-sized arrays given
+			raise ValueError(f"Cannot compute statistic (cstat='{cstat}') on zero-size array, set cstat=None if no data given.")
+		X,Y,Z,counts=cached('hist2D',(x,y,c,bin_type,bins,scale,dens,cstat,xlog,ylog),
+							lambda: basehist2D(x,y,c,bin_type,bins,scale,dens,cstat,xlog,ylog))
+	
+	# Cut bins which do not meet the number count threshold
+	Z[counts<nmin]=nan
+	return(X,Y,Z,counts)
+
+####################################
+# Contours from density histograms
+####################################
+def contourp(x,y=None,percent=None,bin_type=None,bins=None,density='hist',bw_method=None,xlog=False,ylog=False):
+	"""Density grid and contour levels
+	
+	Computes the density estimate and the levels of the contours drawn by plots_2d.contourp(),
+	which encircle the highest density regions that contain the given percentages of the sample.
+	The result is stored in the cache of computed products if Params.cache_dir is set (see
+	cache.cached).
+	
+	Parameters
+	----------
+	x : array-like or HistStream2D
+		Position of data points in the x axis. A HistStream2D gives the histogram accumulated from
+		streamed (or already binned) data, in which case y, bin_type and bins are ignored.
+	y : array-like
+		Position of data points in the y axis.
+	percent : float or array-like, optional
+		The percentages of the sample that the contours encircle. Defaults to Params.contp_percent.
+	bin_type : {'number','width','edges','equal'} or list, optional
+		Defines how is understood the value given in bins, as for hist2D().
+	bins : int, float, array-like or list, optional
+		Gives the values for the bins, according to bin_type. If density='kde', gives the number
+		of grid points for each axis instead (default: 128).
+	density : {'hist','kde'}, optional
+		How the density of the data is estimated: 'hist' uses a 2D histogram, while 'kde' uses a
+		Gaussian kernel density estimate computed on a grid (see base_func.binned_kde).
+	bw_method : {'scott','silverman'} or float, optional
+		The bandwidth factor of the kernel density estimate, as for scipy.stats.gaussian_kde.
+	xlog, ylog : bool, optional
+		If True, the density of that axis is estimated in logarithmic space.
+	
+	Returns
+	-------
+	X, Y : ndarray
+		The bin centres (or grid points, if density='kde') of each axis, in data space.
+	Z : ndarray
+		The values of the histogram (or density estimate), of shape (len(X), len(Y)).
+	levels : ndarray
+		The level of the contour of each percentage, in the same order as percent.
+	"""
+	from numpy import array, ndarray
+	from .base_func import basehist2D, binned_kde, percent_levels
+	from .cache import cached
+	from .streaming import HistStream2D
+	
+	if percent is None:
+		from .defaults import Params
+		percent=Params.contp_percent
+	percent=array([percent]).flatten()
+	if density not in ['hist','kde']:
+		raise ValueError(f"Density type '{density}' not recognised. Must be one of {{'hist'|'kde'}}.")
+	
+	if isinstance(x,HistStream2D): # Histogram accumulated from streamed data
+		if density=='kde':
+			raise ValueError("density='kde' cannot be used with a HistStream2D.")
+		X,Y,Z,_=x.histogram(dens=False)
+		X=(X[:-1]+X[1:])/2
+		Y=(Y[:-1]+Y[1:])/2
+		return(X,Y,Z,array(percent_levels(Z,percent/100)))
+	
+	if type(bin_type) not in [list, tuple, ndarray]:
+		bin_type=[bin_type]*2
+	if type(bins) not in [list,tuple] and density=='hist':
+		if bins is None:
+			bins=max([10,int(len(x)**0.4)]) # Defaults to min of 10 bins
+		bins=[bins]*2
+	
+	def density_levels():
+		if density=='kde':
+			X,Y,Z=binned_kde(x,y,gridsize=bins,bw_method=bw_method,xlog=xlog,ylog=ylog)
+		else:
+			X,Y,Z,_=basehist2D(x,y,None,bin_type,bins,None,None,None,xlog,ylog)
+			X=(X[:-1]+X[1:])/2
+			Y=(Y[:-1]+Y[1:])/2
+		return(X,Y,Z,array(percent_levels(Z,percent/100)))
+	
+	return(cached('contourp',(x,y,density,bin_type,bins,bw_method,xlog,ylog,percent),density_levels))
+
+####################################
+# Statistics bands
+####################################
+def statband(x,y,bin_type=None,bins=None,stat_mid='mean',stat_low='std',stat_high='std',from_mid=None,xlog=False):
+	"""Binned statistics of a band
+	
+	Computes the central line and the limits of the band drawn by plots_2d.statband(). The result
+	is stored in the cache of computed products if Params.cache_dir is set (see cache.cached).
+	
+	Parameters
+	----------
+	x : array-like
+		Position of data points in the x axis.
+	y : array-like
+		Position of data points in the y axis.
+	bin_type : {'number','width','edges','equal'}, optional
+		Defines how is understood the value given in bins, as for hist().
+	bins : int, float or array-like, optional
+		Gives the values for the bins, according to bin_type. Defaults to len(x)**0.4 bins.
+	stat_mid : str, int, float or function, optional
+		The statistic of the central line, computed for both x and y in each bin, as accepted by
+		base_func.binned_stats(). Default: 'mean'.
+	stat_low, stat_high : str, int, float or function, optional
+		The statistics of the lower and upper limits of the band: a percentile, a function, or a
+		string '[n]std' for n standard deviations. Default: 'std'.
+	from_mid : bool, optional
+		If True, the band limits are taken as the distance from the central line. Defaults to True
+		if both stat_low and stat_high are standard deviations, and False otherwise.
+	xlog : bool, optional
+		If True, the bins are constructed in logarithmic space.
+	
+	Returns
+	-------
+	edges : ndarray
+		The bin edges, in data space.
+	x_mid : ndarray
+		The central x value of each bin, given by stat_mid.
+	y_mid : ndarray
+		The central y value of each bin, given by stat_mid.
+	low, high : ndarray
+		The lower and upper limits of the band in each bin.
+	"""
+	from numbers import Number
+	from numpy import nanstd, ones, std
+	from .base_func import bin_axis, bin_index, binned_stats
+	from .cache import cached
+	
+	if bins is None:
+		bins=int((len(x))**0.4)
+	
+	# Check stat_low/stat_high arguments
+	band_stat=[None,None]
+	band_multi=ones(2)
+	for i, stat in enumerate([stat_low,stat_high]): # loop over low/high statistic
+		if isinstance(stat,Number): # stat given as a percentile number
+			band_stat[i] = stat
+		elif callable(stat): # stat given as a function
+			band_stat[i] = stat
+		elif isinstance(stat,str) and 'std' in stat: # stat given as a string with 'std'
+			band_stat[i] = 'std'
+			multi = list(filter(None,stat.split('std'))) # The multiplier for std, if any.
+			if len(multi) == 0: # No multiplier given
+				band_multi[i] = 1.0
+			elif len(multi) == 1: # Multiplier was given
+				band_multi[i] = multi[0]
+			else:
+				raise ValueError(f"Statistic '{stat}' not valid. Should be given as '[n]std', where [n] is a number.")
+		else:
+			raise ValueError(f"Statistic of type '{type(stat)}' was not recognised. Must be either a Number, function or string in the format '[n]std'.")
+	
+	# Assign 'from_mid' if not explicitly set
+	if from_mid is None:
+		from_mid=all([stat in ['std',std,nanstd] for stat in band_stat]) # Band stats a type of standard deviation
+	
+	def band_stats():
+		temp_x,edges,plot_edges=bin_axis(x,bin_type,bins,log=xlog)
+		bin_num=bin_index(temp_x,edges)
+		return([plot_edges]+binned_stats(bin_num,len(edges)-1,[(y,stat_mid),(y,band_stat[0]),(y,band_stat[1]),(x,stat_mid)]))
+	
+	edges,y_mid,low,high,x_mid=cached('statband',(x,y,bin_type,bins,xlog,stat_mid,band_stat),band_stats)
+	if from_mid: # Band intervals should be taken as the difference from the mid line
+		low=y_mid-band_multi[0]*low
+		high=y_mid+band_multi[1]*high
+	return(edges,x_mid,y_mid,low,high)
+
+####################################
+# Hexagonal 2D histogram
+####################################
+def hexbin(x,y,c=None,bins=None,binlim=None,dens=True,scale=None,cstat=None,mincnt=None,xlog=False,ylog=False):
+	"""Hexagonal 2D histogram values
+	
+	Computes the hexagonal bins drawn by plots_2d.hexbin(), on the same grid as
+	matplotlib.pyplot.hexbin().
+	
+	Parameters
+	----------
+	x : array-like
+		Position of data points in the x axis.
+	y : array-like
+		Position of data points in the y axis.
+	c : array-like, optional
+		If a valid argument is given in cstat, defines the value used for the binned statistics.
+	bins : int or list, optional
+		The number of hexagons in the x direction, or in the x and y directions. Defaults to
+		max(10, len(x)**0.4).
+	binlim : array-like, optional
+		The limits of the bins, as (left, right, bottom, top). Defaults to the limits of the data.
+	dens : bool, optional
+		If false the histogram returns raw counts. Ignored if c is given.
+	scale : float, optional
+		Normalization of the densities. If not given, the number of data points is used.
+	cstat : str, int, float or function, optional
+		The statistic computed from c in each hexagon, as accepted by base_func.binned_stats().
+		Defaults to 'mean' if c is given.
+	mincnt : int, optional
+		The minimum number of points required in a hexagon in order to be returned, as described
+		in base_func.basehexbin().
+	xlog, ylog : bool, optional
+		If True, the hexagons are built from the logarithm of the values of that axis.
+	
+	Returns
+	-------
+	offsets : ndarray
+		The centres of the returned hexagons, in binning (i.e., logarithmic if xlog/ylog) space.
+	values : ndarray
+		The value of each returned hexagon.
+	hexagon : ndarray
+		The vertices of a hexagon centred at the origin, in binning space.
+	extent : tuple
+		The limits of the hexagon grid, as (left, right, bottom, top), in binning space.
+	"""
+	from numpy import size
+	from .base_func import basehexbin
+	
+	if type(bins) not in [list,tuple]:
+		if bins is None:
+			bins=max([10,int(len(x)**0.4)]) # Defaults to min of 10 bins
+		bins=[bins,int(bins/(3**0.5))]
+	if size([x,y])==0 and cstat is not None: # Zero-sized arrays given
+		raise ValueError(f"Cannot compute statistic (cstat='{cstat}') on zero-size array, set cstat=None if no data given.")
+	return(basehexbin(x,y,c,bins,binlim,dens,scale,cstat,mincnt,xlog,ylog))
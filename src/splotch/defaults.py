@@ -20,3 +20,6 @@ class Params:
 	hist2D_caxis_log=False
 	#Images
 	img_caxis_log=False
+	#Cache of computed plot products (see cache.cached)
+	cache_dir=None
+	cache_size=2**30
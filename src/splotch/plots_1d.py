@@ -42,8 +42,8 @@ def axline(x=None,y=None,a=None,b=None,label=None,lab_loc=0,ax=None,plot_kw={},*
 	
 	"""
 	
-	from matplotlib.pyplot import plot, legend, gca
-	from .base_func import axes_handler,plot_finalizer,dict_splicer,is_numeric
+	from matplotlib.pyplot import gca
+	from .base_func import plot_finalizer,dict_splicer,is_numeric
 	from warnings import warn
 	
 	# Handle deprecated variables
@@ -53,11 +53,8 @@ def axline(x=None,y=None,a=None,b=None,label=None,lab_loc=0,ax=None,plot_kw={},*
 			warn(f"'{dep}' will be deprecated in future verions, using '{deprecated[dep]}' instead")
 			if (dep=='plabel'): label = kwargs.pop(dep)
 	
-	if ax is not None:
-		old_axes=axes_handler(ax)
-	else:
+	if ax is None:
 		ax=gca()
-		old_axes=ax
 	
 	if not (any([is_numeric(var) for var in [x,y,a,b]])): # If nothing has been specified
 		raise TypeError("axline() missing one of optional arguments: 'x', 'y', 'a' or 'b'")
@@ -131,15 +128,13 @@ def axline(x=None,y=None,a=None,b=None,label=None,lab_loc=0,ax=None,plot_kw={},*
 			xLims=ax.get_xlim()
 			yLims=ax.get_ylim()
 			
-			lines.append(plot([xLims[0],xLims[1]],[aa*xLims[0]+bb,aa*xLims[1]+bb],label=label[ii],**plot_par[ii]))
+			lines.append(ax.plot([xLims[0],xLims[1]],[aa*xLims[0]+bb,aa*xLims[1]+bb],label=label[ii],**plot_par[ii]))
 			
 			ax.set_xlim(xLims)
 			ax.set_ylim(yLims)
 			
 	if any(label):
-		legend(loc=lab_loc)
-	if ax is not None:
-		old_axes=axes_handler(old_axes)
+		ax.legend(loc=lab_loc)
 
 	return lines[0] if len(lines) == 1 else lines
 
@@ -208,10 +203,10 @@ def brokenplot(x,y=None,xbreak=None,ybreak=None,xlim=None,ylim=None,sep=0.05,
 		The lines are given as pairs to correspond to the separate lines either side of the x/ybreak.
 	
 	"""
-	from .base_func import axes_handler,dict_splicer,plot_finalizer
+	from .base_func import dict_splicer,plot_finalizer
 	
 	from numpy import shape, arange, ndarray
-	from matplotlib.pyplot import plot, legend, show, sca, gca
+	from matplotlib.pyplot import gca
 	from matplotlib.transforms import Bbox
 	from warnings import warn
 	
@@ -222,11 +217,8 @@ def brokenplot(x,y=None,xbreak=None,ybreak=None,xlim=None,ylim=None,sep=0.05,
 			warn(f"'{dep}' will be deprecated in future verions, using '{deprecated[dep]}' instead")
 			if (dep=='plabel'): label = kwargs.pop(dep)
 	
-	if ax is not None:
-		old_axes=axes_handler(ax)
-	else:
+	if ax is None:
 		ax=gca()
-		old_axes=ax
 
 	if type(x) is not list or len(shape(x))==1:
 		x=[x]
@@ -325,15 +317,11 @@ def brokenplot(x,y=None,xbreak=None,ybreak=None,xlim=None,ylim=None,sep=0.05,
 					ax.set_xticks(ax.get_xticks()[:-1]) # Remove duplicate tick on left side
 				else:
 					ax2.set_xticks(ax2.get_xticks()[1:]) # Remove duplicate tick on right side
-	sca(ax)
 	
 	if any(label):
 		ax.legend(loc=lab_loc)
 	
-	plot_finalizer(xlog,ylog,xlim,ylim,title,xlabel,ylabel,xinvert,yinvert,grid)
-	
-	if ax is not None:
-		old_axes=axes_handler(old_axes)
+	plot_finalizer(xlog,ylog,xlim,ylim,title,xlabel,ylabel,xinvert,yinvert,grid,ax=ax)
 
 	return (lines[0] if len(lines) == 1 else lines)
 
@@ -342,7 +330,7 @@ def brokenplot(x,y=None,xbreak=None,ybreak=None,xlim=None,ylim=None,sep=0.05,
 ####################################
 def curve(expr, var=None, subs={}, permute=False, bounds=None, num=101, xlim=None, ylim=None, xinvert=False, yinvert=False,
 		  xlog=False, ylog=False, title=None, xlabel=None, ylabel=None, label=True, lab_loc=0,
-		  grid=None, ax=None, plot_kw={}, **kwargs):
+		  grid=None, ax=None, plot_kw={}, adaptive=False, max_num=10000, ensemble=None, percent=None, dens_bins=None, **kwargs):
 	"""Function Plotting
 	
 	Plot the curve corresponding to a definingned function over the range of [from, to].
@@ -364,7 +352,9 @@ def curve(expr, var=None, subs={}, permute=False, bounds=None, num=101, xlim=Non
 		The range over which the function will be plotted. If not given, these default to
 		the current bounds of the plot.
 	num : int, optional (default: 101)
-		The number of values along the independent variable on which to evaulate `expr`.
+		The number of values along the independent variable on which to evaulate `expr`. If
+		`adaptive` is used, these are the initial values, which must resolve the features of
+		the curves so that they can be refined.
 	xlim : tuple-like, optional
 		Defines the limits of the x-axis, it must contain two elements (lower and higer limits).
 	ylim : tuple-like, optional
@@ -410,26 +400,44 @@ def curve(expr, var=None, subs={}, permute=False, bounds=None, num=101, xlim=Non
 		kwargs are used to specify matplotlib specific properties such as linecolor, linewidth, 
 		antialiasing, etc. A list of available `Line2D` properties can be found here: 
 		https://matplotlib.org/3.1.0/api/_as_gen/matplotlib.lines.Line2D.html#matplotlib.lines.Line2D
+	adaptive : bool or float, optional (default: False)
+		If True or a float, the values of the independent variable are refined where the curves
+		deviate from straight segments by more than the given tolerance (default: 1e-3), as a
+		fraction of the width/height of the plotted region. All the curves share the same values.
+	max_num : int, optional (default: 10000)
+		The maximum number of values of the independent variable when `adaptive` is used.
+	ensemble : {'density','band'}, optional
+		Draws all the curves defined by `subs` as a single ensemble, instead of one line for each
+		curve: 'density' draws the fraction of the curves that cross each pixel as an image (using
+		pcolormesh), and 'band' draws the bands that contain the given percentages of the curves
+		at each value of the independent variable (using fill_between). kwargs are then passed to
+		the corresponding matplotlib function, and only a str `label` is shown in the legend.
+	percent : float or list, optional (default: [68.3, 95.4])
+		The percentages of the curves contained in each band for ensemble='band'.
+	dens_bins : int, optional (default: 100)
+		The number of bins along the y-axis for ensemble='density'. The limits of the bins are given
+		by `ylim`, or otherwise by the range of the curves.
 	
 	Returns
 	-------
 	curves : list of (or single) pyplot.Line2D object(s)
-		A list of Line2D objects created for each curved create by `subs`.
+		A list of Line2D objects created for each curved create by `subs`. For an `ensemble`, the
+		QuadMesh of the density or the PolyCollection(s) of the bands.
 	expr : Sympy.Expr
 		If expr was given as a string, this returns the sympy expression created from `sympy.sympify()`.
 		Otherwise, simply returns the `expr` that was given.
 	
 	"""
 	
-	from .base_func import axes_handler,dict_splicer,plot_finalizer,simpler_dict_splicer
+	from .base_func import dict_splicer,plot_finalizer,simpler_dict_splicer,sympify_expr,lambdify_expr,refine_curve,curve_density
 	
-	from sympy import symbols, sympify, Expr
-	from sympy.utilities.lambdify import lambdify
-	from numpy import linspace, logspace, log10, empty, array, meshgrid, prod
-	from collections import Iterable
+	from sympy import Expr
+	from numpy import linspace, logspace, log10, array, broadcast_to, meshgrid, nanpercentile, prod
+	from collections.abc import Iterable
 	
-	from matplotlib.pyplot import plot, legend, gca
+	from matplotlib.pyplot import gca
 	from matplotlib.legend_handler import HandlerPathCollection, HandlerLine2D, HandlerTuple
+	from matplotlib.patches import Patch
 	from matplotlib import rcParams
 	from warnings import warn
 	
@@ -440,15 +448,12 @@ def curve(expr, var=None, subs={}, permute=False, bounds=None, num=101, xlim=Non
 			warn(f"'{dep}' will be deprecated in future verions, using '{deprecated[dep]}' instead")
 			if (dep=='plabel'): label = kwargs.pop(dep)
 	
-	if ax is not None:
-		old_axes=axes_handler(ax)
-	else:
+	if ax is None:
 		ax=gca()
-		old_axes=ax
 	
 	isfunc=False
 	if (isinstance(expr, str)):
-		expr=sympify(expr)
+		expr=sympify_expr(expr)
 	elif (callable(expr)):
 		isfunc=True
 	elif (isinstance(expr, Expr)):
@@ -493,8 +498,12 @@ def curve(expr, var=None, subs={}, permute=False, bounds=None, num=101, xlim=Non
 	plot_par=plot_kw.copy()
 	plot_par.update(kwargs)
 	
+	if (ensemble not in [None,'density','band']):
+		raise ValueError(f"Value of 'ensemble' must be 'density' or 'band', not '{ensemble}'.")
+	
 	# Create 'L' number of plot kwarg dictionaries to parse into each plot call
-	plot_par=dict_splicer(plot_par,L,[1]*L)
+	if (ensemble is None):
+		plot_par=dict_splicer(plot_par,L,[1]*L)
 	
 	if (bounds == None):
 		if (xlim != None):
@@ -504,17 +513,45 @@ def curve(expr, var=None, subs={}, permute=False, bounds=None, num=101, xlim=Non
 	
 	vararr=logspace(*log10(bounds),num=num) if xlog else linspace(*bounds,num=num)
 	
-	curves=[None]*L
-	for ii in range(L):
-		if (isfunc):
-			curvearr=expr(vararr, **subsarr[ii])
-		else:
-			func=lambdify(var, expr.subs(subsarr[ii]), 'numpy') # returns a numpy-ready function
-			curvearr=func(vararr)
-		curves[ii]=plot(vararr,curvearr,**plot_par[ii])[0]
+	if (isfunc):
+		def evaluate(x):
+			return(array([broadcast_to(expr(x, **subsarr[ii]),x.shape) for ii in range(L)]))
+	else: # Compiled once, and evaluated for all the substitution sets in a single (L, len(x)) broadcast
+		params=tuple(subsarr[0].keys()) if L > 0 else ()
+		values=[array([subsarr[ii][key] for ii in range(L)]) for key in params]
+		values=[(val if val.dtype.kind in 'biufc' else val.astype(float)).reshape(L,1) for val in values]
+		func=lambdify_expr(expr,str(var),params)
+		def evaluate(x):
+			return(broadcast_to(func(x.reshape(1,-1),*values),(L,len(x))))
+	
+	curvearr=evaluate(vararr)
+	if (adaptive not in [False,None]): # Refined where the curves are not well described by straight segments
+		vararr,curvearr=refine_curve(evaluate,vararr,curvearr,tol=1e-3 if adaptive is True else adaptive,
+										max_num=max_num,xlog=xlog,ylog=ylog)
+	
+	if (ensemble == 'density'): # All the curves rasterised into a single image
+		y_edges,Z=curve_density(curvearr,bins=100 if dens_bins is None else dens_bins,lims=ylim,ylog=ylog)
+		curves=[ax.pcolormesh(vararr,y_edges,Z.T,**plot_par)]
+	elif (ensemble == 'band'): # The bands of the distribution of the curves, from the widest
+		percent=[68.3,95.4] if percent is None else percent if isinstance(percent, Iterable) else [percent]
+		percent=sorted(percent,reverse=True)
+		bounds=nanpercentile(curvearr,[q for p in percent for q in (50-p/2,50+p/2)],axis=0)
+		plot_par.setdefault('alpha',0.3)
+		curves=[]
+		for ii in range(len(percent)):
+			curves.append(ax.fill_between(vararr,bounds[2*ii],bounds[2*ii+1],**plot_par))
+			plot_par.setdefault('color',curves[0].get_facecolor()[0][:3]) # All the bands in the same colour
+	else:
+		curves=[None]*L
+		for ii in range(L):
+			curves[ii]=ax.plot(vararr,curvearr[ii],**plot_par[ii])[0]
 	
 	# Create the legend object
-	if (label == True):
+	if (ensemble is not None): # A single entry for all the curves of the ensemble
+		if (isinstance(label, str)): # Images cannot be shown in legends, so a patch of their colour map is used
+			handle=Patch(facecolor=curves[-1].cmap(0.75)) if ensemble == 'density' else curves[-1]
+			ax.legend(handles=[handle], labels=[label], loc=lab_loc)
+	elif (label == True):
 		labellist=['']*L
 		for ii in range(L): # Make a label for each of sub values
 			# Create a list of the sub names and their values.
@@ -540,10 +577,7 @@ def curve(expr, var=None, subs={}, permute=False, bounds=None, num=101, xlim=Non
 	else:
 		raise ValueError("Value of 'label' is invalid. Expected bool, str, iterable or None, but got '{0}'.".format(label))
 	
-	plot_finalizer(xlog,ylog,xlim,ylim,title,xlabel,ylabel,xinvert,yinvert,grid)
-	
-	if ax is not None:
-		old_axes=axes_handler(old_axes)
+	plot_finalizer(xlog,ylog,xlim,ylim,title,xlabel,ylabel,xinvert,yinvert,grid,ax=ax)
 	
 	return(curves[0] if len(curves)==1 else curves, expr)
 
@@ -562,8 +596,10 @@ def hist(data,bin_type=None,bins=None,dens=True,cumul=None,scale=None,weights=No
 	
 	Parameters
 	----------
-	data : array-like or list
-		If list it is assumed that each elemement is array-like.
+	data : array-like, HistStream1D or list
+		If list it is assumed that each elemement is array-like or a HistStream1D. A HistStream1D
+		draws the histogram accumulated from streamed data, in which case bin_type, bins, weights
+		and v are ignored for that element.
 	bin_type : {'number','width','edges','equal'}, optional
 		Defines how is understood the value given in bins: 'number' for the desired number of bins,
 		'width' for the width of the bins, 'edges' for the edges of bins, and 'equal' for making
@@ -589,10 +625,11 @@ def hist(data,bin_type=None,bins=None,dens=True,cumul=None,scale=None,weights=No
 		space between the edges of the histogram and 0.
 	v : array-like or list, optional
 		If a valid argument is given in vstat, defines the value used for the binned statistics.
-	vstat : str, function  or list, optional
+	vstat : str, int, float, function  or list, optional
 		Must be or contain one of the valid str arguments for the statistics variable
-		in scipy.stats.binned_statistic ('mean’, 'median’, 'count’, 'sum’, 'min’ or 'max’) or
-		function(s) that takes a 1D array and outputs an integer or float.
+		in scipy.stats.binned_statistic ('mean’, 'median’, 'count’, 'sum’, 'min’ or 'max’), number(s)
+		for the percentile to calculate in each bin, or function(s) that takes a 1D array and outputs
+		an integer or float.
 	xlim : tuple-like, optional
 		Defines the limits of the x-axis, it must contain two elements (lower and higer limits).
 	ylim : tuple-like, optional
@@ -637,11 +674,11 @@ def hist(data,bin_type=None,bins=None,dens=True,cumul=None,scale=None,weights=No
 		Only provided if output is True.
 	"""
 	
-	from numpy import cumsum as np_cumsum, sum as np_sum, max as np_max, min as np_min
-	from scipy.stats import binned_statistic
-	from numpy import array, ndarray, diff, dtype, histogram, inf, nan, nanmax, nanmean, nanstd, ones, where, shape
-	from matplotlib.pyplot import bar, fill_between, gca, legend, plot, rcParams, step
-	from .base_func import axes_handler,bin_axis,dict_splicer,plot_finalizer,step_filler
+	from numpy import sum as np_sum, max as np_max, min as np_min
+	from numpy import array, ndarray, diff, dtype, inf, nanmean, nanstd, ones, shape
+	from matplotlib.pyplot import gca, rcParams
+	from .base_func import dict_splicer,plot_finalizer,step_filler
+	from .compute import hist as compute_hist
 	from warnings import warn
 	
 	# Handle deprecated variables
@@ -651,8 +688,8 @@ def hist(data,bin_type=None,bins=None,dens=True,cumul=None,scale=None,weights=No
 			warn(f"'{dep}' will be deprecated in future verions, using '{deprecated[dep]}' instead")
 			if (dep=='plabel'): label = kwargs.pop(dep)
 
-	if ax is not None:
-		old_axes=axes_handler(ax)
+	if ax is None:
+		ax=gca()
 	if type(data) not in [list, tuple, ndarray] or (len(shape(data))==1 and array(data).dtype is not dtype('O')):
 		data=[data]
 	L=len(data)
@@ -707,31 +744,14 @@ def hist(data,bin_type=None,bins=None,dens=True,cumul=None,scale=None,weights=No
 	# Create 'L' number of plot kwarg dictionaries to parse into each plot call
 	plot_par=dict_splicer(plot_par,L,[1]*L)
 	
-	plot_type={'line':plot,'linefilled':fill_between,'step':step,'stepfilled':step_filler,'bar':bar,'barfilled':bar}
+	plot_type={'line':ax.plot,'linefilled':ax.fill_between,'step':ax.step,'stepfilled':lambda *args,**kwargs: step_filler(*args,ax=ax,**kwargs),'bar':ax.bar,'barfilled':ax.bar}
 	hist_centre={'line':True,'linefilled':True,'step':False,'stepfilled':False,'bar':False,'barfilled':False}
 	bin_edges=[]
 	n_return=[]
 	
 	for i in range(L):
-		temp_data,bins_hist,bins_plot=bin_axis(data[i],bin_type[i],bins[i],log=xlog,plot_centre=hist_centre[hist_type[i]])
-		n_check=histogram(temp_data,bins=bins_hist,density=False)[0]
-		n_check=n_check>=nmin[i]
-		if vstat[i]:
-			temp_y=binned_statistic(temp_data,v[i],statistic=vstat[i],bins=bins_hist)[0]
-		else:
-			temp_y=histogram(temp_data,bins=bins_hist,density=dens[i],weights=weights[i])[0]
-		if cumul[i]:
-			temp_y=np_cumsum(temp_y)
-			if dens[i]:
-				temp_y=temp_y.astype('float')/nanmax(temp_y)
-		if scale[i]:
-			if dens[i]:
-				temp_y*=len(data[i])/scale[i]
-			else:
-				temp_y=temp_y.astype('float')/scale[i]
-		if ylog:
-			temp_y=where(temp_y==0,nan,temp_y)
-		temp_y=where(n_check,temp_y,nan)
+		bins_hist,bins_plot,temp_y,_=compute_hist(data[i],bin_type[i],bins[i],dens[i],cumul[i],scale[i],weights[i],v[i],vstat[i],
+												   nmin[i],xlog,ylog,plot_centre=hist_centre[hist_type[i]])
 		y=temp_y
 		if hist_type[i]=='step':
 			if ylog:
@@ -746,26 +766,23 @@ def hist(data,bin_type=None,bins=None,dens=True,cumul=None,scale=None,weights=No
 			bins_plot=(bins_plot[0:-1]+bins_plot[1:])/2
 			if hist_type[i]=='bar':
 				if 'edgecolor' not in plot_par[i].keys():
-					p=plot(bins_plot[0],0)
+					p=ax.plot(bins_plot[0],0)
 					plot_par[i]['edgecolor']=p[0].get_color()
 					p.pop()
-					temp_ax=gca()
-					temp_ax.relim()
-					temp_ax.autoscale()
+					ax.relim()
+					ax.autoscale()
 				plot_par[i]['fill']=False
 		plot_type[hist_type[i]](bins_plot,y,label=label[i],**plot_par[i])
 		bin_edges.append(bins_plot)
 		n_return.append(temp_y)
 	if any(label):
-		legend(loc=lab_loc)
+		ax.legend(loc=lab_loc)
 	
 	if ylim == None: # Adjust ylims if None given.
 		if not ylog and all([val is None for val in v]): # These automatic limits do not apply when ylog=True or statistics are used.
-			ylim = [0, max(np_max(y)*(1+rcParams['axes.ymargin']), gca().get_ylim()[1])]
+			ylim = [0, max(np_max(y)*(1+rcParams['axes.ymargin']), ax.get_ylim()[1])]
 	
-	plot_finalizer(xlog,ylog,xlim,ylim,title,xlabel,ylabel,xinvert,yinvert,grid)
-	if ax is not None:
-		old_axes=axes_handler(old_axes)
+	plot_finalizer(xlog,ylog,xlim,ylim,title,xlabel,ylabel,xinvert,yinvert,grid,ax=ax)
 	if len(n_return)==1:
 		n_return=n_return[0]
 	if len(bin_edges)==1:
@@ -831,8 +848,8 @@ def plot(x,y=None,xlim=None,ylim=None,xinvert=False,yinvert=False,xlog=False,ylo
 	"""
 	
 	from numpy import shape, arange
-	from matplotlib.pyplot import plot, legend
-	from .base_func import axes_handler,dict_splicer,plot_finalizer
+	from matplotlib.pyplot import gca
+	from .base_func import dict_splicer,plot_finalizer
 	from warnings import warn
 
 	# Handle deprecated variables
@@ -842,8 +859,8 @@ def plot(x,y=None,xlim=None,ylim=None,xinvert=False,yinvert=False,xlog=False,ylo
 			warn(f"'{dep}' will be deprecated in future verions, using '{deprecated[dep]}' instead")
 			if (dep=='plabel'): label = kwargs.pop(dep)
 	
-	if ax is not None:
-		old_axes=axes_handler(ax)
+	if ax is None:
+		ax=gca()
 	if type(x) is not list or len(shape(x))==1:
 		x=[x]
 	L=len(x)
@@ -866,11 +883,9 @@ def plot(x,y=None,xlim=None,ylim=None,xinvert=False,yinvert=False,xlog=False,ylo
 	
 	lines=[] # Initialising list which contains each line
 	for i in range(L):
-		lines += plot(x[i],y[i],label=label[i],**plot_par[i])
+		lines += ax.plot(x[i],y[i],label=label[i],**plot_par[i])
 	if any(label):
-		legend(loc=lab_loc)
-	plot_finalizer(xlog,ylog,xlim,ylim,title,xlabel,ylabel,xinvert,yinvert,grid)
-	if ax is not None:
-		old_axes=axes_handler(old_axes)
+		ax.legend(loc=lab_loc)
+	plot_finalizer(xlog,ylog,xlim,ylim,title,xlabel,ylabel,xinvert,yinvert,grid,ax=ax)
 	
 	return (lines[0] if len(lines) == 1 else lines)
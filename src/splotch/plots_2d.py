@@ -68,11 +68,11 @@ def contour(z,x=None,y=None,filled=None,xlim=None,ylim=None,xinvert=False,yinver
 	"""
 	
 	from numpy import shape, linspace
-	from matplotlib.pyplot import contour,contourf, legend
-	from .base_func import axes_handler,dict_splicer,plot_finalizer
+	from matplotlib.pyplot import gca
+	from .base_func import dict_splicer,plot_finalizer
 	
-	if ax is not None:
-		old_axes=axes_handler(ax)
+	if ax is None:
+		ax=gca()
 	if filled is None:
 		from .defaults import Params
 		filled=Params.cont_filled
@@ -88,25 +88,26 @@ def contour(z,x=None,y=None,filled=None,xlim=None,ylim=None,xinvert=False,yinver
 	
 	# Create 'L' number of plot kwarg dictionaries to parse into each plot call
 	
-	plotf={False:contour,True:contourf}
+	plotf={False:ax.contour,True:ax.contourf}
 	plotf[filled](x,y,z,**plot_par)
 	
-	plot_finalizer(xlog,ylog,xlim,ylim,title,xlabel,ylabel,xinvert,yinvert,grid)
-	if ax is not None:
-		old_axes=axes_handler(old_axes)
+	plot_finalizer(xlog,ylog,xlim,ylim,title,xlabel,ylabel,xinvert,yinvert,grid,ax=ax)
 
 ####################################
 # Contours from density histograms
 ####################################
-def contourp(x,y,percent=None,filled=None,bin_type=None,bins=None,smooth=0.0,max_spacing=True,xlim=None,ylim=None,xinvert=False,yinvert=False,
-				xlog=False,ylog=False,title=None,plabel=None,xlabel=None,ylabel=None,lab_loc=0,ax=None,grid=None,output=None,plot_kw={},**kwargs):
+def contourp(x,y=None,percent=None,filled=None,bin_type=None,bins=None,smooth=0.0,density='hist',bw_method=None,max_spacing=True,xlim=None,ylim=None,
+				xinvert=False,yinvert=False,xlog=False,ylog=False,title=None,plabel=None,xlabel=None,ylabel=None,lab_loc=0,ax=None,grid=None,
+				output=None,plot_kw={},computed=None,**kwargs):
 	
 	"""Contour function, encircling the highest density regions that contain the given percentages of the sample.
 	
 	Parameters
 	----------
-	x : array-like
-		Position of data points in the x axis.
+	x : array-like or HistStream2D
+		Position of data points in the x axis. A HistStream2D draws the contours of the histogram
+		accumulated from streamed (or already binned) data, in which case y, bin_type and bins are
+		ignored.
 	y : array-like
 		Position of data points in the y axis.
 	percent : float or array-like, optional.
@@ -117,9 +118,17 @@ def contourp(x,y,percent=None,filled=None,bin_type=None,bins=None,smooth=0.0,max
 		making bins with equal number of elements (or as close as possible). If not given it is
 		inferred from the data type of bins: 'number' if int, 'width' if float and 'edges' if ndarray.
 	bins : int, float, array-like, optional
-		Gives the values for the bins, according to bin_type.
+		Gives the values for the bins, according to bin_type. If density='kde', gives the number
+		of grid points for each axis instead (default: 128).
 	smooth : float, optional
 		The standard deviation for the Gaussian kernel. Default: 0.0 (No smoothing).
+	density : {'hist','kde'}, optional
+		How the density of the data is estimated: 'hist' uses a 2D histogram, while 'kde' uses a
+		Gaussian kernel density estimate computed on a grid with an FFT (see base_func.binned_kde).
+		Default: 'hist'.
+	bw_method : {'scott','silverman'} or float, optional
+		The bandwidth factor of the kernel density estimate, as for scipy.stats.gaussian_kde. Only
+		used if density='kde'. Default: 'scott'.
 	max_spacing : boolean, optional
 		If True, maximises the separation between colours drawn from the colour map. Default: True.
 	xlim : tuple-like, optional
@@ -153,6 +162,10 @@ def contourp(x,y,percent=None,filled=None,bin_type=None,bins=None,smooth=0.0,max
 		If True, returns the edges and values of the underlying histogram plus the levels of the contours.
 	plot_kw : dict, optional
 		Passes the given dictionary as a kwarg to the plotting function. Valid kwargs are QuadContourSet properties.
+	computed : tuple, optional
+		The (X, Y, Z, levels) returned by compute.contourp() for the same data and parameters, with
+		the percentages in decreasing order, which are drawn instead of computing them again (e.g.
+		when they are computed beforehand in another process, as cornerplot() does).
 	**kwargs: QuadContourSet properties, optional
 		kwargs are used to specify matplotlib specific properties such as cmap, linewidths, hatches, etc.
 		The list of available properties can be found here: 
@@ -161,11 +174,11 @@ def contourp(x,y,percent=None,filled=None,bin_type=None,bins=None,smooth=0.0,max
 	Returns
 	-------
 	bin_edges_x : array
-		The bin edges for the x axis.
+		The bin centres (or grid points, if density='kde') for the x axis.
 	bin_edges_y : array
-		The bin edges for the y axis.
+		The bin centres (or grid points, if density='kde') for the y axis.
 	n : array
-		The values of the underlying histogram.
+		The values of the underlying histogram (or density estimate).
 	l : array
 		The levels for the contours.
 	"""
@@ -173,12 +186,13 @@ def contourp(x,y,percent=None,filled=None,bin_type=None,bins=None,smooth=0.0,max
 	from warnings import warn
 	from matplotlib import lines, patches, rcParams
 	from matplotlib.cm import get_cmap, ScalarMappable
-	from matplotlib.colors import Normalize
-	from matplotlib.pyplot import gca, sca, contour, contourf, legend, Normalize, colorbar 
+	from matplotlib.pyplot import gca
 	from numpy import array, linspace, round, ndarray, ceil
 	from scipy.ndimage.filters import gaussian_filter
-	from .base_func import axes_handler,basehist2D,percent_finder,plot_finalizer,dict_splicer,is_numeric
+	from .base_func import plot_finalizer,dict_splicer,is_numeric
+	from .compute import contourp as compute_contourp
 	from .defaults import Params
+	from .streaming import HistStream2D
 	
 	# Initialise defaults
 	if filled is None:
@@ -190,24 +204,22 @@ def contourp(x,y,percent=None,filled=None,bin_type=None,bins=None,smooth=0.0,max
 	if output is None:
 		output=Params.contp_output
 	
-	func_dict={True:contourf,False:contour}
-	
 	# Assign current axis
-	if ax is not None:
-		old_axes=axes_handler(ax)
-	else:
-		ax = gca()
-		old_axes=ax
+	if ax is None:
+		ax=gca()
+	
+	func_dict={True:ax.contourf,False:ax.contour}
 	
 	if type(percent) is not ndarray:
 		percent=array([percent]).flatten()
-	if type(bin_type) not in [list, tuple, ndarray]:
-		bin_type=[bin_type]*2
-	if type(bins) not in [list,tuple]:
-		if bins is None:
-			bins = max([10,int(len(x)**0.4)]) # Defaults to min of 10 bins
-		bins=[bins]*2
 	percent=percent[::-1]
+	if isinstance(x,HistStream2D): # Histogram accumulated from streamed data
+		xlog=xlog or x.xlog
+		ylog=ylog or x.ylog
+	if computed is None:
+		X,Y,Z,level=compute_contourp(x,y,percent,bin_type,bins,density,bw_method,xlog,ylog)
+	else:
+		X,Y,Z,level=computed
 	
 	# Combine the `explicit` plot_kw dictionary with the `implicit` **kwargs dictionary
 	#plot_par = {**plot_kw, **kwargs} # For Python > 3.5
@@ -243,11 +255,6 @@ def contourp(x,y,percent=None,filled=None,bin_type=None,bins=None,smooth=0.0,max
 			else:
 				plabel=[f'{round(p,1)}%' for p in percent]
 	
-	X,Y,Z=basehist2D(x,y,None,bin_type,bins,None,None,None,xlog,ylog)
-	X=(X[:-1]+X[1:])/2
-	Y=(Y[:-1]+Y[1:])/2
-	
-	level=array([percent_finder(Z,p/100) for p in percent])
 	plot_return=func_dict[filled](X,Y,gaussian_filter(Z.T,sigma=smooth),levels=level,**plot_par)
 	
 	if plabel:
@@ -265,16 +272,14 @@ def contourp(x,y,percent=None,filled=None,bin_type=None,bins=None,smooth=0.0,max
 		elif plot_par['alpha'] is None:
 			plot_par['alpha']=[1.0 for i in range(len(percent))]
 		if filled:
-			legend([patches.Patch(color=plot_par['colors'][i],alpha=plot_par['alpha'][i])for i in range(len(percent))],
+			ax.legend([patches.Patch(color=plot_par['colors'][i],alpha=plot_par['alpha'][i])for i in range(len(percent))],
 					plabel,numpoints=1,loc=lab_loc)
 		else:
-			legend([lines.Line2D([0,1],[0,1],color=plot_par['colors'][i],linestyle=plot_par['linestyles'][i],
+			ax.legend([lines.Line2D([0,1],[0,1],color=plot_par['colors'][i],linestyle=plot_par['linestyles'][i],
 									alpha=plot_par['alpha'][i]) for i in range(len(percent))],
 					plabel,numpoints=1,loc=lab_loc)
 	
-	plot_finalizer(xlog,ylog,xlim,ylim,title,xlabel,ylabel,xinvert,yinvert,grid)
-	if ax is not None:
-		old_axes=axes_handler(old_axes)
+	plot_finalizer(xlog,ylog,xlim,ylim,title,xlabel,ylabel,xinvert,yinvert,grid,ax=ax)
 	if output:
 		return(X,Y,Z.T,array(level))
 
@@ -335,7 +340,7 @@ def errorband(x,y,yerr,line=False,xlim=None,ylim=None,
 	None
 	"""
 	
-	from splotch.base_func import axes_handler,bin_axis,plot_finalizer
+	from splotch.base_func import bin_axis,plot_finalizer
 	
 	import numpy as np
 	from numbers import Number
@@ -343,7 +348,6 @@ def errorband(x,y,yerr,line=False,xlim=None,ylim=None,
 	from numpy import array,percentile
 	from functools import partial
 	import matplotlib.colors as clr
-	import matplotlib.pyplot as plt
 	from matplotlib.pyplot import gca
 	from warnings import warn
 	
@@ -354,11 +358,8 @@ def errorband(x,y,yerr,line=False,xlim=None,ylim=None,
 			warn(f"'{dep}' will be deprecated in future verions, using '{deprecated[dep]}' instead")
 			if (dep=='plabel'): label = kwargs.pop(dep)
 	
-	if ax is not None:
-		old_axes=axes_handler(ax)
-	else:
+	if ax is None:
 		ax=gca()
-		old_axes=ax
 	if ylog is None:
 		from splotch.defaults import Params
 		ylog=Params.hist1D_yaxis_log
@@ -372,18 +373,16 @@ def errorband(x,y,yerr,line=False,xlim=None,ylim=None,
 	band_kw.update(kwargs)
 	
 	if len(array(yerr).shape)==2:
-		plt.fill_between(x,y-yerr[0],y+yerr[1],label=label,**band_kw)
+		ax.fill_between(x,y-yerr[0],y+yerr[1],label=label,**band_kw)
 	else:
-		plt.fill_between(x,y-yerr,y+yerr,label=label,**band_kw)
+		ax.fill_between(x,y-yerr,y+yerr,label=label,**band_kw)
 	
 	if line:
-		plt.plot(x,y,**line_kw)
+		ax.plot(x,y,**line_kw)
 	if label is not None:
-		plt.legend(loc=lab_loc)
+		ax.legend(loc=lab_loc)
 	
-	plot_finalizer(xlog,ylog,xlim,ylim,title,xlabel,ylabel,xinvert,yinvert,grid)
-	if ax is not None:
-		old_axes=axes_handler(old_axes)
+	plot_finalizer(xlog,ylog,xlim,ylim,title,xlabel,ylabel,xinvert,yinvert,grid,ax=ax)
 
 ####################################
 # Error bars
@@ -443,9 +442,9 @@ def errorbar(x,y,xerr=None,yerr=None,xlim=None,ylim=None,xinvert=False,yinvert=F
 	None
 	"""
 	
-	from .base_func import axes_handler,dict_splicer,plot_finalizer
+	from .base_func import dict_splicer,plot_finalizer
 	
-	from matplotlib.pyplot import errorbar, legend, gca
+	from matplotlib.pyplot import gca
 	from warnings import warn
 	
 	# Handle deprecated variables
@@ -455,11 +454,8 @@ def errorbar(x,y,xerr=None,yerr=None,xlim=None,ylim=None,xinvert=False,yinvert=F
 			warn(f"'{dep}' will be deprecated in future verions, using '{deprecated[dep]}' instead")
 			if (dep=='plabel'): label = kwargs.pop(dep)
 	
-	if ax is not None:
-		old_axes=axes_handler(ax)
-	else:
+	if ax is None:
 		ax=gca()
-		old_axes=ax
 	if type(x) is not list:
 		x=[x]
 	if type(y) is not list:
@@ -481,12 +477,10 @@ def errorbar(x,y,xerr=None,yerr=None,xlim=None,ylim=None,xinvert=False,yinvert=F
 	plot_par=dict_splicer(plot_par,L,[1]*L)
 	
 	for i in range(L):
-		errorbar(x[i],y[i],xerr=xerr[i],yerr=yerr[i],label=label[i],**plot_par[i])
+		ax.errorbar(x[i],y[i],xerr=xerr[i],yerr=yerr[i],label=label[i],**plot_par[i])
 	if any(label):
-		legend(loc=lab_loc)
-	plot_finalizer(xlog,ylog,xlim,ylim,title,xlabel,ylabel,xinvert,yinvert,grid)
-	if ax is not None:
-		old_axes=axes_handler(old_axes)
+		ax.legend(loc=lab_loc)
+	plot_finalizer(xlog,ylog,xlim,ylim,title,xlabel,ylabel,xinvert,yinvert,grid,ax=ax)
 
 ####################################
 # Error boxes
@@ -496,7 +490,9 @@ def errorbox(x,y,xerr=None,yerr=None,xlim=None,ylim=None,xinvert=False,yinvert=F
 	
 	"""Errorbox plotting function.
 	
-	This is a wrapper around matplotlib PatchCollections with a matplotlib errorbar functionality.
+	This is a wrapper around matplotlib collections with a matplotlib errorbar functionality. The boxes
+	of all the points are built at once, as a single PolyCollection of rectangles or EllipseCollection
+	of ellipses (a PolyCollection of ellipses for logarithmic axes).
 	
 	Parameters
 	----------
@@ -548,12 +544,12 @@ def errorbox(x,y,xerr=None,yerr=None,xlim=None,ylim=None,xinvert=False,yinvert=F
 	None
 	"""
 	
-	from .base_func import axes_handler,dict_splicer,plot_finalizer
+	from .base_func import dict_splicer,plot_finalizer
 	
-	from matplotlib.pyplot import errorbar, legend, gca
-	from numpy import shape, full, array
-	from matplotlib.collections import PatchCollection
-	from matplotlib.patches import Ellipse, Rectangle, Patch
+	from matplotlib.pyplot import gca
+	from numpy import shape, full, array, asarray, column_stack, cos, linspace, pi, sin, stack
+	from matplotlib.collections import EllipseCollection, PolyCollection
+	from matplotlib.patches import Patch
 	
 	from warnings import warn
 	
@@ -565,11 +561,8 @@ def errorbox(x,y,xerr=None,yerr=None,xlim=None,ylim=None,xinvert=False,yinvert=F
 			if (dep=='plabel'): label = kwargs.pop(dep)
 			if (dep=='boxtype'): box_type = kwargs.pop(dep)
 	
-	if ax is not None:
-		old_axes=axes_handler(ax)
-	else:
+	if ax is None:
 		ax=gca()
-		old_axes=ax
 	if type(x) is not list:
 		x=[x]
 	if type(y) is not list:
@@ -579,7 +572,6 @@ def errorbox(x,y,xerr=None,yerr=None,xlim=None,ylim=None,xinvert=False,yinvert=F
 	if type(yerr) is not list:
 		yerr=[yerr]
 	
-	boxdict = {'rec':Rectangle,'ell':Ellipse}
 	if (box_type.lower()[:3] not in ['rec','ell']):
 		raise ValueError(f"box_type '{box_type}' not recognised.")
 	
@@ -629,26 +621,35 @@ def errorbox(x,y,xerr=None,yerr=None,xlim=None,ylim=None,xinvert=False,yinvert=F
 	# Create 'L' number of plot kwarg dictionaries to parse into each plot call
 	plot_par=dict_splicer(plot_par,L,[1]*L)
 	
-	PathColls=[]
-	# Loop over data points; create box/ellipse from errors at each point
-	boxdict = {'rec':Rectangle,'ell':Ellipse}
+	# The outline of a box or ellipse spanning the unit square, scaled to the box of each data point
+	if (box_type.lower()[:3] == 'rec'):
+		outline=array([[0,0],[1,0],[1,1],[0,1],[0,0]])
+	else:
+		angle=linspace(0,2*pi,65)[:-1]
+		outline=column_stack([(1+cos(angle))/2,(1+sin(angle))/2])
+	
 	boxhandles = []
 	for i in range(L):
-		errorboxes=[]
-		for j, (xx, yy, xe, ye) in enumerate(zip(x[i], y[i], xerr[i].T, yerr[i].T)):
-			errorboxes.append( boxdict[box_type.lower()[:3]]((xx - xe[0], yy - ye[0]), xe.sum(), ye.sum()) )
+		# The boxes spanned by the errors of all the points, built at once
+		low_x=asarray(x[i],dtype=float)-xerr[i][0]
+		low_y=asarray(y[i],dtype=float)-yerr[i][0]
+		width=xerr[i][0]+xerr[i][1]
+		height=yerr[i][0]+yerr[i][1]
 		
-	
-		# Create and add patch collection with specified colour/alpha
-		pc=PatchCollection(errorboxes, **plot_par[i])
+		if (box_type.lower()[:3] == 'ell' and not (xlog or ylog)): # Scaled by matplotlib in data units, around the centre of each box
+			pc=EllipseCollection(width,height,0,units='xy',offsets=column_stack([low_x+width/2,low_y+height/2]),
+									offset_transform=ax.transData,**plot_par[i])
+		else: # Polygons in data space, which are also correct for logarithmic axes
+			pc=PolyCollection(stack([low_x[:,None]+width[:,None]*outline[:,0],low_y[:,None]+height[:,None]*outline[:,1]],axis=-1),
+								**plot_par[i])
 		boxhandles.append(Patch(**plot_par[i]))
-		ax.add_collection(pc)
+		ax.add_collection(pc,autolim=False)
+		ax.update_datalim(column_stack([low_x,low_y]))
+		ax.update_datalim(column_stack([low_x+width,low_y+height]))
 	
 	if any(label):
-		legend(handles=boxhandles,labels=label,loc=lab_loc)
-	plot_finalizer(xlog,ylog,xlim,ylim,title,xlabel,ylabel,xinvert,yinvert,grid)
-	if ax is not None:
-		old_axes=axes_handler(old_axes)
+		ax.legend(handles=boxhandles,labels=label,loc=lab_loc)
+	plot_finalizer(xlog,ylog,xlim,ylim,title,xlabel,ylabel,xinvert,yinvert,grid,ax=ax)
 
 ####################################
 # Hexagonal 2D histogram
@@ -675,10 +676,12 @@ def hexbin(x,y,bins=None,binlim=None,dens=True,scale=None,
 		If false the histogram returns raw counts.
 	c : array-like, optional
 		If a valid argument is given in cstat, defines the value used for the binned statistics.
-	cstat : str or function, optional
+	cstat : str, int, float or function, optional
 		Must be one of the valid str arguments for the statistics variable in scipy.stats.binned_statistic_2d
-		('mean’, 'median’, 'count’, 'sum’, 'min’ or 'max’) or a function that takes a 1D array and
-		outputs an integer or float.
+		('mean’, 'median’, 'count’, 'sum’, 'min’ or 'max’), a number for the percentile to calculate
+		in each bin, or a function that takes a 1D array and outputs an integer or float. Defaults
+		to 'mean' if c is given. Note that versions of splotch up to 0.5.4.2 computed the maximum
+		instead of the mean for cstat='mean'.
 	xlim : tuple-like, optional
 		Defines the limits of the x-axis, it must contain two elements (lower and higer limits).
 	ylim : tuple-like, optional
@@ -716,37 +719,38 @@ def hexbin(x,y,bins=None,binlim=None,dens=True,scale=None,
 	output : boolean, optional
 		If True, returns the edges and values of the histogram.
 	plot_kw : dict, optional
-		Explicit dictionary of kwargs to be parsed to matplotlib hexbin function.
-		Parameters will be overwritten if also given implicitly as a **kwarg.
-	**kwargs : pcolormesh properties, optional
+		Explicit dictionary of kwargs to be parsed to the PolyCollection of hexagons (plus cmap,
+		norm, vmin, vmax and mincnt, as in matplotlib.pyplot.hexbin()). Parameters will be
+		overwritten if also given implicitly as a **kwarg.
+	**kwargs : PolyCollection properties, optional
 		kwargs are used to specify matplotlib specific properties such as cmap, norm, edgecolors etc.
-		https://matplotlib.org/api/_as_gen/matplotlib.pyplot.hexbin.html
+		https://matplotlib.org/api/collections_api.html#matplotlib.collections.PolyCollection
 	
 	Returns
 	-------
 	n : array
-		The values of the histogram. Only provided if output is True.
-	x_edges : array
-		The bin edges for the x axis. Only provided if output is True.
-	y_edges : array
-		The bin edges for the y axis. Only provided if output is True.
+		The values of the drawn hexagons, which, as in matplotlib.pyplot.hexbin(), include the
+		empty hexagons only for raw counts without nmin. Only provided if output is True.
+	offsets : array
+		The centres of the hexagons, matching n. These are always given in data units, whereas
+		versions of splotch up to 0.5.4.2 returned log10 values for logarithmic axes. Only
+		provided if output is True.
 	"""
 	#dens : bool or list, optional
 	#	If false the histogram returns raw counts.
 	#scale : float or list, optional
 	#	Scaling of the data counts.
 	
-	from numpy import diff, nan, nanmin, nanmax, nanmedian, nanmax, nanstd, unique, size, zeros, shape
+	from numpy import expand_dims, size
+	from matplotlib.collections import PolyCollection
 	from matplotlib.colors import LogNorm
-	from matplotlib.pyplot import hexbin, colorbar
-	from .base_func import axes_handler,plot_finalizer
+	from matplotlib.pyplot import gca
+	from matplotlib.transforms import AffineDeltaTransform
+	from .base_func import plot_finalizer,set_current_image
+	from .compute import hexbin as compute_hexbin
 	
-	if ax is not None:
-		old_axes=axes_handler(ax)
-	if type(bins) not in [list,tuple]:
-		if bins is None:
-			bins=max([10,int(len(x)**0.4)]) # Defaults to min of 10 bins
-		bins=[bins,int(bins/(3**0.5))]
+	if ax is None:
+		ax=gca()
 	
 	if None in (clog,output):
 		from .defaults import Params
@@ -755,86 +759,83 @@ def hexbin(x,y,bins=None,binlim=None,dens=True,scale=None,
 		if output is None:
 			output=Params.hist2D_output
 	
-	if size([x,y])==0: # Zero-sized arrays given
-		if (clog == True): raise ValueError("Cannot set 'clog'=True if zero-size array given.")
-		if (cstat != None): raise ValueError(f"Cannot compute statistic (cstat='{cstat}') on zero-size array, set cstat=None if no data given.")
+	if size([x,y])==0 and clog == True: # Zero-sized arrays given
+		raise ValueError("Cannot set 'clog'=True if zero-size array given.")
 	
 	# Combine the `explicit` plot_kw dictionary with the `implicit` **kwargs dictionary
 	#plot_par={**plot_kw, **kwargs} # For Python > 3.5
 	plot_par=plot_kw.copy()
 	plot_par.update(kwargs)
-	if binlim:
-		plot_par['extent']=binlim
-	#plot_par[]=dens
-	#plot_par[]=scale
-	if c is not None:
-		plot_par['C']=c
-	if cstat:
-		cstat_func={'min':nanmin,'mean':nanmax,'median':nanmedian,'max':nanmax,'std':nanstd}
-		if cstat in cstat_func.keys():
-			plot_par['reduce_C_function']=cstat_func[cstat]
-		else:
-			plot_par['reduce_C_function']=cstat
-	if clim:
-		plot_par['vmin']=clim[0]
-		plot_par['vmax']=clim[1]
-	if nmin:
-		plot_par['mincnt']=nmin
+	mincnt=plot_par.pop('mincnt',nmin if nmin else None)
+	if clog and mincnt is None:
+		mincnt=1
+	cmap=plot_par.pop('cmap',None)
+	norm=plot_par.pop('norm',None)
+	vmin,vmax=plot_par.pop('vmin',clim[0] if clim else None),plot_par.pop('vmax',clim[1] if clim else None)
+	if 'edgecolors' not in plot_par.keys() and 'edgecolor' not in plot_par.keys():
+		plot_par['edgecolors']='face'
+	if 'linewidths' not in plot_par.keys() and 'linewidth' not in plot_par.keys():
+		plot_par['linewidths']=[1.0]
+	
+	offsets,values,hexagon,extent=compute_hexbin(x,y,c,bins,binlim,dens,scale,cstat,mincnt,xlog,ylog)
+	
+	if xlog or ylog: # Non-linear axes need the vertices of each hexagon in data space
+		polygons=expand_dims(hexagon,0)+expand_dims(offsets,1)
+		if xlog:
+			polygons[:,:,0]=10**polygons[:,:,0]
+			offsets[:,0]=10**offsets[:,0]
+			ax.set_xscale('log')
+		if ylog:
+			polygons[:,:,1]=10**polygons[:,:,1]
+			offsets[:,1]=10**offsets[:,1]
+			ax.set_yscale('log')
+		hist_return=PolyCollection(polygons,**plot_par)
+	else: # A single hexagon drawn at each offset
+		hist_return=PolyCollection([hexagon],offsets=offsets,offset_transform=AffineDeltaTransform(ax.transData),**plot_par)
+	if clog and norm is None:
+		norm=LogNorm(vmin=vmin,vmax=vmax)
+		vmin=vmax=None
+	hist_return.set_array(values)
+	hist_return.set_cmap(cmap)
+	hist_return.set_norm(norm)
+	if norm is None:
+		hist_return.set_clim(vmin,vmax)
+	elif norm.vmin is None and norm.vmax is None:
+		norm.autoscale(values)
+	
+	corners=[[extent[0],extent[2]],[extent[1],extent[3]]]
 	if xlog:
-		plot_par['xscale']='log'
+		corners=[[10**extent[0],corners[0][1]],[10**extent[1],corners[1][1]]]
 	if ylog:
-		plot_par['yscale']='log'
-	if clog:
-		plot_par['bins']='log'
-		if 'mincnt' not in plot_par.keys():
-			plot_par['mincnt']=1
-	
-	if dens and c is None:
-		# This is nasty, but seems to be the quickest way to do this without fully rewriting hexbin here
-		hist_return=hexbin(x,y,gridsize=bins)
-		hist_return.remove()
-		offsets=hist_return.get_offsets()
-		offsets_x=unique(offsets[:,0])
-		offsets_y=unique(offsets[:,1])
-		hex_area=diff(offsets_x)[0]*2*diff(offsets_y)[0]
-		
-		def density_scaling(bin_data):
-			bin_dens=1.0*len(bin_data)/(hex_area)
-			if scale:
-				bin_dens/=1.0*scale
-			else:
-				bin_dens/=len(x)
-			return(bin_dens)
-		
-		plot_par['C']=y
-		plot_par['reduce_C_function']=density_scaling
-	
-	hist_return=hexbin(x,y,gridsize=bins,**plot_par)
+		corners=[[corners[0][0],10**extent[2]],[corners[1][0],10**extent[3]]]
+	ax.update_datalim(corners)
+	ax.autoscale_view(tight=True)
+	ax.add_collection(hist_return,autolim=False)
+	set_current_image(ax,hist_return)
 	
 	if clabel is not None:
-		cbar=colorbar()
+		cbar=ax.figure.colorbar(hist_return,ax=ax)
 		cbar.set_label(clabel)
 		if cbar_invert:
 			cbar.ax.invert_yaxis()
-	plot_finalizer(xlog,ylog,xlim,ylim,title,xlabel,ylabel,xinvert,yinvert,grid)
-	if ax is not None:
-		old_axes=axes_handler(old_axes)
+	plot_finalizer(xlog,ylog,xlim,ylim,title,xlabel,ylabel,xinvert,yinvert,grid,ax=ax)
 	if output:
-		return(hist_return.get_array(),hist_return.get_offsets())
+		return(values,offsets)
 
 ####################################
 # 2D histogram and binned statistics
 ####################################
-def hist2D(x,y,bin_type=None,bins=None,dens=True,scale=None,c=None,cstat=None,xlim=None,ylim=None,clim=[None,None],nmin=0, 
+def hist2D(x,y=None,bin_type=None,bins=None,dens=True,scale=None,c=None,cstat=None,xlim=None,ylim=None,clim=[None,None],nmin=0, 
 			xinvert=False,yinvert=False,cbar_invert=False,xlog=False,ylog=False,clog=None,title=None,xlabel=None,
-			ylabel=None,clabel=None,lab_loc=0,ax=None,grid=None,output=None,plot_kw={},**kwargs):
+			ylabel=None,clabel=None,lab_loc=0,ax=None,grid=None,output=None,plot_kw={},computed=None,**kwargs):
 	
 	"""2D histogram function.
 	
 	Parameters
 	----------
-	x : array-like
-		Position of data points in the x axis.
+	x : array-like or HistStream2D
+		Position of data points in the x axis. A HistStream2D draws the histogram accumulated from
+		streamed data, in which case y, bin_type, bins and c are not needed.
 	y : array-like
 		Position of data points in the y axis.
 	bin_type : {'number','width','edges','equal'}, optional
@@ -850,10 +851,10 @@ def hist2D(x,y,bin_type=None,bins=None,dens=True,scale=None,c=None,cstat=None,xl
 		Scaling of the data counts.
 	c : array-like, optional
 		If a valid argument is given in cstat, defines the value used for the binned statistics.
-	cstat : str or function, optional
+	cstat : str, int, float or function, optional
 		Must be one of the valid str arguments for the statistics variable in scipy.stats.binned_statistic_2d
-		('mean’, 'median’, 'count’, 'sum’, 'min’ or 'max’) or a function that takes a 1D array and
-		outputs an integer or float.
+		('mean’, 'median’, 'count’, 'sum’, 'min’ or 'max’), a number for the percentile to calculate
+		in each bin, or a function that takes a 1D array and outputs an integer or float.
 	xlim : tuple-like, optional
 		Defines the limits of the x-axis, it must contain two elements (lower and higer limits).
 	ylim : tuple-like, optional
@@ -893,6 +894,10 @@ def hist2D(x,y,bin_type=None,bins=None,dens=True,scale=None,c=None,cstat=None,xl
 	plot_kw : dict, optional
 		Explicit dictionary of kwargs to be parsed to matplotlib pcolormesh function.
 		Parameters will be overwritten if also given implicitly as a **kwarg.
+	computed : tuple, optional
+		The (X, Y, Z, counts) returned by compute.hist2D() for the same data and parameters, which
+		are drawn instead of computing them again (e.g. when they are computed beforehand in another
+		process, as cornerplot() does).
 	**kwargs : pcolormesh properties, optional
 		kwargs are used to specify matplotlib specific properties such as cmap, norm, edgecolors etc.
 		https://matplotlib.org/api/_as_gen/matplotlib.pyplot.pcolormesh.html
@@ -907,19 +912,15 @@ def hist2D(x,y,bin_type=None,bins=None,dens=True,scale=None,c=None,cstat=None,xl
 		The bin edges for the y axis. Only provided if output is True.
 	"""
 	
-	from numpy import nan, size, zeros, shape
+	from numpy import size
 	from matplotlib.colors import LogNorm
-	from matplotlib.pyplot import pcolormesh, colorbar
-	from .base_func import axes_handler,basehist2D,plot_finalizer
-	
-	if ax is not None:
-		old_axes=axes_handler(ax)
-	if type(bin_type) is not list:
-		bin_type=[bin_type]*2
-	if type(bins) not in [list,tuple]:
-		if bins is None:
-			bins=max([10,int(len(x)**0.4)]) # Defaults to min of 10 bins
-		bins=[bins]*2
+	from matplotlib.pyplot import gca
+	from .base_func import plot_finalizer,set_current_image
+	from .compute import hist2D as compute_hist2D
+	from .streaming import HistStream2D
+	
+	if ax is None:
+		ax=gca()
 	
 	if None in (clog,output):
 		from .defaults import Params
@@ -928,37 +929,31 @@ def hist2D(x,y,bin_type=None,bins=None,dens=True,scale=None,c=None,cstat=None,xl
 		if output is None:
 			output=Params.hist2D_output
 	
-	if size([x,y])==0: # Zero-sized arrays given
-		if (clog == True): raise ValueError("Cannot set 'clog'=True if zero-size array given.")
-		if (cstat != None): raise ValueError(f"Cannot compute statistic (cstat='{cstat}') on zero-size array, set cstat=None if no data given.")
-	
-	X,Y,Z=basehist2D(x,y,c,bin_type,bins,scale,dens,cstat,xlog,ylog)
-	
-	# Also get counts for number threshold cut
-	if (size([x,y])==0):
-		counts=zeros(shape=shape(Z))
+	if isinstance(x,HistStream2D): # Histogram accumulated from streamed data
+		xlog=xlog or x.xlog
+		ylog=ylog or x.ylog
+	elif size([x,y])==0 and clog == True: # Zero-sized arrays given
+		raise ValueError("Cannot set 'clog'=True if zero-size array given.")
+	if computed is None:
+		X,Y,Z,_=compute_hist2D(x,y,c,bin_type,bins,dens,scale,cstat,nmin,xlog,ylog)
 	else:
-		_,_,counts = basehist2D(x,y,c,bin_type,bins,None,False,None,xlog,ylog)
-	
-	# Cut bins which do not meet the number count threshold
-	Z[counts<nmin]=nan
+		X,Y,Z,_=computed
 	
 	# Combine the `explicit` plot_kw dictionary with the `implicit` **kwargs dictionary
 	#plot_par={**plot_kw, **kwargs} # For Python > 3.5
 	plot_par=plot_kw.copy()
 	plot_par.update(kwargs)
 	if clog:
-		pcolormesh(X,Y,Z.T,norm=LogNorm(vmin=clim[0],vmax=clim[1],clip=False),**plot_par)
+		mesh=ax.pcolormesh(X,Y,Z.T,norm=LogNorm(vmin=clim[0],vmax=clim[1],clip=False),**plot_par)
 	else:
-		pcolormesh(X,Y,Z.T,vmin=clim[0],vmax=clim[1],**plot_par)
+		mesh=ax.pcolormesh(X,Y,Z.T,vmin=clim[0],vmax=clim[1],**plot_par)
+	set_current_image(ax,mesh)
 	if clabel is not None:
-		cbar=colorbar()
+		cbar=ax.figure.colorbar(mesh,ax=ax)
 		cbar.set_label(clabel)
 		if cbar_invert:
 			cbar.ax.invert_yaxis()
-	plot_finalizer(xlog,ylog,xlim,ylim,title,xlabel,ylabel,xinvert,yinvert,grid)
-	if ax is not None:
-		old_axes=axes_handler(old_axes)
+	plot_finalizer(xlog,ylog,xlim,ylim,title,xlabel,ylabel,xinvert,yinvert,grid,ax=ax)
 	if output:
 		return(Z.T,X,Y)
 
@@ -1022,11 +1017,11 @@ def img(im,x=None,y=None,xlim=None,ylim=None,clim=[None,None],cmin=0,xinvert=Fal
 	
 	from numpy import arange, meshgrid
 	from matplotlib.colors import LogNorm
-	from matplotlib.pyplot import pcolormesh, colorbar
-	from .base_func import axes_handler,plot_finalizer
+	from matplotlib.pyplot import gca
+	from .base_func import plot_finalizer,set_current_image
 	
-	if ax is not None:
-		old_axes=axes_handler(ax)
+	if ax is None:
+		ax=gca()
 	if x is None:
 		x=arange(len(im[:,0])+1)
 	if y is None:
@@ -1043,22 +1038,21 @@ def img(im,x=None,y=None,xlim=None,ylim=None,clim=[None,None],cmin=0,xinvert=Fal
 	plot_par.update(kwargs) 
 	
 	if clog:
-		pcolormesh(X,Y,im.T,norm=LogNorm(vmin=clim[0],vmax=clim[1],clip=True),**plot_par)
+		mesh=ax.pcolormesh(X,Y,im.T,norm=LogNorm(vmin=clim[0],vmax=clim[1],clip=True),**plot_par)
 	else:
-		pcolormesh(X,Y,im.T,vmin=clim[0],vmax=clim[1],**plot_par)
+		mesh=ax.pcolormesh(X,Y,im.T,vmin=clim[0],vmax=clim[1],**plot_par)
+	set_current_image(ax,mesh)
 	if clabel is not None:
-		cbar=colorbar()
+		cbar=ax.figure.colorbar(mesh,ax=ax)
 		cbar.set_label(clabel)
 		if cbar_invert:
 			cbar.ax.invert_yaxis()
-	plot_finalizer(False,False,xlim,ylim,title,xlabel,ylabel,xinvert,yinvert,grid)
-	if ax is not None:
-		old_axes=axes_handler(old_axes)
+	plot_finalizer(False,False,xlim,ylim,title,xlabel,ylabel,xinvert,yinvert,grid,ax=ax)
 
 ####################################
 # Scatter plots
 ####################################
-def scatter(x,y,c=None,xlim=None,ylim=None,clim=None,density=False,xinvert=False,yinvert=False,cbar_invert=False,xlog=False,ylog=False,title=None,
+def scatter(x,y,c=None,xlim=None,ylim=None,clim=None,density=False,dens_bins=None,dens_smooth=None,xinvert=False,yinvert=False,cbar_invert=False,xlog=False,ylog=False,title=None,
 			xlabel=None,ylabel=None,clabel=None,label=None,lab_loc=0,ax=None,grid=None,plot_kw={},**kwargs):
 	
 	"""2D pixel-based image plotting function.
@@ -1079,9 +1073,18 @@ def scatter(x,y,c=None,xlim=None,ylim=None,clim=None,density=False,xinvert=False
 		Defines the limits of the colour-axis, it must contain two elements (lower and higer limits).
 		Functions equivalently to the `vmin, vmax` arguments used by `colors.Normalize`. If both are
 		given, `clim` takes priority.
-	density : bool, optional
-		If True, color-codes points by their spatial density to nearby points using a Gaussian
-		kernel density estimate. If 'c' also given, 'density' takes precedence. Default: False.
+	density : bool or str, optional
+		If True or 'grid', color-codes points by their spatial density to nearby points, estimated
+		by smoothing a 2D histogram of the points with a Gaussian kernel and interpolating it back
+		to each point. If 'kde', the density is given by an exact Gaussian kernel density estimate,
+		which is much slower for large samples. If 'c' also given, 'density' takes precedence.
+		Default: False.
+	dens_bins : int or array-like, optional
+		Number of bins per axis of the grid used when density is True or 'grid'. Default: 200.
+	dens_smooth : float or array-like, optional
+		Bandwidth of the Gaussian kernel used to estimate the density. For density='grid' it is
+		the standard deviation of the kernel in units of bins, for density='kde' it is passed as
+		bw_method to scipy.stats.gaussian_kde. If not given, Scott's rule is used.
 	xinvert : bool, optional
 		If True, inverts the x-axis.
 	yinvert : bool, optional
@@ -1122,10 +1125,10 @@ def scatter(x,y,c=None,xlim=None,ylim=None,clim=None,density=False,xinvert=False
 		A list of PathCollection objects representing the plotted data.
 	"""
 	
-	from numpy import array, dtype, shape, vstack
-	from matplotlib.pyplot import scatter, colorbar, legend
-	from .base_func import axes_handler,dict_splicer,plot_finalizer
-	from scipy.stats import gaussian_kde
+	from numpy import array, dtype, shape
+	from matplotlib.pyplot import gca
+	from .base_func import dict_splicer,plot_finalizer,point_density,set_current_image
+	from .cache import cached
 	from warnings import warn
 
 	# Handle deprecated variables
@@ -1135,8 +1138,8 @@ def scatter(x,y,c=None,xlim=None,ylim=None,clim=None,density=False,xinvert=False
 			warn(f"'{dep}' will be deprecated in future verions, using '{deprecated[dep]}' instead")
 			if (dep=='plabel'): label = kwargs.pop(dep)
 	
-	if ax is not None:
-		old_axes=axes_handler(ax)
+	if ax is None:
+		ax=gca()
 	if type(x) is not list or (len(shape(x))==1 and array(x).dtype is not dtype('O')):
 		x=[x]
 	if type(y) is not list or (len(shape(y))==1 and array(y).dtype is not dtype('O')):
@@ -1166,31 +1169,31 @@ def scatter(x,y,c=None,xlim=None,ylim=None,clim=None,density=False,xinvert=False
 		except (TypeError):
 			raise TypeError("`clim` must be of iterable type and have two values only.")
 	
-	if (density == True):
+	if density:
 		if (all([kk is not None for kk in c])):
 			warn("Cannot specify both `c` and `density`, ignoring `c`.")
+		dens_type='grid' if density is True else density
 		c=[None]*L
 		for i in range(L):
-			xy=vstack([x[i],y[i]])
-			c[i]=gaussian_kde(xy)(xy) # Calculate the Gaussian kernel density estimate
+			c[i]=cached('scatter_density',(x[i],y[i],dens_type,dens_bins,dens_smooth),
+						lambda: (point_density(x[i],y[i],dens_type=dens_type,bins=dens_bins,smooth=dens_smooth),))[0]
 	
 	# Create 'L' number of plot kwarg dictionaries to parse into each scatter call
 	plot_par=dict_splicer(plot_par,L,[len(i) for i in x])
 	
 	paths=[]
 	for i in range(L):
-		p=scatter(x[i],y[i],c=c[i],label=label[i],**plot_par[i])
+		p=ax.scatter(x[i],y[i],c=c[i],label=label[i],**plot_par[i])
 		paths.append(p)
+	set_current_image(ax,paths[-1])
 	if clabel is not None:
-		cbar=colorbar()
+		cbar=ax.figure.colorbar(paths[-1],ax=ax)
 		cbar.set_label(clabel)
 		if cbar_invert:
 			cbar.ax.invert_yaxis()
 	if any(label):
-		legend(loc=lab_loc)
-	plot_finalizer(xlog,ylog,xlim,ylim,title,xlabel,ylabel,xinvert,yinvert,grid)
-	if ax is not None:
-		old_axes=axes_handler(old_axes)
+		ax.legend(loc=lab_loc)
+	plot_finalizer(xlog,ylog,xlim,ylim,title,xlabel,ylabel,xinvert,yinvert,grid,ax=ax)
 	
 	return paths[0] if len(paths) == 1 else paths
 
@@ -1255,7 +1258,7 @@ def sector(r,theta,rlim=(0.0,1.0),thetalim=(0.0,360.0),clim=None,rotate=0.0,rlab
 	
 	from matplotlib.transforms import Affine2D
 	from matplotlib.projections.polar import PolarAxes
-	from matplotlib.pyplot import gcf, colorbar, legend 
+	from matplotlib.pyplot import gcf
 	
 	from mpl_toolkits.axisartist import floating_axes
 	from mpl_toolkits.axisartist.grid_finder import (FixedLocator, MaxNLocator, DictFormatter)
@@ -1361,7 +1364,7 @@ def sector(r,theta,rlim=(0.0,1.0),thetalim=(0.0,360.0),clim=None,rotate=0.0,rlab
 			sctr=sector_ax.scatter(theta[ii]-rotate, r[ii], label=label[ii],**plot_par[ii])
 	
 	if clabel is not None:
-		cbar=colorbar(sctr)
+		cbar=fig.colorbar(sctr)
 		cbar.set_label(clabel)
 		if cbar_invert:
 			cbar.ax.invert_yaxis()
@@ -1442,28 +1445,19 @@ def statband(x,y,bin_type=None,bins=None,stat_mid='mean',stat_low='std',stat_hig
 	None
 	"""
 	
-	from splotch.base_func import axes_handler,bin_axis,plot_finalizer
+	from splotch.base_func import plot_finalizer
+	from splotch.compute import statband as compute_statband
 	
 	import numpy as np
-	from numbers import Number
-	import scipy.stats as stats
-	from numpy import percentile
-	from functools import partial
 	import matplotlib.colors as clr
-	import matplotlib.pyplot as plt
 	from matplotlib.pyplot import gca
 	from warnings import warn
 
-	if ax is not None:
-		old_axes=axes_handler(ax)
-	else:
+	if ax is None:
 		ax=gca()
-		old_axes=ax
 	if ylog is None:
 		from splotch.defaults import Params
 		ylog=Params.hist1D_yaxis_log
-	if bins is None:
-		bins=int((len(x))**0.4)
 	if 'linewidth' not in band_kw.keys():
 		band_kw['linewidth']=0
 	if 'alpha' not in band_kw.keys():
@@ -1473,65 +1467,22 @@ def statband(x,y,bin_type=None,bins=None,stat_mid='mean',stat_low='std',stat_hig
 	#band_par={**plot_kw, **kwargs} # For Python > 3.5
 	band_kw.update(kwargs)
 	
-	# Check stat_low/stat_high arguments
-	band_stat=np.array([None,None])
-	band_multi=np.ones(2)
-	for i, stat in enumerate([stat_low,stat_high]): # loop over low/high statistic
-		if isinstance(stat,Number): # stat given as a percentile number
-			band_stat[i] = partial(percentile,q=stat) # Set as the percentile function with kwargs fixed.
-		elif callable(stat): # stat given as a function
-			band_stat[i] = stat
-		elif isinstance(stat,str) and 'std' in stat: # stat given as a string with 'std'
-			band_stat[i] = 'std'
-			multi = list(filter(None,stat.split('std'))) # The multiplier for std, if any.
-			if len(multi) == 0: # No multiplier given
-				band_multi[i] = 1.0
-			elif len(multi) == 1: # Multiplier was given
-				band_multi[i] = multi[0]
-			else: 
-				raise ValueError(f"Statistic '{stat}' not valid. Should be given as '[n]std', where [n] is a number.")
-		else:
-			raise ValueError(f"Statistic of type '{type(stat)}' was not recognised. Must be either a Number, function or string in the format '[n]std'.")
-	
-	# Check stat_mid argument
-	if isinstance(stat_mid,Number):
-		stat_mid=partial(percentile,q=stat_mid)
-
-	# Assign 'from_mid' if not explicitly set
-	if from_mid is None:
-		if (band_stat[0] in ['std',np.std,np.nanstd] and (band_stat[1] in ['std',np.std,np.nanstd])): # Band stats a type of standard deviation
-			from_mid = True
-		else:
-			from_mid = False
-	
-	temp_x,bins_hist,bins_plot=bin_axis(x,bin_type,bins,log=xlog)
-	temp_y=stats.binned_statistic(temp_x,y,statistic=stat_mid,bins=bins_hist)[0]
-	if band_stat[0]==band_stat[1]:
-		band_low,band_high=[stats.binned_statistic(temp_x,y,statistic=band_stat[0],bins=bins_hist)[0]]*2
-	else:
-		band_low=stats.binned_statistic(temp_x,y,statistic=band_stat[0],bins=bins_hist)[0]
-		band_high=stats.binned_statistic(temp_x,y,statistic=band_stat[1],bins=bins_hist)[0]
-
-	if from_mid == True: # Band intervals should be taken as the difference from the mid line
-		band_low  = temp_y-band_multi[0]*band_low
-		band_high = temp_y+band_multi[1]*band_high
+	_,x_mid,temp_y,band_low,band_high=compute_statband(x,y,bin_type,bins,stat_mid,stat_low,stat_high,from_mid,xlog)
 	
 	if ylog:
 		temp_y=np.where(temp_y==0,np.nan,temp_y)
 
-	x=stats.binned_statistic(temp_x,x,statistic=stat_mid,bins=bins_hist)[0]
+	x=x_mid
 	y=temp_y
 	
-	plt.fill_between(x,band_low,band_high,label=label,**band_kw)
+	ax.fill_between(x,band_low,band_high,label=label,**band_kw)
 
 	if line:
-		plt.plot(x,y,**line_kw)
+		ax.plot(x,y,**line_kw)
 	if label is not None:
-		plt.legend(loc=lab_loc)
+		ax.legend(loc=lab_loc)
 	
-	plot_finalizer(xlog,ylog,xlim,ylim,title,xlabel,ylabel,xinvert,yinvert,grid)
-	if ax is not None:
-		old_axes=axes_handler(old_axes)
+	plot_finalizer(xlog,ylog,xlim,ylim,title,xlabel,ylabel,xinvert,yinvert,grid,ax=ax)
 
 ####################################
 # Statistics bars
@@ -1607,23 +1558,15 @@ def statbar(x,y,bin_type=None,bins=None,stat_cen='mean',bar_x=True,stat_y='std',
 	None
 	"""
 	
-	from splotch.base_func import axes_handler,bin_axis,plot_finalizer
+	from splotch.base_func import bin_axis,bin_index,binned_stats,plot_finalizer
 	
 	import numpy as np
-	from numbers import Number
-	import scipy.stats as stats
-	from numpy import percentile
-	from functools import partial
 	import matplotlib.colors as clr
-	import matplotlib.pyplot as plt
-	from matplotlib.pyplot import gca, errorbar, rcParams
+	from matplotlib.pyplot import gca, rcParams
 	from warnings import warn
 	
-	if ax is not None:
-		old_axes=axes_handler(ax)
-	else:
+	if ax is None:
 		ax=gca()
-		old_axes=ax
 	if ylog is None:
 		from splotch.defaults import Params
 		ylog=Params.hist1D_yaxis_log
@@ -1649,22 +1592,13 @@ def statbar(x,y,bin_type=None,bins=None,stat_cen='mean',bar_x=True,stat_y='std',
 	
 	bar_multi=np.ones(2)
 	for i in range(len(stat_y)):
-		if isinstance(stat_y[i],Number):
-			stat_y[i]=partial(percentile,q=stat_y[i])
-		elif 'std' in stat_y[i] and len(stat_y[i].replace('std',''))>0:
+		if isinstance(stat_y[i],str) and 'std' in stat_y[i] and len(stat_y[i].replace('std',''))>0:
 			bar_multi[i]=float(stat_y[i].replace('std',''))
 			stat_y[i]='std'
 	
-	if isinstance(stat_cen,Number):
-		stat_cen=partial(percentile,q=stat_cen)
-	
 	temp_x,bins_hist,bins_plot=bin_axis(x,bin_type,bins,log=xlog)
-	temp_y=stats.binned_statistic(temp_x,y,statistic=stat_cen,bins=bins_hist)[0]
-	if stat_y[0]==stat_y[1]:
-		bar_low,bar_high=[stats.binned_statistic(temp_x,y,statistic=stat_y[0],bins=bins_hist)[0]]*2
-	else:
-		bar_low=stats.binned_statistic(temp_x,y,statistic=stat_y[0],bins=bins_hist)[0]
-		bar_high=stats.binned_statistic(temp_x,y,statistic=stat_y[1],bins=bins_hist)[0]
+	bin_num=bin_index(temp_x,bins_hist)
+	temp_y,bar_low,bar_high,x_cen=binned_stats(bin_num,len(bins_hist)-1,[(y,stat_cen),(y,stat_y[0]),(y,stat_y[1]),(x,stat_cen)])
 	if stat_y[0]=='std':
 		bar_low=bar_multi[0]*bar_low
 	else:
@@ -1675,18 +1609,16 @@ def statbar(x,y,bin_type=None,bins=None,stat_cen='mean',bar_x=True,stat_y='std',
 		bar_high-=temp_y
 	if ylog:
 		temp_y=np.where(temp_y==0,np.nan,temp_y)
-	x=stats.binned_statistic(temp_x,x,statistic=stat_cen,bins=bins_hist)[0]
+	x=x_cen
 	y=temp_y
 	if bar_x:
 		bar_x=[x-bins_plot[:-1],bins_plot[1:]-x]
 	
 	if bar_x:
-		errorbar(x,y,xerr=bar_x,yerr=[bar_low,bar_high],**plot_par)
+		ax.errorbar(x,y,xerr=bar_x,yerr=[bar_low,bar_high],**plot_par)
 	else:
-		errorbar(x,y,yerr=[bar_low,bar_high],**plot_par)
+		ax.errorbar(x,y,yerr=[bar_low,bar_high],**plot_par)
 	if label is not None:
-		plt.legend(loc=lab_loc)
+		ax.legend(loc=lab_loc)
 	
-	plot_finalizer(xlog,ylog,xlim,ylim,title,xlabel,ylabel,xinvert,yinvert,grid)
-	if ax is not None:
-		old_axes=axes_handler(old_axes)
+	plot_finalizer(xlog,ylog,xlim,ylim,title,xlabel,ylabel,xinvert,yinvert,grid,ax=ax)
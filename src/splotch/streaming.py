@@ -0,0 +1,761 @@
+########################################################################
+############ Out-of-core accumulation of histogram products ############
+########################################################################
+
+####################################
+# Chunked reading of large data
+####################################
+def chunk_reader(source,chunksize=1000000):
+	"""Generator of data chunks
+	
+	Iterates over a data source in chunks along its first axis, so that data sets larger than the
+	available memory can be binned by a HistStream1D or HistStream2D.
+	
+	Parameters
+	----------
+	source : str, ndarray or iterable
+		The data source. If str, it must be the path to a .npy file, which is memory-mapped with
+		numpy.load(mmap_mode='r'). If ndarray (including numpy.memmap), it is sliced along the
+		first axis. Any other iterable is assumed to already yield chunks of data.
+	chunksize : int, optional
+		The number of elements along the first axis in each chunk. Only used when source is a path
+		or an ndarray. Default: 1000000.
+	
+	Yields
+	------
+	chunk : ndarray
+		The next chunk of data.
+	"""
+	from numpy import asarray, load, ndarray
+	
+	if isinstance(source,str):
+		source=load(source,mmap_mode='r')
+	if isinstance(source,ndarray):
+		for i in range(0,len(source),chunksize):
+			yield(asarray(source[i:i+chunksize]))
+	else:
+		for chunk in source:
+			yield(asarray(chunk))
+
+####################################
+# Data limits from a single pass
+####################################
+def stream_limits(source,chunksize=1000000):
+	"""Limits of chunked data
+	
+	Finds the minimum and maximum of a data source from a single pass over its chunks, which is
+	enough to build the bin edges for bin_type='number' and bin_type='width'.
+	
+	Parameters
+	----------
+	source : str, ndarray or iterable
+		The data source, as accepted by chunk_reader(). If the chunks are 2D, the limits are found
+		for each column.
+	chunksize : int, optional
+		The number of elements in each chunk, as used by chunk_reader(). Default: 1000000.
+	
+	Returns
+	-------
+	lims : tuple or list of tuples
+		The (min, max) values of the data. A list with the (min, max) of each column is returned
+		for 2D chunks.
+	"""
+	from numpy import fmax, fmin, nanmax, nanmin
+	
+	low,high=None,None
+	for chunk in chunk_reader(source,chunksize=chunksize):
+		if chunk.size==0:
+			continue
+		c_low=nanmin(chunk,axis=0)
+		c_high=nanmax(chunk,axis=0)
+		low=c_low if low is None else fmin(low,c_low)
+		high=c_high if high is None else fmax(high,c_high)
+	if low is None:
+		raise ValueError("No data found in source.")
+	if low.ndim==0:
+		return((low.item(),high.item()))
+	return([(l,h) for l,h in zip(low.tolist(),high.tolist())])
+
+####################################
+# Random sampling in a single pass
+####################################
+def reservoir_sample(source,nsamples,weights=None,chunksize=1000000):
+	"""Random sample of chunked data
+	
+	Draws a random sample of the rows of a data source without replacement, from a single pass over
+	its chunks and keeping in memory only the sampled rows, so that data sets larger than the
+	available memory (e.g. long MCMC chains) can be subsampled for cornerplot() or scatter(). Each
+	row is given a random key, and the rows with the largest keys are kept in a reservoir that is
+	updated with each chunk. With weights, the keys follow the weighted reservoir sampling of
+	Efraimidis & Spirakis (2006), so the probability of drawing each row is proportional to its
+	weight.
+	
+	Parameters
+	----------
+	source : str, ndarray or iterable
+		The data source, as accepted by chunk_reader().
+	nsamples : int
+		The number of rows to be sampled. If the source has fewer rows, all of them are returned.
+	weights : str, ndarray or iterable, optional
+		The source of the (non-negative) weights of the rows, e.g. importance weights, which must
+		yield chunks matching those of source. Rows of zero weight are never drawn, so only the rows
+		of positive weight are returned if there are fewer than nsamples.
+	chunksize : int, optional
+		The number of elements in each chunk, as used by chunk_reader(). Default: 1000000.
+	
+	Returns
+	-------
+	sample : ndarray
+		The sampled rows, in the order in which they are found in the source.
+	rows : ndarray
+		The position of the sampled rows in the source.
+	"""
+	from numpy import argpartition, argsort, asarray, concatenate, errstate, inf, log
+	from numpy.random import random
+	
+	if nsamples <= 0:
+		raise ValueError(f"Number of samples ({nsamples}) must be positive and non-zero.")
+	chunks=chunk_reader(source,chunksize=chunksize)
+	if weights is not None:
+		chunks=zip(chunks,chunk_reader(weights,chunksize=chunksize))
+	
+	sample,rows,keys=None,None,None
+	threshold=-inf # The smallest key in the reservoir, once it is full
+	start=0
+	for chunk in chunks:
+		if weights is None:
+			chunk_keys=log(random(len(chunk)))
+		else:
+			chunk,w_chunk=chunk[0],asarray(chunk[1],dtype=float).ravel()
+			if len(w_chunk)!=len(chunk):
+				raise ValueError("The chunks of weights must match those of source.")
+			if (w_chunk<0).any():
+				raise ValueError("Weights must be non-negative.")
+			with errstate(divide='ignore'): # Rows of zero weight have a key of -inf
+				chunk_keys=log(random(len(chunk)))/w_chunk
+		kept=(chunk_keys>threshold).nonzero()[0] # Only the rows that can enter the reservoir are copied
+		if sample is None:
+			sample,rows,keys=chunk[kept],start+kept,chunk_keys[kept]
+		else:
+			sample=concatenate([sample,chunk[kept]])
+			rows=concatenate([rows,start+kept])
+			keys=concatenate([keys,chunk_keys[kept]])
+		if len(keys)>nsamples:
+			top=argpartition(keys,len(keys)-nsamples)[len(keys)-nsamples:]
+			sample,rows,keys=sample[top],rows[top],keys[top]
+			threshold=keys.min()
+		start+=len(chunk)
+	if sample is None:
+		raise ValueError("No data found in source.")
+	order=argsort(rows)
+	return(sample[order],rows[order])
+
+####################################
+# Mergeable quantile sketch
+####################################
+class QuantileSketch:
+	"""Approximate quantiles of streamed data
+	
+	Mergeable quantile sketch, which keeps a small weighted sample of the data from which the order
+	statistics are estimated, so that bins with equal number of elements (bin_type='equal') can be
+	built for data sets that are too large to be sorted. The items are kept in a hierarchy of
+	compactors: when a compactor holds more than k items they are sorted and every second one is
+	promoted to the next level with twice the weight. The rank error is of order n/k, and the
+	minimum and maximum of the data are kept exactly.
+	
+	Parameters
+	----------
+	k : int, optional
+		The number of items each compactor can hold before it is compacted. Larger values give more
+		accurate quantiles at the cost of more memory. Default: 2048.
+	
+	Attributes
+	----------
+	min, max : float
+		The exact minimum and maximum of the data.
+	n : int
+		The number of (non-NaN) data points added to the sketch.
+	"""
+	
+	def __init__(self,k=2048):
+		self.k=k
+		self.levels=[]
+		self.flips=[]
+		self.min=None
+		self.max=None
+		self.n=0
+	
+	def __len__(self):
+		return(self.n)
+	
+	def _compress(self):
+		from numpy import concatenate, sort
+	
+		h=0
+		while h<len(self.levels):
+			if len(self.levels[h])>self.k:
+				items=sort(self.levels[h])
+				keep=len(items)%2
+				if h+1==len(self.levels):
+					self.levels.append(items[:0])
+					self.flips.append(0)
+				# Alternating which half is promoted avoids a systematic bias in the ranks
+				self.levels[h+1]=concatenate([self.levels[h+1],items[keep+self.flips[h]::2]])
+				self.flips[h]=1-self.flips[h]
+				self.levels[h]=items[:keep]
+			h+=1
+	
+	def add(self,data):
+		"""Adds a chunk of data to the sketch.
+	
+		Parameters
+		----------
+		data : array-like
+			The data to be added. NaNs are ignored.
+	
+		Returns
+		-------
+		None
+		"""
+		from numpy import asarray, concatenate, isnan
+	
+		data=asarray(data,dtype=float).ravel()
+		data=data[~isnan(data)]
+		if len(data)==0:
+			return
+		self.min=data.min() if self.min is None else min(self.min,data.min())
+		self.max=data.max() if self.max is None else max(self.max,data.max())
+		if len(self.levels)==0:
+			self.levels.append(data[:0])
+			self.flips.append(0)
+		self.levels[0]=concatenate([self.levels[0],data])
+		self.n+=len(data)
+		self._compress()
+	
+	def update(self,source,chunksize=1000000):
+		"""Adds all the chunks of a data source to the sketch.
+	
+		Parameters
+		----------
+		source : str, ndarray or iterable
+			The data source, as accepted by chunk_reader().
+		chunksize : int, optional
+			The number of elements in each chunk, as used by chunk_reader(). Default: 1000000.
+	
+		Returns
+		-------
+		self : QuantileSketch
+		"""
+		for chunk in chunk_reader(source,chunksize=chunksize):
+			self.add(chunk)
+		return(self)
+	
+	def merge(self,other):
+		"""Adds the items of another QuantileSketch.
+	
+		Parameters
+		----------
+		other : QuantileSketch
+			The sketch to be merged.
+	
+		Returns
+		-------
+		self : QuantileSketch
+		"""
+		from numpy import concatenate
+	
+		if other.n==0:
+			return(self)
+		for h in range(len(other.levels)):
+			if h==len(self.levels):
+				self.levels.append(other.levels[h][:0])
+				self.flips.append(0)
+			self.levels[h]=concatenate([self.levels[h],other.levels[h]])
+		self.min=other.min if self.min is None else min(self.min,other.min)
+		self.max=other.max if self.max is None else max(self.max,other.max)
+		self.n+=other.n
+		self._compress()
+		return(self)
+	
+	def order_stats(self,ranks):
+		"""Approximate elements of the sorted data at the given ranks.
+	
+		Parameters
+		----------
+		ranks : array-like
+			The (0-based) ranks of the requested elements.
+	
+		Returns
+		-------
+		values : ndarray
+			The estimated elements of the sorted data at each rank.
+		"""
+		from numpy import argsort, asarray, clip, concatenate, cumsum, full, searchsorted
+	
+		if self.n==0:
+			raise ValueError("No data has been added to the sketch.")
+		items=concatenate(self.levels)
+		weights=concatenate([full(len(l),2.0**h) for h,l in enumerate(self.levels)])
+		order=argsort(items,kind='stable')
+		items=items[order]
+		# The weights are rescaled so that their total matches the number of data points
+		cum_w=cumsum(weights[order])*self.n/weights.sum()
+		ranks=asarray(ranks,dtype=float).ravel()
+		values=items[clip(searchsorted(cum_w,ranks,side='right'),0,len(items)-1)]
+		values[ranks<=0]=self.min
+		values[ranks>=self.n-1]=self.max
+		return(values)
+	
+	def quantile(self,q):
+		"""Approximate quantiles of the data.
+	
+		Parameters
+		----------
+		q : float or array-like
+			The quantiles to compute, between 0 and 1.
+	
+		Returns
+		-------
+		values : float or ndarray
+			The estimated quantiles.
+		"""
+		from numpy import asarray, ndim, rint, shape
+	
+		values=self.order_stats(rint(asarray(q,dtype=float)*(self.n-1)))
+		return(values.reshape(shape(q)) if ndim(q)>0 else values.item())
+	
+	def equal_edges(self,bins,log=False):
+		"""Approximate edges of bins with equal number of elements.
+	
+		Gives the edges that bin_type='equal' would build if the full data were binned, within the
+		accuracy of the sketch. The result can be used with bin_type='edges' by the histogram
+		functions or the histogram accumulators.
+	
+		Parameters
+		----------
+		bins : int
+			The number of bins.
+		log : bool, optional
+			If True, the edges are returned as the logarithm of the edges, as expected by
+			bin_type='edges' when the bins are constructed in logarithmic space.
+	
+		Returns
+		-------
+		edges : ndarray
+			The bin edges.
+		"""
+		from numpy import concatenate, linspace, log10
+		from .base_func import equal_split
+	
+		if type(bins) is not int:
+			raise TypeError('bins must be integer when bin_type="equal"')
+		if self.n<bins:
+			raise IndexError('the number of bins must be smaller than the length of the data when bin_type="equal"')
+		low,high=(log10(self.min),log10(self.max)) if log else (self.min,self.max)
+		if low==high:
+			return(linspace(low-0.5,high+0.5,num=bins+1))
+		split=equal_split(self.n,bins)
+		below,above=self.order_stats(concatenate([split-1,split])).reshape(2,-1)
+		if log:
+			below,above=log10(below),log10(above)
+		return(concatenate([[low],(below+above)/2,[high]]))
+
+####################################
+# Fixed bin edges for streamed data
+####################################
+def _stream_edges(bin_type,bins,lims,log):
+	"""Construction of the bin edges for the histogram accumulators, using bin_axis() on the limits
+	of the data (which gives the same edges as binning the full data set), or the approximate
+	quantiles of a QuantileSketch for bin_type='equal'."""
+	from numpy import array
+	from .base_func import bin_axis
+	
+	if bin_type is None:
+		bin_type={int:'number',float:'width'}.get(type(bins),'edges')
+	if bin_type=='equal':
+		if not isinstance(lims,QuantileSketch):
+			raise ValueError("lims must be a QuantileSketch of the data for bin_type='equal' with streamed data.")
+		bins,bin_type=lims.equal_edges(bins,log=log),'edges'
+	elif isinstance(lims,QuantileSketch):
+		lims=(lims.min,lims.max)
+	if bin_type=='edges':
+		_,hist_bins,plot_bins=bin_axis(array([]),'edges',array(bins,dtype=float),log=log)
+	else:
+		if lims is None:
+			raise ValueError(f"lims must be given for bin_type='{bin_type}' (they can be obtained with stream_limits()).")
+		_,hist_bins,plot_bins=bin_axis(array(lims,dtype=float),bin_type,bins,log=log)
+	return(hist_bins,plot_bins)
+
+####################################
+# 1D histogram accumulator
+####################################
+class HistStream1D:
+	"""1D histogram accumulator for streamed data
+	
+	Accumulates the counts of a 1D histogram with fixed bin edges from data given in chunks, so
+	that the memory used does not depend on the size of the data set. The accumulated histogram
+	can be drawn by passing the HistStream1D object as the data to plots_1d.hist().
+	
+	Parameters
+	----------
+	bins : int, float or array-like
+		Gives the values for the bins, according to bin_type.
+	bin_type : {'number','width','edges','equal'}, optional
+		Defines how is understood the value given in bins: 'number' for the desired number of bins,
+		'width' for the width of the bins, 'edges' for the edges of bins and 'equal' for bins with
+		(approximately) equal number of elements. If not given it is inferred from the data type of
+		bins: 'number' if int, 'width' if float and 'edges' if array-like.
+	lims : tuple-like or QuantileSketch, optional
+		The (min, max) values of the full data set, required for bin_type='number' and 'width'.
+		These can be found from a first pass over the data with stream_limits(). For
+		bin_type='equal', a QuantileSketch of the full data set must be given instead.
+	log : bool, optional
+		If True, the bins are constructed in logarithmic space. As for plots_1d.hist(), edges
+		given with bin_type='edges' must then be given as the logarithm of the edges.
+	
+	Attributes
+	----------
+	edges : ndarray
+		The bin edges used to bin the (log-scaled, if log=True) data.
+	plot_edges : ndarray
+		The bin edges in data space.
+	counts : ndarray
+		The number of data points in each bin.
+	weighted : ndarray or None
+		The sum of the weights in each bin, if weights have been given.
+	"""
+	
+	def __init__(self,bins,bin_type=None,lims=None,log=False):
+		from numpy import zeros
+	
+		self.log=log
+		self.edges,self.plot_edges=_stream_edges(bin_type,bins,lims,log)
+		self.counts=zeros(len(self.edges)-1,dtype='int64')
+		self.weighted=None
+		self.n=0
+	
+	def __len__(self):
+		return(self.n)
+	
+	def add(self,data,weights=None):
+		"""Adds a chunk of data to the histogram.
+	
+		Parameters
+		----------
+		data : array-like
+			The data to be binned.
+		weights : array-like, optional
+			The weight of each data point.
+	
+		Returns
+		-------
+		None
+		"""
+		from numpy import asarray, log10
+		from .base_func import bin_index
+	
+		data=asarray(data).ravel()
+		if self.log:
+			data=log10(data)
+		self.add_indices(bin_index(data,self.edges),weights=weights)
+	
+	def add_indices(self,index,weights=None):
+		"""Adds a chunk of data that has already been binned to the histogram.
+	
+		Parameters
+		----------
+		index : array-like
+			The index of the bin of each data point, as given by base_func.bin_index() for the edges
+			of the histogram, with -1 for data points outside the bins.
+		weights : array-like, optional
+			The weight of each data point.
+	
+		Returns
+		-------
+		None
+		"""
+		from numpy import asarray, bincount, zeros
+	
+		if (weights is None)!=(self.weighted is None) and self.n>0:
+			raise ValueError("Weights must be given for all chunks or for none of them.")
+		index=asarray(index).ravel()
+		nbins=len(self.counts)
+		valid=index>=0
+		self.counts+=bincount(index[valid],minlength=nbins)
+		if weights is not None:
+			if self.weighted is None:
+				self.weighted=zeros(nbins)
+			self.weighted+=bincount(index[valid],weights=asarray(weights).ravel()[valid],minlength=nbins)
+		self.n+=len(index)
+	
+	def update(self,source,weights=None,chunksize=1000000):
+		"""Adds all the chunks of a data source to the histogram.
+	
+		Parameters
+		----------
+		source : str, ndarray or iterable
+			The data source, as accepted by chunk_reader().
+		weights : str, ndarray or iterable, optional
+			The source of the weights, which must yield chunks matching those of source.
+		chunksize : int, optional
+			The number of elements in each chunk, as used by chunk_reader(). Default: 1000000.
+	
+		Returns
+		-------
+		self : HistStream1D
+		"""
+		if weights is None:
+			for chunk in chunk_reader(source,chunksize=chunksize):
+				self.add(chunk)
+		else:
+			for chunk,w_chunk in zip(chunk_reader(source,chunksize=chunksize),chunk_reader(weights,chunksize=chunksize)):
+				self.add(chunk,weights=w_chunk)
+		return(self)
+	
+	def merge(self,other):
+		"""Adds the counts of another HistStream1D with the same bin edges.
+	
+		Parameters
+		----------
+		other : HistStream1D
+			The histogram accumulator to be merged.
+	
+		Returns
+		-------
+		self : HistStream1D
+		"""
+		from numpy import array_equal
+	
+		if not array_equal(self.edges,other.edges):
+			raise ValueError("Only histograms with the same bin edges can be merged.")
+		if (self.weighted is None)!=(other.weighted is None) and self.n>0 and other.n>0:
+			raise ValueError("Cannot merge weighted and unweighted histograms.")
+		self.counts+=other.counts
+		if other.weighted is not None:
+			self.weighted=other.weighted.copy() if self.weighted is None else self.weighted+other.weighted
+		self.n+=other.n
+		return(self)
+	
+	def histogram(self,dens=True,plot_centre=False):
+		"""Values of the accumulated histogram.
+	
+		Parameters
+		----------
+		dens : bool, optional
+			If false the histogram returns raw counts (or summed weights).
+		plot_centre : bool, optional
+			If True, returns the centres of the bins for plotting, instead of their edges.
+	
+		Returns
+		-------
+		hist_bins : ndarray
+			The bin edges used to bin the data.
+		plot_bins : ndarray
+			The bin edges (or centres) in data space.
+		values : ndarray
+			The value of each bin.
+		counts : ndarray
+			The number of data points in each bin.
+		"""
+		from numpy import diff
+	
+		values=self.counts.astype('float') if self.weighted is None else self.weighted.copy()
+		total=values.sum()
+		if dens and total!=0: # Left as zeros if no data has been added within the bins
+			values/=diff(self.edges)*total
+		plot_bins=self.plot_edges
+		if plot_centre:
+			plot_bins=(self.edges[:-1]+self.edges[1:])/2
+			if self.log:
+				plot_bins=10**plot_bins
+		return(self.edges,plot_bins,values,self.counts)
+
+####################################
+# 2D histogram accumulator
+####################################
+class HistStream2D:
+	"""2D histogram accumulator for streamed data
+	
+	Accumulates the counts of a 2D histogram with fixed bin edges from data given in chunks, so
+	that the memory used does not depend on the size of the data set. The accumulated histogram
+	can be drawn by passing the HistStream2D object as x to plots_2d.hist2D().
+	
+	Parameters
+	----------
+	bins : int, float, array-like or list
+		Gives the values for the bins, according to bin_type. If a list of two elements is given,
+		each is used for the corresponding axis.
+	bin_type : {'number','width','edges','equal'} or list, optional
+		Defines how is understood the value given in bins, as in HistStream1D. If a list of two
+		elements is given, each is used for the corresponding axis.
+	lims : list, optional
+		The (min, max) values of the full data set for each axis, required for bin_type='number'
+		and 'width'. These can be found from a first pass over the data with stream_limits(). For
+		bin_type='equal', a QuantileSketch of the data of that axis must be given instead.
+	xlog : bool, optional
+		If True, the bins of the x-axis are constructed in logarithmic space.
+	ylog : bool, optional
+		If True, the bins of the y-axis are constructed in logarithmic space.
+	
+	Attributes
+	----------
+	x_edges, y_edges : ndarray
+		The bin edges used to bin the (log-scaled, if xlog/ylog=True) data.
+	x_plot_edges, y_plot_edges : ndarray
+		The bin edges in data space.
+	counts : ndarray
+		The number of data points in each bin.
+	"""
+	
+	def __init__(self,bins,bin_type=None,lims=None,xlog=False,ylog=False):
+		from numpy import zeros
+	
+		if type(bins) not in [list,tuple]:
+			bins=[bins]*2
+		if type(bin_type) not in [list,tuple]:
+			bin_type=[bin_type]*2
+		if lims is None:
+			lims=[None]*2
+		self.xlog=xlog
+		self.ylog=ylog
+		self.x_edges,self.x_plot_edges=_stream_edges(bin_type[0],bins[0],lims[0],xlog)
+		self.y_edges,self.y_plot_edges=_stream_edges(bin_type[1],bins[1],lims[1],ylog)
+		self.counts=zeros((len(self.x_edges)-1,len(self.y_edges)-1),dtype='int64')
+		self.n=0
+	
+	def __len__(self):
+		return(self.n)
+	
+	def add(self,x,y=None):
+		"""Adds a chunk of data to the histogram.
+	
+		Parameters
+		----------
+		x : array-like
+			Position of data points in the x axis. If y is not given, x must be either a 2D array
+			with the x and y positions as its two columns (shape (N, 2), which takes precedence for
+			two data points) or a (x, y) pair of arrays (shape (2, N)).
+		y : array-like, optional
+			Position of data points in the y axis.
+	
+		Returns
+		-------
+		None
+		"""
+		from numpy import asarray, log10
+		from .base_func import bin_index
+	
+		if y is None:
+			xy=asarray(x)
+			if xy.ndim==2 and xy.shape[1]==2:
+				x,y=xy[:,0],xy[:,1]
+			elif xy.ndim==2 and xy.shape[0]==2:
+				x,y=xy
+			else:
+				raise ValueError(f"If y is not given, x must have a shape of (N, 2) or (2, N), not {xy.shape}.")
+		x=asarray(x).ravel()
+		y=asarray(y).ravel()
+		if self.xlog:
+			x=log10(x)
+		if self.ylog:
+			y=log10(y)
+		self.add_indices(bin_index(x,self.x_edges),bin_index(y,self.y_edges))
+	
+	def add_indices(self,x_index,y_index):
+		"""Adds a chunk of data that has already been binned to the histogram.
+	
+		Parameters
+		----------
+		x_index : array-like
+			The index of the x-axis bin of each data point, as given by base_func.bin_index() for
+			the x_edges of the histogram, with -1 for data points outside the bins.
+		y_index : array-like
+			The index of the y-axis bin of each data point, as for x_index.
+	
+		Returns
+		-------
+		None
+		"""
+		from numpy import asarray, bincount
+	
+		x_index=asarray(x_index).ravel()
+		y_index=asarray(y_index).ravel()
+		nx,ny=self.counts.shape
+		valid=(x_index>=0)&(y_index>=0)
+		self.counts+=bincount(x_index[valid]*ny+y_index[valid],minlength=nx*ny).reshape(nx,ny)
+		self.n+=len(x_index)
+	
+	def update(self,source,y_source=None,chunksize=1000000):
+		"""Adds all the chunks of a data source to the histogram.
+	
+		Parameters
+		----------
+		source : str, ndarray or iterable
+			The data source, as accepted by chunk_reader(). If y_source is not given, each chunk
+			must be a 2D array with the x and y positions as its columns, or a (x, y) pair.
+		y_source : str, ndarray or iterable, optional
+			The source of the y positions, which must yield chunks matching those of source.
+		chunksize : int, optional
+			The number of elements in each chunk, as used by chunk_reader(). Default: 1000000.
+	
+		Returns
+		-------
+		self : HistStream2D
+		"""
+		if y_source is None:
+			for chunk in chunk_reader(source,chunksize=chunksize):
+				self.add(chunk)
+		else:
+			for x_chunk,y_chunk in zip(chunk_reader(source,chunksize=chunksize),chunk_reader(y_source,chunksize=chunksize)):
+				self.add(x_chunk,y_chunk)
+		return(self)
+	
+	def merge(self,other):
+		"""Adds the counts of another HistStream2D with the same bin edges.
+	
+		Parameters
+		----------
+		other : HistStream2D
+			The histogram accumulator to be merged.
+	
+		Returns
+		-------
+		self : HistStream2D
+		"""
+		from numpy import array_equal
+	
+		if not (array_equal(self.x_edges,other.x_edges) and array_equal(self.y_edges,other.y_edges)):
+			raise ValueError("Only histograms with the same bin edges can be merged.")
+		self.counts+=other.counts
+		self.n+=other.n
+		return(self)
+	
+	def histogram(self,dens=True,norm=None):
+		"""Values of the accumulated histogram, as given by base_func.basehist2D().
+	
+		Parameters
+		----------
+		dens : bool, optional
+			If false the histogram returns raw counts.
+		norm : float, optional
+			Normalization of the counts.
+	
+		Returns
+		-------
+		x_bins_plot : ndarray
+			The bin edges on the x-axis.
+		y_bins_plot : ndarray
+			The bin edges on the y-axis.
+		Z : ndarray
+			The value of each bin.
+		counts : ndarray
+			The number of data points in each bin.
+		"""
+		from numpy import diff, outer
+	
+		Z=self.counts.astype('float')
+		if dens and self.n>0 and Z.sum()>0: # Left as zeros if no data has been added within the bins
+			Z/=Z.sum()*outer(diff(self.x_edges),diff(self.y_edges))
+			if norm:
+				Z*=1.0*self.n/norm
+		return(self.x_plot_edges,self.y_plot_edges,Z,self.counts)